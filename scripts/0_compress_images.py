@@ -17,7 +17,7 @@ Target locations:
 - src/poems/**/res/ (if image folders exist)
 
 Usage:
-    python scripts/compress_images.py
+    python scripts/compress_images.py [--jobs N]
 """
 
 import os
@@ -26,6 +26,10 @@ from pathlib import Path
 import subprocess
 import tempfile
 import json
+import argparse
+import contextlib
+import io
+from concurrent.futures import ProcessPoolExecutor
 
 # ----------------------------- CONFIG -----------------------------
 TARGET_QUALITY_JPG = 10       # FFmpeg quality: 2 = best, 31 = worst
@@ -164,6 +168,13 @@ def process_image(img_path):
         temp_path.unlink()
         return False
 
+def process_image_captured(img_path):
+    """Process a single image in a worker process, returning (compressed, report text)."""
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        compressed = process_image(img_path)
+    return compressed, buffer.getvalue()
+
 def find_all_images(repo_root):
     """Find all images in the website directory structure."""
     image_extensions = {'.jpg', '.jpeg', '.png'}
@@ -197,7 +208,18 @@ def check_dependencies():
         print("Install from: https://ffmpeg.org/download.html")
         return False
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Compress all website images with FFmpeg.")
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help="number of images to process at the same time (default: 1)")
+    args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    return args
+
 def main():
+    args = parse_args()
+    
     print("\nImage Compression")
     print("-" * 40)
     
@@ -213,6 +235,7 @@ def main():
     print(f"Target quality (JPG): -q:v {TARGET_QUALITY_JPG}")
     print(f"Target quality (PNG): compression_level {TARGET_QUALITY_PNG}")
     print(f"Mode: Compression only (resolution unchanged)")
+    print(f"Workers: {args.jobs}")
     print()
     
     # Find all images
@@ -233,20 +256,38 @@ def main():
             images_by_dir[dir_path] = []
         images_by_dir[dir_path].append(img)
     
+    # Flatten into report order so worker results line up with the grouped output
+    ordered = [img for dir_path in sorted(images_by_dir.keys()) for img in sorted(images_by_dir[dir_path])]
+    
+    pool = None
+    if args.jobs > 1:
+        # map() yields results in submission order, so the report stays deterministic
+        pool = ProcessPoolExecutor(max_workers=args.jobs)
+        results = pool.map(process_image_captured, ordered)
+    else:
+        results = ((process_image(img_path), None) for img_path in ordered)
+    
     # Process each directory
     total_compressed = 0
     total_skipped = 0
     
-    for dir_path in sorted(images_by_dir.keys()):
-        rel_path = dir_path.relative_to(repo_root)
-        print(f"\n{rel_path}/")
-        print("-" * 40)
-        
-        for img_path in sorted(images_by_dir[dir_path]):
-            if process_image(img_path):
-                total_compressed += 1
-            else:
-                total_skipped += 1
+    try:
+        for dir_path in sorted(images_by_dir.keys()):
+            rel_path = dir_path.relative_to(repo_root)
+            print(f"\n{rel_path}/")
+            print("-" * 40)
+            
+            for _ in images_by_dir[dir_path]:
+                compressed, output = next(results)
+                if output:
+                    print(output, end='')
+                if compressed:
+                    total_compressed += 1
+                else:
+                    total_skipped += 1
+    finally:
+        if pool is not None:
+            pool.shutdown()
     
     # Summary
     print(f"\nCompressed: {total_compressed}, Skipped: {total_skipped}, Total: {len(images)}\n")
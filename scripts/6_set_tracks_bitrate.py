@@ -6,6 +6,9 @@ and clamp duration to 60 seconds maximum using ffmpeg.
 import os
 import subprocess
 import shutil
+from media_probe import probe_audio
+from compress_all_audio_files import audio_filters, encode_settings
+from audio_masters import MasterStore, ENCODE_TAG, read_encode_params, encode_params
 
 # Change this to adjust the working folder
 WORKING_SUBFOLDER = "../poems"
@@ -27,21 +30,38 @@ def process_mp3_files():
         input("Press Enter to exit...")
         exit(1)
 
+    masters = MasterStore()
+    settings = encode_settings(bitrate="64k", max_duration=60, fade_in=3, fade_out=3)
+
     for file_name in os.listdir(target_dir):
         if file_name.lower().endswith(".mp3"):
             input_path = os.path.join(target_dir, file_name)
             output_path = os.path.join(target_dir, f"processed_{file_name}")
 
-            # FFmpeg command with fade in/out and clamp to 60s
+            # Already encoded with these settings (read from its tag, no decoding)
+            tag = read_encode_params(input_path)
+            if tag is not None and tag["settings"] == settings:
+                print(f"Skipping {file_name} (up to date)")
+                continue
+
+            # Encode from the stored original, never from a previous output
+            sha256, master = masters.master_for(input_path, tag)
+
+            # Clamp to 60s and fade in/out over 3s; the fade-out is placed at the
+            # track's real end (probed), so tracks shorter than a minute fade too
+            info = probe_audio(master) or {}
+            filters = audio_filters(info.get("duration"), info.get("sample_rate"),
+                                    max_duration=60, fade_in=3, fade_out=3)
             command = [
                 "ffmpeg",
                 "-y",
-                "-i", input_path,
-                "-t", "60",  # clamp to 1 minute
-                "-af", "afade=t=in:ss=0:d=3,afade=t=out:st=57:d=3",  # fade in/out
+                "-i", str(master),
+                "-af", ",".join(filters),  # clamp + fade in/out
                 "-map", "0:a",
                 "-b:a", "64k",
                 "-vn",
+                "-metadata", f"{ENCODE_TAG}={encode_params(sha256, settings)}",
+                "-f", "mp3",
                 output_path
             ]
 
@@ -0,0 +1,132 @@
+"""
+================================================================================
+AUDIO MASTERS (used by the audio compression scripts)
+================================================================================
+
+PURPOSE:
+    Stop generation loss. A track on the site is a lossy MP3; encoding it
+    again from itself (a new bitrate, a loudness pass, different fades)
+    loses quality every time. This module keeps the original of every
+    track in a separate store and marks each encoded MP3 with the master
+    and settings it came from, so:
+    - every encode starts from the master, never from a previous output
+    - a file already encoded with the current settings is skipped after
+      reading its ID3 tag, with zero decoding
+
+HOW IT WORKS:
+    - MASTER STORE: .audio_masters/ in the repository root (git-ignored).
+      Files are named by the SHA-256 of their content plus the original
+      extension (e.g. 3f2a....wav), so the same recording is stored once
+      whatever it is called on the site
+    - ENCODE TAG: encoded MP3s carry an ID3 TXXX frame "encode_params"
+      (Opus files: an "encode_params" comment) holding compact JSON:
+      {"master": <sha256>, "settings": {...}}
+    - A file WITHOUT the tag is an original (new or never encoded by these
+      scripts): it is copied into the store before anything else happens
+    - An original kept as it is (encoding it didn't save enough) gets the
+      tag too, with "kept": true, written by a stream copy without
+      re-encoding, so later runs recognise it as up to date from the tag
+    - A file WITH the tag is an output: its master is the one it names.
+      If that master is missing (the store was deleted), the file itself
+      is adopted as the master, losing one generation once
+
+USAGE:
+    from audio_masters import MasterStore, read_encode_params, encode_params
+
+    masters = MasterStore(repo_root)
+    tag = read_encode_params(path)              # None for originals
+    if tag is not None and tag['settings'] == settings:
+        ...                                     # up to date, skip
+    sha256, master = masters.master_for(path, tag)
+    # ffmpeg -i master ... -metadata encode_params=<encode_params(sha256, settings)>
+
+NOTES:
+    - Deleting .audio_masters/ loses the originals: it is the source of
+      truth, not a cache (unlike scripts/.media_cache/)
+    - Masters are copied in with an atomic rename, so parallel workers and
+      interrupted runs never leave a partial master behind
+
+AUTHOR: Website maintenance scripts
+LAST MODIFIED: 2026-10-17
+================================================================================
+"""
+
+import json
+import shutil
+import tempfile
+from pathlib import Path
+from media_cache import hash_file
+from media_probe import read_id3_txxx, read_vorbis_comments
+
+MASTERS_DIR = '.audio_masters'  # Relative to the repository root
+ENCODE_TAG = 'encode_params'    # ID3 TXXX description / Ogg comment key of the encode tag
+OGG_EXTS = {'.opus', '.ogg'}
+
+def encode_params(master_sha256, settings, kept=False):
+    """Value of the encode tag for an output of the given master and settings.
+    'kept' marks an original that was kept as it is instead of being encoded."""
+    tag = {'master': master_sha256, 'settings': settings}
+    if kept:
+        tag['kept'] = True
+    return json.dumps(tag, sort_keys=True, separators=(',', ':'))
+
+def read_encode_params(audio_path):
+    """{'master', 'settings'} (plus 'kept' on kept originals) from a file's encode tag,
+    or None if it has none."""
+    if Path(audio_path).suffix.lower() in OGG_EXTS:
+        value = read_vorbis_comments(audio_path).get(ENCODE_TAG)
+    else:
+        value = read_id3_txxx(audio_path).get(ENCODE_TAG)
+    if value is None:
+        return None
+    try:
+        tag = json.loads(value)
+    except ValueError:
+        return None
+    if not isinstance(tag, dict) or 'master' not in tag or 'settings' not in tag:
+        return None
+    return tag
+
+class MasterStore:
+    """Original audio files, stored by content hash."""
+
+    def __init__(self, root=None):
+        root = Path(root) if root else Path(__file__).parent.parent
+        self.dir = root / MASTERS_DIR
+
+    def find(self, sha256):
+        """Path of the stored master with this hash, or None."""
+        if not self.dir.is_dir():
+            return None
+        for path in self.dir.glob(f'{sha256}.*'):
+            if not path.name.endswith('.tmp'):
+                return path
+        return None
+
+    def add(self, audio_path):
+        """Store a copy of audio_path (if not stored yet); returns (sha256, master path)."""
+        sha256 = hash_file(audio_path)
+        existing = self.find(sha256)
+        if existing is not None:
+            return sha256, existing
+
+        self.dir.mkdir(parents=True, exist_ok=True)
+        master = self.dir / f'{sha256}{Path(audio_path).suffix.lower()}'
+        with tempfile.NamedTemporaryFile(dir=self.dir, prefix=f'.{sha256}.', suffix='.tmp', delete=False) as tmp:
+            temp_path = Path(tmp.name)
+        try:
+            shutil.copyfile(audio_path, temp_path)
+            temp_path.replace(master)
+        except OSError:
+            temp_path.unlink(missing_ok=True)
+            raise
+        return sha256, master
+
+    def master_for(self, audio_path, tag=None):
+        """(sha256, path) of the master to encode audio_path from. 'tag' is the file's
+        encode tag: its master if stored, otherwise the file itself is stored as one."""
+        if tag is not None:
+            master = self.find(tag['master'])
+            if master is not None:
+                return tag['master'], master
+        return self.add(audio_path)
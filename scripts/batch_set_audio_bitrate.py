@@ -13,9 +13,12 @@ WHAT IT DOES:
     2. Processes all MP3 files in that folder
     3. Converts to 64kbps bitrate
     4. Adds 3-second fade-in effect
-    5. Adds 3-second fade-out effect (starting at 57 seconds)
+    5. Adds 3-second fade-out effect, ending at the track's end (probed
+       duration, or 60 seconds for longer tracks)
     6. Clamps duration to maximum 60 seconds
     7. Replaces original files with processed versions
+    8. Skips files already processed with these settings, and always
+       encodes from the stored original (see MASTERS below)
 
 CONFIGURATION:
     WORKING_SUBFOLDER = "../poems"    # Target folder (relative to script)
@@ -24,19 +27,36 @@ CONFIGURATION:
       - Bitrate: 64kbps (good for voice/music)
       - Max duration: 60 seconds
       - Fade in: 3 seconds (starts at 0s)
-      - Fade out: 3 seconds (starts at 57s)
+      - Fade out: 3 seconds (ends at min(duration, 60s))
 
 FFMPEG COMMAND BREAKDOWN:
-    ffmpeg -y -i input.mp3
-      -t 60                    # Clamp to 60 seconds
-      -af "afade=t=in:ss=0:d=3,afade=t=out:st=57:d=3"  # Fades
+    ffmpeg -y -i .audio_masters/<sha256>.mp3
+      -af "atrim=end_sample=2646000,                       # Clamp to 60 seconds
+           afade=t=in:start_sample=0:nb_samples=132300,     # Fade in (3s)
+           afade=t=out:start_sample=2513700:nb_samples=132300"  # Fade out (3s)
       -map 0:a                 # Map audio stream
       -b:a 64k                 # Set bitrate to 64kbps
       -vn                      # No video
+      -metadata encode_params={"master":...,"settings":{...}}  # Encode tag
+      -f mp3
       output.mp3
 
+    Positions are in samples (here for a 44.1 kHz track of 60s or more) and
+    come from audio_filters() in compress_all_audio_files.py, using the
+    duration and sample rate read by media_probe.py.
+
+MASTERS:
+    Uses the same master store and encode tag as compress_all_audio_files.py
+    (see audio_masters.py). An MP3 without the encode tag is an original: a
+    copy is kept in .audio_masters/ (repository root, git-ignored) and the
+    new file is encoded from it. An MP3 whose tag matches the settings
+    above is skipped without decoding it; one with other settings is
+    encoded again from its master. Running the script twice no longer
+    compounds quality loss.
+
 BEHAVIOR:
-    - DESTRUCTIVE: Replaces original files (creates temp then overwrites)
+    - REPLACES FILES: Overwrites the site's MP3s (creates temp then
+      overwrites); the originals stay in .audio_masters/
     - REQUIRES CONFIRMATION: Waits for user to press Enter
     - MP3 ONLY: Only processes .mp3 files
     - BATCH PROCESSING: Processes all MP3s in target folder
@@ -45,14 +65,18 @@ WORKFLOW:
     1. Script checks for ffmpeg availability
     2. Checks if target directory exists
     3. For each MP3 file:
-       a. Creates processed_<filename>.mp3 with ffmpeg
-       b. Deletes original file
-       c. Renames processed file to original name
+       a. Skips it if its encode tag matches the fixed settings
+       b. Stores it in .audio_masters/ if it is an original
+       c. Creates processed_<filename>.mp3 from the master with ffmpeg
+       d. Deletes original file
+       e. Renames processed file to original name
     4. Prints success message
     5. Waits for user to press Enter before exiting
 
 DEPENDENCIES:
     - ffmpeg (must be installed and in PATH)
+    - media_probe.py, audio_masters.py and compress_all_audio_files.py
+      (same folder)
     - Python 3.6+
 
 USAGE:
@@ -63,7 +87,7 @@ USAGE:
 OUTPUT:
     Processing track1.mp3 ...
     Processing track2.mp3 ...
-    Processing track3.mp3 ...
+    Skipping track3.mp3 (up to date)
     
     All files processed successfully!
     Press Enter to exit...
@@ -74,8 +98,8 @@ ERROR HANDLING:
     - If ffmpeg command fails: Raises exception (check=True)
 
 WARNING:
-    This script PERMANENTLY REPLACES original files. There is no undo.
-    Make sure you have backups before running this script.
+    This script replaces the files in the target folder. The originals are
+    only kept in .audio_masters/, which is not in git: don't delete it.
 
 USE CASE:
     This is a manual utility script for one-off batch processing tasks.
@@ -84,19 +108,22 @@ USE CASE:
 
 DIFFERENCE FROM compress_all_audio_files.py:
     - Manual vs Automated: Requires folder configuration
-    - No skipping: Processes all files regardless of current state
-    - Simpler: No bitrate detection or smart skipping
+    - Tag-only skipping: Skips files it (or compress_all_audio_files.py,
+      with the same settings) already encoded, but has no bitrate detection
     - Fixed settings: No configurable parameters in script
     - Interactive: Waits for user input
 
 AUTHOR: Website maintenance scripts
-LAST MODIFIED: 2026-01-16
+LAST MODIFIED: 2026-10-17
 ================================================================================
 """
 
 import os
 import subprocess
 import shutil
+from media_probe import probe_audio
+from compress_all_audio_files import audio_filters, encode_settings
+from audio_masters import MasterStore, ENCODE_TAG, read_encode_params, encode_params
 
 # Change this to adjust the working folder
 WORKING_SUBFOLDER = "../poems"
@@ -118,21 +145,38 @@ def process_mp3_files():
         input("Press Enter to exit...")
         exit(1)
 
+    masters = MasterStore()
+    settings = encode_settings(bitrate="64k", max_duration=60, fade_in=3, fade_out=3)
+
     for file_name in os.listdir(target_dir):
         if file_name.lower().endswith(".mp3"):
             input_path = os.path.join(target_dir, file_name)
             output_path = os.path.join(target_dir, f"processed_{file_name}")
 
-            # FFmpeg command with fade in/out and clamp to 60s
+            # Already encoded with these settings (read from its tag, no decoding)
+            tag = read_encode_params(input_path)
+            if tag is not None and tag["settings"] == settings:
+                print(f"Skipping {file_name} (up to date)")
+                continue
+
+            # Encode from the stored original, never from a previous output
+            sha256, master = masters.master_for(input_path, tag)
+
+            # Clamp to 60s and fade in/out over 3s; the fade-out is placed at the
+            # track's real end (probed), so tracks shorter than a minute fade too
+            info = probe_audio(master) or {}
+            filters = audio_filters(info.get("duration"), info.get("sample_rate"),
+                                    max_duration=60, fade_in=3, fade_out=3)
             command = [
                 "ffmpeg",
                 "-y",
-                "-i", input_path,
-                "-t", "60",  # clamp to 1 minute
-                "-af", "afade=t=in:ss=0:d=3,afade=t=out:st=57:d=3",  # fade in/out
+                "-i", str(master),
+                "-af", ",".join(filters),  # clamp + fade in/out
                 "-map", "0:a",
                 "-b:a", "64k",
                 "-vn",
+                "-metadata", f"{ENCODE_TAG}={encode_params(sha256, settings)}",
+                "-f", "mp3",
                 output_path
             ]
 
@@ -0,0 +1,175 @@
+"""
+================================================================================
+BUILD PROFILE (shared by the compression scripts and update_website.py)
+================================================================================
+
+PURPOSE:
+    Measure where build time goes. The compression scripts record one entry
+    per file they examine, update_website.py adds one entry per step, and
+    the combined report is written to scripts/.last_run_profile.json so runs
+    can be compared with each other.
+
+WHAT IS MEASURED:
+    - wall_seconds       Elapsed time (time.perf_counter)
+    - child_cpu_seconds  User + system CPU time of finished child processes
+                         (ffmpeg/ffprobe; for a whole step, the step's own
+                         subprocess too); null where the 'resource' module
+                         is unavailable (Windows)
+    - bytes_in           Size of the file before it was processed
+    - bytes_out          Size of the resulting file (the new .mp3/.mp4
+                         after a format conversion)
+    - bytes_saved        bytes_in - bytes_out
+
+USAGE:
+    from build_profile import Profiler
+
+    profiler = Profiler(repo_root)
+    result = profiler.run(path, process_image, path, cache)
+    profiler.write('images', Path('profile.json'))
+
+    The scripts do this when given --profile PATH; update_website.py passes
+    it automatically and merges the per-step files into the report.
+
+NOTES:
+    - A step's child CPU time is that of its own subprocess and everything
+      it started (read with os.wait4 when the step exits), so steps running
+      side by side are never charged for each other's ffmpeg calls.
+      In-process steps run one at a time, so their figure is exact too
+    - Per-file figures are taken inside the step (or its worker process),
+      which handles one file at a time. Work done for several files at
+      once (a batched ffmpeg encode) is split evenly between them
+    - The report is local build state and is ignored by git
+
+AUTHOR: Website maintenance scripts
+LAST MODIFIED: 2026-10-17
+================================================================================
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+REPORT_FILE = Path(__file__).parent / '.last_run_profile.json'
+REPORT_VERSION = 1
+
+def child_cpu_seconds():
+    """User + system CPU seconds used so far by this process's finished children, or None."""
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+def cpu_delta(before, after):
+    """Difference of two child_cpu_seconds() readings, or None when unmeasurable."""
+    if before is None or after is None:
+        return None
+    return round(after - before, 3)
+
+def file_size(path):
+    try:
+        return Path(path).stat().st_size
+    except OSError:
+        return 0
+
+class Profiler:
+    """Collects one record per processed file."""
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.records = []
+
+    def measure(self, func, *args):
+        """Call func(*args) without recording it; returns (result, wall seconds, child CPU
+        seconds). For work done for several files at once, shared out with run(shared=...)."""
+        cpu_before = child_cpu_seconds()
+        started = time.perf_counter()
+        result = func(*args)
+        return result, time.perf_counter() - started, cpu_delta(cpu_before, child_cpu_seconds())
+
+    def run(self, path, func, *args, outputs=(), shared=None):
+        """Call func(*args) for 'path' and record its cost; returns func's result.
+        'outputs' lists other paths the result may be written to (checked in order).
+        'shared' is this file's (wall seconds, child CPU seconds) share of work done
+        for several files at once (see measure()), added to its figures."""
+        bytes_in = file_size(path)
+        cpu_before = child_cpu_seconds()
+        started = time.perf_counter()
+
+        result = func(*args)
+
+        wall_seconds = time.perf_counter() - started
+        cpu_seconds = cpu_delta(cpu_before, child_cpu_seconds())
+        if shared is not None:
+            wall_seconds += shared[0]
+            cpu_seconds = None if cpu_seconds is None or shared[1] is None else round(cpu_seconds + shared[1], 3)
+        bytes_out = next((file_size(p) for p in (path, *outputs) if Path(p).exists()), 0)
+
+        try:
+            name = Path(path).relative_to(self.root).as_posix()
+        except ValueError:
+            name = Path(path).as_posix()
+
+        self.records.append({
+            'file': name,
+            'wall_seconds': round(wall_seconds, 4),
+            'child_cpu_seconds': cpu_seconds,
+            'bytes_in': bytes_in,
+            'bytes_out': bytes_out,
+            'bytes_saved': bytes_in - bytes_out,
+            'changed': bool(result),
+        })
+        return result
+
+    def take_records(self):
+        """Return and clear the records collected so far (for worker processes)."""
+        records, self.records = self.records, []
+        return records
+
+    def write(self, step, path):
+        """Write this step's records as JSON."""
+        data = {'step': step, 'files': self.records}
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=1)
+
+def read_step_files(path):
+    """Records written by Profiler.write(), or an empty list."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('files', [])
+    except (OSError, ValueError):
+        return []
+
+def load_report(path=REPORT_FILE):
+    """The previous run's report, or None."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return data if data.get('version') == REPORT_VERSION else None
+
+def save_report(report, path=REPORT_FILE):
+    """Write the combined report atomically."""
+    data = dict(report, version=REPORT_VERSION)
+    tmp_path = Path(path).with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=1)
+    os.replace(tmp_path, path)
+
+def slowest_files(report, count):
+    """The 'count' files with the highest wall time across all steps, as (step, record)."""
+    files = [(name, record) for name, step in report['steps'].items() for record in step.get('files', [])]
+    files.sort(key=lambda item: item[1]['wall_seconds'], reverse=True)
+    return files[:count]
+
+def format_seconds(seconds):
+    return '-' if seconds is None else f"{seconds:.2f}s"
+
+def format_kb(size):
+    return f"{round(size / 1024)} KB"
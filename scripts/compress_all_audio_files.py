@@ -12,10 +12,16 @@ WHAT IT DOES:
     1. Scans all website directories for audio files (MP3, WAV, OGG, FLAC, M4A, AAC)
     2. Analyzes each audio file's current bitrate and duration
     3. Compresses to target bitrate (64kbps by default - good for voice/music)
-    4. Applies fade-in and fade-out effects (3 seconds each)
+    4. Applies fade-in and fade-out effects (3 seconds each), positioned
+       from the probed duration and cut to the exact sample
     5. Clamps duration to maximum length (60 seconds by default)
     6. Only replaces originals if compression provides meaningful savings
-    7. Converts all formats to MP3 for consistency
+    7. Converts all formats to MP3 for consistency, and writes an Opus copy
+       next to each MP3 (see OUTPUT FORMATS below)
+    8. Optionally (--loudnorm) normalizes loudness to EBU R128 with a
+       two-pass loudnorm (see LOUDNESS below)
+    9. Encodes from the stored original (master), never from a previous
+       output, and tags the result with its settings (see MASTERS below)
 
 TARGET LOCATIONS:
     - src/poems/** (audio tracks for poems)
@@ -30,6 +36,7 @@ CONFIGURATION:
     FADE_OUT_DURATION = 3            # Fade out duration in seconds
     MIN_SAVINGS_PERCENT = 5          # Only overwrite if >=5% smaller
     BITRATE_TOLERANCE_PERCENT = 10   # Skip if within 10% of target bitrate
+    OUTPUT_FORMATS = {'.mp3': ..., '.opus': ('libopus', '32k', 'ogg')}
 
 BEHAVIOR:
     - IDEMPOTENT: Safe to run multiple times
@@ -37,22 +44,98 @@ BEHAVIOR:
     - SMART SKIPPING: Avoids recompressing already-optimized audio
     - FADE EFFECTS: Adds smooth fade-in/fade-out
     - DURATION LIMITING: Clamps to maximum length
+    - CACHED: Verdicts are stored in scripts/.media_cache/audio.json, so
+      files unchanged since the last run are skipped without ffprobe
+    - NO GENERATION LOSS: Outputs are never encoded from themselves; with
+      no cache, the encode tag still skips them without decoding
+    - PARALLEL (optional): --jobs N encodes N tracks at a time
+    - SAFE REPLACEMENT: Each track is encoded to a hidden temp file in its
+      own directory (".<name>.*.mp3.tmp") and swapped in with an atomic
+      rename, so a crash never leaves a half-written .mp3 behind
 
 DEPENDENCIES:
     - ffmpeg (must be installed and in PATH)
-    - ffprobe (must be installed and in PATH)
+    - ffprobe (must be installed and in PATH; MP3 headers are read
+      in-process by media_probe.py, so ffprobe is only used for other formats)
     - Python 3.6+
 
 USAGE:
     python scripts/compress_all_audio_files.py
+    python scripts/compress_all_audio_files.py --jobs 4
+    python scripts/compress_all_audio_files.py --no-cache
+    python scripts/compress_all_audio_files.py --loudnorm
+    python scripts/compress_all_audio_files.py --loudnorm -14
+        (normalize to -16 LUFS, or to the given target)
+    python scripts/compress_all_audio_files.py --profile run.json
+        (per-file wall time, ffmpeg CPU time and bytes saved as JSON;
+        see build_profile.py)
+
+    --jobs N spreads the ffmpeg encodes over N worker processes (LAME is
+    single-threaded, so this scales almost linearly). Files that end up as
+    the same .mp3 (e.g. track.wav next to an older track.mp3) are always
+    handled together by one worker, in the serial order, so two workers
+    never write or delete the same file. Each worker's report is buffered
+    and printed in the usual directory order, so the output matches a
+    serial run.
+
+OUTPUT FORMATS:
+    Every track is written in each OUTPUT_FORMATS entry, all from the same
+    master, with the same cut, fades and loudness:
+    - track.mp3 at TARGET_BITRATE: the fallback every browser plays, and
+      the file the skip logic below works from
+    - track.opus at 32 kbps (Ogg Opus): about the quality of the 64k MP3
+      at half the bytes
+    generate_content_manifests.py lists all of them in the poem entry
+    ("audio_sources", smallest first) and the poem player picks the first
+    one the browser can play. Each extra format carries its own encode tag
+    (an Ogg comment) and is written again when it is missing or its tag
+    no longer matches the master or settings. .opus files are never
+    treated as sources.
+
+MASTERS:
+    The first time a track is seen without an encode tag it is treated as
+    an original: a copy goes to .audio_masters/ (repository root,
+    git-ignored), named by its SHA-256 (see audio_masters.py). Every MP3
+    this script writes is encoded from that master and carries an ID3
+    TXXX "encode_params" tag with the master's hash and the encode
+    settings (bitrate, duration limit, fades, loudness target).
+    On later runs:
+    - Tag matches the current settings: skipped after reading the tag
+      alone, no decoding, no cache needed
+    - Tag is outdated (e.g. --loudnorm added): encoded again from the
+      master, whatever the savings
+    - An MP3 original that encoding doesn't shrink enough is kept, and
+      the tag (marked "kept") is written into it with a stream copy, so
+      it is skipped from the tag alone too. When the settings change it
+      is judged like an original again, not re-encoded regardless
+    - Master missing (store deleted): the current file is adopted as the
+      master, losing one generation once
+    To replace a track, drop the new original (any format) in its place:
+    it has no tag, so it becomes a new master.
+
+LOUDNESS:
+    With --loudnorm every track is measured with loudnorm's analysis pass
+    (integrated loudness, true peak, loudness range; see loudness.py).
+    Tracks more than 1 LU off target are re-encoded with the second,
+    linear loudnorm pass in front of the fades, even if their bitrate is
+    already fine. The analysis is cached by content hash in
+    scripts/.media_cache/loudness.json, so it runs once per track: later
+    rebuilds only run the encode pass.
 
 OUTPUT:
     Prints detailed progress for each directory and audio file:
     - [Current] - Shows current bitrate, duration, codec
     - [Skipped - already optimized] - Already at target bitrate/duration
+    - [Skipped - up to date] - Encode tag matches the current settings
+    - [Re-encoded from master] - Settings changed since the last encode
+    - [Master missing] - Encode tag names a master that isn't stored
+    - [Encoded] - An extra output format (e.g. .opus) was written
     - [Compressed] - Successfully compressed with savings percentage
     - [Converted] - Format converted (even if file size increased)
+    - [Normalized] - Re-encoded to the loudness target (--loudnorm)
     - [Skipped - no improvement] - Compression didn't meet minimum savings
+      (the original is kept and tagged)
+    - [Tag error] - The kept original couldn't be tagged
     - [FFmpeg error] - Error during compression
 
 EXAMPLE OUTPUT:
@@ -72,21 +155,32 @@ EXAMPLE OUTPUT:
 
 NOTES:
     - All audio is converted to MP3 format
-    - Original non-MP3 files are deleted after conversion
-    - Fade-out starts at (max_duration - fade_out_duration)
+    - Original non-MP3 files are deleted after conversion; their copy in
+      .audio_masters/ stays the source for future encodes
+    - Fade-out ends on the last sample kept: at the track's probed duration,
+      or at MAX_DURATION for longer tracks (see audio_filters())
     - Bitrate tolerance allows files within 10% of target to skip
 
 AUTHOR: Website maintenance scripts
-LAST MODIFIED: 2026-01-16
+LAST MODIFIED: 2026-10-17
 ================================================================================
 """
 
+import io
 import os
 import sys
 from pathlib import Path
+import shutil
 import subprocess
 import tempfile
-import json
+import argparse
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
+from media_probe import probe_audio, probe_many
+from media_cache import MediaCache, VERDICT_OPTIMIZED, VERDICT_NO_IMPROVEMENT
+from build_profile import Profiler
+from loudness import Loudness, TARGET_I
+from audio_masters import MasterStore, MASTERS_DIR, ENCODE_TAG, read_encode_params, encode_params
 
 # ----------------------------- CONFIG -----------------------------
 TARGET_BITRATE = '64k'       # Target audio bitrate (64k is good for voice/music)
@@ -95,55 +189,20 @@ FADE_IN_DURATION = 3         # Fade in duration in seconds
 FADE_OUT_DURATION = 3        # Fade out duration in seconds
 MIN_SAVINGS_PERCENT = 5      # Only overwrite if new file is at least this % smaller
 BITRATE_TOLERANCE_PERCENT = 10  # Skip if within 10% of target bitrate
+
+# Output formats written for every track, from its master: extension -> (ffmpeg encoder,
+# bitrate, muxer). The MP3 is always written (every browser plays it, and it is the file
+# the skip logic and the other scripts look at); Opus sounds like the 64k MP3 at about
+# half the bytes, and the poem player picks it where the browser supports it.
+OUTPUT_FORMATS = {
+    '.mp3': ('libmp3lame', TARGET_BITRATE, 'mp3'),
+    '.opus': ('libopus', '32k', 'ogg'),
+}
 # ------------------------------------------------------------------
 
 def get_audio_info(audio_path):
-    """Get audio bitrate, duration, and format using ffprobe."""
-    cmd = [
-        'ffprobe',
-        '-v', 'error',
-        '-select_streams', 'a:0',
-        '-show_entries', 'stream=bit_rate,duration,codec_name',
-        '-show_entries', 'format=duration,bit_rate',
-        '-of', 'json',
-        str(audio_path)
-    ]
-    
-    try:
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-        if result.returncode == 0:
-            data = json.loads(result.stdout)
-            
-            # Try to get bitrate from stream first, then format
-            bitrate = None
-            duration = None
-            codec = None
-            
-            if 'streams' in data and len(data['streams']) > 0:
-                stream = data['streams'][0]
-                bitrate = stream.get('bit_rate')
-                duration = stream.get('duration')
-                codec = stream.get('codec_name')
-            
-            if 'format' in data:
-                if bitrate is None:
-                    bitrate = data['format'].get('bit_rate')
-                if duration is None:
-                    duration = data['format'].get('duration')
-            
-            # Convert to appropriate types
-            bitrate = int(bitrate) if bitrate else None
-            duration = float(duration) if duration else None
-            
-            return {
-                'bitrate': bitrate,
-                'duration': duration,
-                'codec': codec
-            }
-    except Exception:
-        pass
-    
-    return None
+    """Get audio bitrate, duration, and format (MP3 headers read in-process, ffprobe fallback)."""
+    return probe_audio(audio_path)
 
 def parse_bitrate(bitrate_str):
     """Parse bitrate string like '64k' to bits per second."""
@@ -176,98 +235,359 @@ def needs_compression(audio_path, info):
     
     return True
 
-def compress_audio(audio_path):
-    """Compress audio and return temp file path with compressed version."""
-    original_size = audio_path.stat().st_size
+def audio_filters(duration, sample_rate, loudnorm=None, max_duration=MAX_DURATION,
+                  fade_in=FADE_IN_DURATION, fade_out=FADE_OUT_DURATION):
+    """Filter chain that clamps a track to max_duration, optionally normalizes its
+    loudness and fades it in and out.
+    
+    Fades are placed from the probed duration, so a track shorter than max_duration
+    still fades out at its real end, and neither fade is longer than half the track.
+    With a known sample rate the cut and the fades are given in samples, so the
+    fade-out ends exactly on the last sample kept.
+    """
+    if duration and max_duration > 0:
+        duration = min(duration, max_duration)
+    elif not duration:
+        duration = max_duration or None  # Unknown length: assume it reaches the limit
+    
+    filters = []
+    if duration and sample_rate:
+        total_samples = int(duration * sample_rate)
+        filters.append(f'atrim=end_sample={total_samples}')
+    elif duration:
+        filters.append(f'atrim=end={duration}')
+    
+    if loudnorm:
+        filters.append(loudnorm)
+        if sample_rate:
+            filters.append(f'aresample={sample_rate}')  # loudnorm outputs 192 kHz
+    
+    if duration:
+        fade_in = min(fade_in, duration / 2)
+        fade_out = min(fade_out, duration / 2)
+    if fade_in > 0:
+        if sample_rate:
+            filters.append(f'afade=t=in:start_sample=0:nb_samples={round(fade_in * sample_rate)}')
+        else:
+            filters.append(f'afade=t=in:st=0:d={fade_in}')
+    if fade_out > 0 and duration:
+        if sample_rate:
+            fade_samples = round(fade_out * sample_rate)
+            filters.append(f'afade=t=out:start_sample={total_samples - fade_samples}:nb_samples={fade_samples}')
+        else:
+            filters.append(f'afade=t=out:st={duration - fade_out}:d={fade_out}')
     
-    # Create temporary file
-    with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as tmp:
+    return filters
+
+def encode_settings(loudness=None, bitrate=TARGET_BITRATE, max_duration=MAX_DURATION,
+                    fade_in=FADE_IN_DURATION, fade_out=FADE_OUT_DURATION):
+    """Settings that change the encoded audio, recorded in each output's encode tag."""
+    return {
+        'bitrate': bitrate,
+        'max_duration': max_duration,
+        'fade_in': fade_in,
+        'fade_out': fade_out,
+        'loudness': loudness.settings() if loudness is not None else None,
+    }
+
+def compress_audio(source_path, target_path, info=None, loudness=None, tag=None):
+    """Encode source_path (the master) to a temp file next to target_path, in the
+    OUTPUT_FORMATS entry of its extension; returns (temp file path, size), or (None, 0)
+    on error.
+    'info' (from get_audio_info) places the cut and the fades; with a Loudness,
+    the second loudnorm pass runs ahead of the fades. 'tag' is written as the
+    encode_params ID3 tag."""
+    # Temp file next to the target, so the final replace is an atomic rename on the same
+    # filesystem. The .tmp suffix keeps it out of find_all_audio() if a run is interrupted.
+    encoder, bitrate, muxer = OUTPUT_FORMATS[target_path.suffix.lower()]
+    with tempfile.NamedTemporaryFile(dir=target_path.parent, prefix=f'.{target_path.stem}.',
+                                     suffix=f'{target_path.suffix}.tmp', delete=False) as tmp:
         temp_path = Path(tmp.name)
     
     # Build FFmpeg command
     cmd = [
         'ffmpeg',
-        '-i', str(audio_path),
+        '-i', str(source_path),
         '-map', '0:a',  # Map audio stream
-        '-b:a', TARGET_BITRATE,
+        '-c:a', encoder,
+        '-b:a', bitrate,
         '-vn',  # No video
     ]
     
-    # Add duration limit if specified
-    if MAX_DURATION > 0:
-        cmd.extend(['-t', str(MAX_DURATION)])
+    # Duration limit and fades, placed from the probed duration; loudness normalization
+    # (measured values come from the cached first pass) goes between the two
+    loudnorm = None
+    sample_rate = info.get('sample_rate') if info else None
+    if loudness is not None:
+        loudnorm, measured_rate = loudness.second_pass(source_path)
+        sample_rate = sample_rate or measured_rate
+    filters = audio_filters(info.get('duration') if info else None, sample_rate, loudnorm)
     
-    # Add fade effects
-    if FADE_IN_DURATION > 0 or FADE_OUT_DURATION > 0:
-        filters = []
-        if FADE_IN_DURATION > 0:
-            filters.append(f'afade=t=in:ss=0:d={FADE_IN_DURATION}')
-        if FADE_OUT_DURATION > 0:
-            # Fade out starts at (duration - fade_out_duration)
-            fade_out_start = MAX_DURATION - FADE_OUT_DURATION if MAX_DURATION > 0 else 57
-            filters.append(f'afade=t=out:st={fade_out_start}:d={FADE_OUT_DURATION}')
-        
-        if filters:
-            cmd.extend(['-af', ','.join(filters)])
+    if filters:
+        cmd.extend(['-af', ','.join(filters)])
+    
+    if tag:
+        cmd.extend(['-metadata', f'{ENCODE_TAG}={tag}'])
     
-    cmd.extend(['-y', str(temp_path)])
+    cmd.extend(['-f', muxer, '-y', str(temp_path)])
     
     # Run FFmpeg
     result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
     
     if result.returncode != 0:
         temp_path.unlink(missing_ok=True)
-        return None, original_size
+        return None, 0
     
     new_size = temp_path.stat().st_size
     return temp_path, new_size
 
-def process_audio(audio_path):
-    """Process a single audio file."""
+def tag_original(audio_path, tag):
+    """Write the encode tag into an original kept as it is, by stream copy (no
+    re-encode). Returns True if the file was rewritten."""
+    encoder, bitrate, muxer = OUTPUT_FORMATS['.mp3']
+    with tempfile.NamedTemporaryFile(dir=audio_path.parent, prefix=f'.{audio_path.stem}.',
+                                     suffix=f'{audio_path.suffix}.tmp', delete=False) as tmp:
+        temp_path = Path(tmp.name)
+    cmd = ['ffmpeg', '-i', str(audio_path), '-map', '0', '-c', 'copy',
+           '-metadata', f'{ENCODE_TAG}={tag}', '-f', muxer, '-y', str(temp_path)]
+    result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    if result.returncode != 0 or temp_path.stat().st_size == 0:
+        temp_path.unlink(missing_ok=True)
+        return False
+    shutil.copymode(audio_path, temp_path)
+    temp_path.replace(audio_path)
+    return True
+
+def print_audio_info(audio_path, info, out=None):
+    """Print the current bitrate, duration and codec of a file to 'out' (default: stdout)."""
+    bitrate_kb = info['bitrate'] // 1000 if info['bitrate'] else 0
+    duration = info['duration'] if info['duration'] else 0
+    codec = info['codec'] if info['codec'] else 'unknown'
+    print(f"   [Current] {audio_path.name} | {bitrate_kb}kbps, {duration:.1f}s, {codec}", file=out)
+
+def cache_settings(loudness=None):
+    """Settings that change the verdicts stored in the media cache."""
+    return {
+        'loudness': loudness.settings() if loudness is not None else None,
+        'target_bitrate': TARGET_BITRATE,
+        'max_duration': MAX_DURATION,
+        'fade_in_duration': FADE_IN_DURATION,
+        'fade_out_duration': FADE_OUT_DURATION,
+        'min_savings_percent': MIN_SAVINGS_PERCENT,
+        'bitrate_tolerance_percent': BITRATE_TOLERANCE_PERCENT,
+        'output_formats': {ext: list(spec) for ext, spec in OUTPUT_FORMATS.items()},  # Lists, as read back from JSON
+    }
+
+def extra_formats():
+    """Output formats written next to each .mp3."""
+    return [ext for ext in OUTPUT_FORMATS if ext != '.mp3']
+
+def format_settings(ext, loudness=None):
+    """Encode settings of one output format (what its encode tag records). Extra
+    formats also record their encoder and container, so changing either in
+    OUTPUT_FORMATS encodes them again; the .mp3 settings stay those of
+    encode_settings(), which the batch bitrate scripts tag their MP3s with."""
+    encoder, bitrate, muxer = OUTPUT_FORMATS[ext]
+    settings = encode_settings(loudness, bitrate=bitrate)
+    if ext != '.mp3':
+        settings.update(codec=encoder, container=muxer)
+    return settings
+
+def stale_formats(target_path, master_sha256, loudness=None):
+    """Extra formats of target_path (the .mp3) that are missing, or were encoded from
+    another master or with other settings (read from their encode tags, no decoding)."""
+    stale = []
+    for ext in extra_formats():
+        tag = read_encode_params(target_path.with_suffix(ext))
+        if tag is None or tag['master'] != master_sha256 or tag['settings'] != format_settings(ext, loudness):
+            stale.append(ext)
+    return stale
+
+def encode_formats(target_path, master, sha256, master_info, loudness=None, normalize=False, out=None):
+    """Write the stale extra formats of target_path from the master; returns how many
+    were written. Report lines go to 'out' (default: stdout)."""
+    written = 0
+    for ext in stale_formats(target_path, sha256, loudness):
+        output_path = target_path.with_suffix(ext)
+        temp_path, new_size = compress_audio(master, output_path, master_info, loudness if normalize else None,
+                                             encode_params(sha256, format_settings(ext, loudness)))
+        if temp_path is None:
+            print(f"   [FFmpeg error] {output_path.name}", file=out)
+            continue
+        temp_path.replace(output_path)
+        print(f"   [Encoded] {output_path.name} | {new_size//1024} KB", file=out)
+        written += 1
+    return written
+
+def process_audio(audio_path, cache=None, info=None, loudness=None, masters=None, out=None):
+    """Process a single audio file (its .mp3 and the other OUTPUT_FORMATS); returns True
+    if anything was written. 'info' may carry a result from probe_many().
+    Report lines go to 'out' (default: stdout)."""
     original_size = audio_path.stat().st_size
+    target_path = audio_path.with_suffix('.mp3')
+    if masters is None:
+        masters = MasterStore()
+    
+    # Unchanged since the last run: reuse its verdict without probing
+    if cache is not None:
+        entry = cache.lookup(audio_path)
+        if entry is not None and all(target_path.with_suffix(ext).exists() for ext in extra_formats()):
+            if entry['info']:
+                print_audio_info(audio_path, entry['info'], out)
+            if entry['verdict'] == VERDICT_NO_IMPROVEMENT:
+                print(f"   [Skipped - no improvement] {audio_path.name}", file=out)
+            else:
+                print(f"   [Skipped - already optimized] {audio_path.name}", file=out)
+            return False
     
     # Get audio info
-    info = get_audio_info(audio_path)
+    if info is None:
+        info = get_audio_info(audio_path)
     
     # Display current info
     if info:
-        bitrate_kb = info['bitrate'] // 1000 if info['bitrate'] else 0
-        duration = info['duration'] if info['duration'] else 0
-        codec = info['codec'] if info['codec'] else 'unknown'
-        print(f"   [Current] {audio_path.name} | {bitrate_kb}kbps, {duration:.1f}s, {codec}")
+        print_audio_info(audio_path, info, out)
     else:
-        print(f"   [Checking] {audio_path.name}")
-    
-    # Check if compression needed
-    if not needs_compression(audio_path, info):
-        print(f"   [Skipped - already optimized] {audio_path.name}")
+        print(f"   [Checking] {audio_path.name}", file=out)
+    
+    # Our own output, already encoded with these settings: the tags alone say so
+    settings = encode_settings(loudness)
+    tag = read_encode_params(audio_path)
+    up_to_date = tag is not None and tag['settings'] == settings
+    output = tag is not None and not tag.get('kept')  # Encoded by us, not a kept original
+    if up_to_date and not stale_formats(target_path, tag['master'], loudness):
+        print(f"   [Skipped - up to date] {audio_path.name}", file=out)
+        if cache is not None:
+            cache.record(audio_path, info, VERDICT_OPTIMIZED)
         return False
     
+    # Every encode starts from the master, never from a previous lossy output. An
+    # untagged file is an original and gets stored as its own master here.
+    sha256, master = masters.master_for(audio_path, tag)
+    master_info = info
+    if tag is not None:
+        if sha256 == tag['master']:
+            master_info = get_audio_info(master)
+        else:
+            # The .mp3 is encoded again too, so all formats name the same master
+            print(f"   [Master missing] {audio_path.name} | the current file becomes its master", file=out)
+            up_to_date = False
+    
+    # Check if compression (or loudness normalization) needed. Only an original (kept
+    # or not) can be fine as it is; an output with outdated settings is always encoded again.
+    normalize = loudness is not None and loudness.needs_normalizing(master)
+    if up_to_date or (not output and not needs_compression(audio_path, info) and not normalize):
+        print(f"   [Skipped - {'up to date' if up_to_date else 'already optimized'}] {audio_path.name}", file=out)
+        written = encode_formats(target_path, master, sha256, master_info, loudness, normalize, out)
+        if cache is not None:
+            cache.record(audio_path, info, VERDICT_OPTIMIZED)
+        return written > 0
+    
     # Compress
-    temp_path, new_size = compress_audio(audio_path)
+    temp_path, new_size = compress_audio(master, target_path, master_info,
+                                         loudness if normalize else None, encode_params(sha256, settings))
     
     if temp_path is None:
-        print(f"   [FFmpeg error] {audio_path.name}")
+        print(f"   [FFmpeg error] {audio_path.name}", file=out)
         return False
     
     # Check if compression provides meaningful savings or if it's a format conversion
-    if new_size < original_size * (1 - MIN_SAVINGS_PERCENT / 100) or info.get('codec') != 'mp3':
-        if new_size < original_size:
+    codec = info.get('codec') if info else None
+    if (new_size < original_size * (1 - MIN_SAVINGS_PERCENT / 100) or codec != 'mp3'
+            or normalize or output):
+        if normalize:
+            measured = loudness.measure(master)
+            print(f"   [Normalized] {audio_path.name} | {measured['input_i']:.1f} → {loudness.target_i:g} LUFS, "
+                  f"{original_size//1024} KB → {new_size//1024} KB", file=out)
+        elif output:
+            print(f"   [Re-encoded from master] {audio_path.name} | {original_size//1024} KB → {new_size//1024} KB", file=out)
+        elif new_size < original_size:
             savings = (original_size - new_size) / original_size * 100
-            print(f"   [Compressed] {audio_path.name} | {original_size//1024} KB → {new_size//1024} KB (-{savings:.1f}%)")
+            print(f"   [Compressed] {audio_path.name} | {original_size//1024} KB → {new_size//1024} KB (-{savings:.1f}%)", file=out)
         else:
-            print(f"   [Converted] {audio_path.name} | {original_size//1024} KB → {new_size//1024} KB")
-        temp_path.replace(audio_path.with_suffix('.mp3'))  # Ensure .mp3 extension
+            print(f"   [Converted] {audio_path.name} | {original_size//1024} KB → {new_size//1024} KB", file=out)
+        temp_path.replace(target_path)  # Ensure .mp3 extension
         
-        # If original wasn't .mp3, remove it
+        # If original wasn't .mp3, remove it (the master store keeps a copy)
         if audio_path.suffix.lower() != '.mp3':
             audio_path.unlink()
+            if cache is not None:
+                cache.forget(audio_path)
+        
+        # The other formats follow the same master and settings
+        encode_formats(target_path, master, sha256, master_info, loudness, normalize, out)
+        
+        # The new file was just encoded at the target settings
+        if cache is not None:
+            cache.record(target_path, None, VERDICT_OPTIMIZED)
         
         return True
     else:
-        print(f"   [Skipped - no improvement] {audio_path.name}")
+        print(f"   [Skipped - no improvement] {audio_path.name}", file=out)
         temp_path.unlink()
-        return False
+        # Tag the kept original, so runs without the media cache skip it from the tag too
+        if audio_path.suffix.lower() == '.mp3' and not tag_original(
+                audio_path, encode_params(sha256, settings, kept=True)):
+            print(f"   [Tag error] {audio_path.name} | kept without an encode tag", file=out)
+        written = encode_formats(target_path, master, sha256, master_info, loudness, normalize, out)
+        if cache is not None:
+            cache.record(audio_path, info, VERDICT_NO_IMPROVEMENT)
+        return written > 0
+
+_worker_cache = None
+_worker_profiler = None
+_worker_loudness = None
+_worker_masters = None
+
+def init_worker(cache, profiler=None, loudness=None, masters=None):
+    """Give each worker process its own copy of the media cache, profiler, loudness cache
+    and master store."""
+    global _worker_cache, _worker_profiler, _worker_loudness, _worker_masters
+    _worker_cache = cache
+    _worker_profiler = profiler
+    _worker_loudness = loudness
+    _worker_masters = masters
+
+def process_group(group, cache=None, profiler=None, loudness=None, masters=None):
+    """Process (audio, info) pairs that share one target .mp3, in order, returning
+    [(compressed, report text)]."""
+    results = []
+    for audio_path, info in group:
+        report = io.StringIO()
+        args = (audio_path, cache, info, loudness, masters, report)
+        if profiler is not None:
+            compressed = profiler.run(audio_path, process_audio, *args, outputs=(audio_path.with_suffix('.mp3'),))
+        else:
+            compressed = process_audio(*args)
+        results.append((compressed, report.getvalue()))
+    return results
+
+def process_group_captured(group):
+    """Process a group in a worker process, returning ([(compressed, report text)],
+    {'audio': cache updates, 'loudness': loudness updates}, profile records)."""
+    # Reports are written to their own buffers; anything else a worker prints would
+    # otherwise reach the terminal out of order, so it joins the group's last report.
+    # (Safe here: a worker process runs one group at a time.)
+    stray = io.StringIO()
+    with contextlib.redirect_stdout(stray):
+        results = process_group(group, _worker_cache, _worker_profiler, _worker_loudness, _worker_masters)
+    if stray.getvalue() and results:
+        compressed, report = results[-1]
+        results[-1] = (compressed, report + stray.getvalue())
+    updates = {
+        'audio': _worker_cache.take_updates() if _worker_cache is not None else {},
+        'loudness': _worker_loudness.take_updates() if _worker_loudness is not None else None,
+    }
+    records = _worker_profiler.take_records() if _worker_profiler is not None else []
+    return results, updates, records
+
+def make_groups(audio_files, infos):
+    """Split one directory's files into groups by target .mp3 (sorted order kept inside
+    each group), so files that write the same output never run in different workers."""
+    groups = {}
+    for audio_path in audio_files:
+        groups.setdefault(audio_path.with_suffix('.mp3'), []).append((audio_path, infos.get(audio_path)))
+    return list(groups.values())
 
 def find_all_audio(repo_root):
     """Find all audio files in the website directory structure."""
@@ -302,13 +622,31 @@ def check_dependencies():
         print("Install from: https://ffmpeg.org/download.html")
         return False
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Compress all website audio files with FFmpeg.")
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help="number of audio files to encode at the same time (default: 1)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="ignore the media cache and probe every file again")
+    parser.add_argument('--profile', type=Path, metavar='PATH',
+                        help="write per-file timing and size figures to this JSON file")
+    parser.add_argument('--loudnorm', type=float, nargs='?', const=TARGET_I, metavar='LUFS',
+                        help=f"normalize loudness (EBU R128, two-pass) to LUFS (default: {TARGET_I:g})")
+    args = parser.parse_args(argv)
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    return args
+
+def main(argv=None):
+    """Run the script; returns the process exit status."""
+    args = parse_args(argv)
+    
     print("\nAudio Compression")
     print("-" * 40)
     
     # Check dependencies
     if not check_dependencies():
-        sys.exit(1)
+        return 1
     
     # Get repository root
     script_dir = Path(__file__).parent
@@ -320,6 +658,13 @@ def main():
         print(f"Max duration: {MAX_DURATION} seconds")
     if FADE_IN_DURATION > 0 or FADE_OUT_DURATION > 0:
         print(f"Fade effects: {FADE_IN_DURATION}s in, {FADE_OUT_DURATION}s out")
+    loudness = None
+    if args.loudnorm is not None:
+        loudness = Loudness(args.loudnorm, MAX_DURATION, repo_root, use_cache=not args.no_cache)
+    print(f"Loudness: {loudness.describe() if loudness is not None else 'unchanged'}")
+    masters = MasterStore(repo_root)
+    print(f"Masters: {MASTERS_DIR}/")
+    print(f"Workers: {args.jobs}")
     print()
     
     # Find all audio files
@@ -328,7 +673,7 @@ def main():
     
     if not audio_files:
         print("   No audio files found.")
-        return
+        return 0
     
     print(f"   Found {len(audio_files)} audio file(s)\n")
     
@@ -340,23 +685,67 @@ def main():
             audio_by_dir[dir_path] = []
         audio_by_dir[dir_path].append(audio)
     
+    cache = None if args.no_cache else MediaCache('audio', cache_settings(loudness), repo_root)
+    
+    # Probe every file the cache doesn't already know about in one batch
+    infos = probe_many([a for a in audio_files if cache is None or cache.lookup(a) is None], 'audio')
+    
+    # One task per target .mp3, never across directories, so the report stays grouped
+    groups_by_dir = {dir_path: make_groups(sorted(audio_by_dir[dir_path]), infos)
+                     for dir_path in sorted(audio_by_dir.keys())}
+    groups = [group for dir_groups in groups_by_dir.values() for group in dir_groups]
+    
+    profiler = Profiler(repo_root) if args.profile else None
+    
+    pool = None
+    if args.jobs > 1:
+        # map() yields results in submission order, so the report stays deterministic
+        pool = ProcessPoolExecutor(max_workers=args.jobs, initializer=init_worker, initargs=(cache, profiler, loudness, masters))
+        results = pool.map(process_group_captured, groups)
+    else:
+        results = ((process_group(group, cache, profiler, loudness, masters), None, None) for group in groups)
+    
     # Process each directory
     total_compressed = 0
     total_skipped = 0
     
-    for dir_path in sorted(audio_by_dir.keys()):
-        rel_path = dir_path.relative_to(repo_root)
-        print(f"\n{rel_path}/")
-        print("-" * 40)
-        
-        for audio_path in sorted(audio_by_dir[dir_path]):
-            if process_audio(audio_path):
-                total_compressed += 1
-            else:
-                total_skipped += 1
+    try:
+        for dir_path in sorted(audio_by_dir.keys()):
+            rel_path = dir_path.relative_to(repo_root)
+            print(f"\n{rel_path}/")
+            print("-" * 40)
+            
+            for _ in groups_by_dir[dir_path]:
+                items, updates, records = next(results)
+                for compressed, output in items:
+                    print(output, end='')
+                    if compressed:
+                        total_compressed += 1
+                    else:
+                        total_skipped += 1
+                if updates and cache is not None:
+                    cache.merge(updates['audio'])
+                if updates and loudness is not None:
+                    loudness.merge(updates['loudness'])
+                if records:
+                    profiler.records.extend(records)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        if cache is not None:
+            cache.save()
+        if loudness is not None:
+            loudness.save()
+        if profiler is not None:
+            profiler.write('audio', args.profile)
     
     # Summary
-    print(f"\nCompressed: {total_compressed}, Skipped: {total_skipped}, Total: {len(audio_files)}\n")
+    print(f"\nCompressed: {total_compressed}, Skipped: {total_skipped}, Total: {len(audio_files)}")
+    if loudness is not None:
+        print(f"Loudness analysis passes run: {loudness.totals['measured']}")
+    print()
+    
+    return 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -21,6 +21,8 @@ TARGET LOCATIONS:
     - src/blogs/**/res/ (blog demonstration videos)
     - src/resources/videos/ (general video files)
     - src/bio/res/ (bio-related videos)
+    Generated files under src/resources/derivatives/ (the GIF conversions
+    of convert_animated_gifs.py) are skipped.
 
 CONFIGURATION:
     TARGET_CRF = 23              # Constant Rate Factor: 0=lossless, 51=worst (18-28 recommended)
@@ -38,6 +40,8 @@ BEHAVIOR:
     - FRAMERATE CONTROL: Optionally normalize framerate
     - SMART SKIPPING: Avoids recompressing already-optimized videos
     - AUDIO PRESERVATION: Copies or converts audio to AAC 128kbps
+    - CACHED: Verdicts are stored in scripts/.media_cache/video.json, so
+      files unchanged since the last run are skipped without ffprobe
 
 DEPENDENCIES:
     - ffmpeg (must be installed and in PATH)
@@ -46,6 +50,10 @@ DEPENDENCIES:
 
 USAGE:
     python scripts/compress_all_video_files.py
+    python scripts/compress_all_video_files.py --no-cache
+    python scripts/compress_all_video_files.py --profile run.json
+        (per-file wall time, ffmpeg CPU time and bytes saved as JSON;
+        see build_profile.py)
 
 OUTPUT:
     Prints detailed progress for each directory and video file:
@@ -92,7 +100,10 @@ import sys
 from pathlib import Path
 import subprocess
 import tempfile
-import json
+import argparse
+from media_probe import probe_video, probe_many
+from media_cache import MediaCache, VERDICT_OPTIMIZED, VERDICT_NO_IMPROVEMENT
+from build_profile import Profiler
 
 # ----------------------------- CONFIG -----------------------------
 TARGET_CRF = 23              # Constant Rate Factor: 0 = lossless, 51 = worst (18-28 is good)
@@ -104,51 +115,11 @@ MIN_SAVINGS_PERCENT = 10     # Only overwrite if new file is at least this % sma
 CRF_TOLERANCE = 3            # Skip if CRF is within this range of target
 # ------------------------------------------------------------------
 
+GENERATED_DIR = 'src/resources/derivatives'   # Written by convert_animated_gifs.py
+
 def get_video_info(video_path):
-    """Get video properties using ffprobe."""
-    cmd = [
-        'ffprobe',
-        '-v', 'error',
-        '-select_streams', 'v:0',
-        '-show_entries', 'stream=width,height,codec_name,bit_rate,r_frame_rate,pix_fmt',
-        '-show_entries', 'format=duration,size,bit_rate',
-        '-of', 'json',
-        str(video_path)
-    ]
-    
-    try:
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-        if result.returncode == 0:
-            data = json.loads(result.stdout)
-            
-            info = {}
-            
-            if 'streams' in data and len(data['streams']) > 0:
-                stream = data['streams'][0]
-                info['width'] = stream.get('width', 0)
-                info['height'] = stream.get('height', 0)
-                info['codec'] = stream.get('codec_name', '')
-                info['pix_fmt'] = stream.get('pix_fmt', '')
-                
-                # Parse framerate
-                fps_str = stream.get('r_frame_rate', '0/1')
-                try:
-                    num, denom = fps_str.split('/')
-                    info['fps'] = float(num) / float(denom) if float(denom) > 0 else 0
-                except:
-                    info['fps'] = 0
-            
-            if 'format' in data:
-                info['duration'] = float(data['format'].get('duration', 0))
-                info['size'] = int(data['format'].get('size', 0))
-                info['bitrate'] = int(data['format'].get('bit_rate', 0))
-            
-            return info
-    except Exception as e:
-        print(f"Error getting video info: {e}")
-        pass
-    
-    return None
+    """Get video properties using ffprobe (via media_probe)."""
+    return probe_video(video_path)
 
 def needs_compression(video_path, info):
     """Check if video needs compression based on current properties."""
@@ -241,30 +212,60 @@ def compress_video(video_path):
     new_size = temp_path.stat().st_size
     return temp_path, new_size
 
-def process_video(video_path):
-    """Process a single video file."""
+def print_video_info(video_path, info):
+    """Print the current resolution, framerate, codec, bitrate and duration of a file."""
+    width = info.get('width', 0)
+    height = info.get('height', 0)
+    codec = info.get('codec', 'unknown')
+    fps = info.get('fps', 0)
+    duration = info.get('duration', 0)
+    bitrate_mbps = info.get('bitrate', 0) / 1_000_000
+    
+    print(f"   [Current] {video_path.name}")
+    print(f"             {width}x{height}, {fps:.1f}fps, {codec}, {bitrate_mbps:.1f}Mbps, {duration:.1f}s")
+
+def cache_settings():
+    """Settings that change the verdicts stored in the media cache."""
+    return {
+        'target_crf': TARGET_CRF,
+        'target_codec': TARGET_CODEC,
+        'max_width': MAX_WIDTH,
+        'max_height': MAX_HEIGHT,
+        'target_fps': TARGET_FPS,
+        'min_savings_percent': MIN_SAVINGS_PERCENT,
+    }
+
+def process_video(video_path, cache=None, info=None):
+    """Process a single video file. 'info' may carry a result from probe_many()."""
     original_size = video_path.stat().st_size
     
+    # Unchanged since the last run: reuse its verdict without probing
+    if cache is not None:
+        entry = cache.lookup(video_path)
+        if entry is not None:
+            if entry['info']:
+                print_video_info(video_path, entry['info'])
+            if entry['verdict'] == VERDICT_NO_IMPROVEMENT:
+                print(f"   [Skipped - no improvement] {video_path.name}")
+            else:
+                print(f"   [Skipped - already optimized] {video_path.name}")
+            return False
+    
     # Get video info
-    info = get_video_info(video_path)
+    if info is None:
+        info = get_video_info(video_path)
     
     # Display current info
     if info:
-        width = info.get('width', 0)
-        height = info.get('height', 0)
-        codec = info.get('codec', 'unknown')
-        fps = info.get('fps', 0)
-        duration = info.get('duration', 0)
-        bitrate_mbps = info.get('bitrate', 0) / 1_000_000
-        
-        print(f"   [Current] {video_path.name}")
-        print(f"             {width}x{height}, {fps:.1f}fps, {codec}, {bitrate_mbps:.1f}Mbps, {duration:.1f}s")
+        print_video_info(video_path, info)
     else:
         print(f"   [Checking] {video_path.name}")
     
     # Check if compression needed
     if not needs_compression(video_path, info):
         print(f"   [Skipped - already optimized] {video_path.name}")
+        if cache is not None:
+            cache.record(video_path, info, VERDICT_OPTIMIZED)
         return False
     
     # Compress
@@ -288,11 +289,19 @@ def process_video(video_path):
         # If original wasn't .mp4, remove it
         if video_path.suffix.lower() != '.mp4':
             video_path.unlink()
+            if cache is not None:
+                cache.forget(video_path)
+        
+        # The new file was just encoded at the target settings
+        if cache is not None:
+            cache.record(new_path, None, VERDICT_OPTIMIZED)
         
         return True
     else:
         print(f"   [Skipped - no improvement] {video_path.name}")
         temp_path.unlink()
+        if cache is not None:
+            cache.record(video_path, info, VERDICT_NO_IMPROVEMENT)
         return False
 
 def find_all_videos(repo_root):
@@ -307,10 +316,14 @@ def find_all_videos(repo_root):
         repo_root / 'src' / 'bio',
     ]
     
+    generated_dir = repo_root / GENERATED_DIR
+    
     for search_path in search_paths:
         if search_path.exists():
             # Recursively find all video files
             for video_path in search_path.rglob('*'):
+                if generated_dir in video_path.parents:
+                    continue
                 if video_path.is_file() and video_path.suffix.lower() in video_extensions:
                     video_files.append(video_path)
     
@@ -327,13 +340,24 @@ def check_dependencies():
         print("Install from: https://ffmpeg.org/download.html")
         return False
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Compress all website video files with FFmpeg.")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="ignore the media cache and probe every file again")
+    parser.add_argument('--profile', type=Path, metavar='PATH',
+                        help="write per-file timing and size figures to this JSON file")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """Run the script; returns the process exit status."""
+    args = parse_args(argv)
+    
     print("\nVideo Compression")
     print("-" * 40)
     
     # Check dependencies
     if not check_dependencies():
-        sys.exit(1)
+        return 1
     
     # Get repository root
     script_dir = Path(__file__).parent
@@ -354,7 +378,7 @@ def main():
     
     if not video_files:
         print("   No video files found.")
-        return
+        return 0
     
     print(f"   Found {len(video_files)} video file(s)\n")
     
@@ -366,6 +390,13 @@ def main():
             videos_by_dir[dir_path] = []
         videos_by_dir[dir_path].append(video)
     
+    cache = None if args.no_cache else MediaCache('video', cache_settings(), repo_root)
+    
+    # Probe every file the cache doesn't already know about, several ffprobes at a time
+    infos = probe_many([v for v in video_files if cache is None or cache.lookup(v) is None], 'video')
+    
+    profiler = Profiler(repo_root) if args.profile else None
+    
     # Process each directory
     total_compressed = 0
     total_skipped = 0
@@ -376,14 +407,26 @@ def main():
         print("-" * 40)
         
         for video_path in sorted(videos_by_dir[dir_path]):
-            if process_video(video_path):
+            if profiler is not None:
+                compressed = profiler.run(video_path, process_video, video_path, cache, infos.get(video_path),
+                                          outputs=(video_path.with_suffix('.mp4'),))
+            else:
+                compressed = process_video(video_path, cache, infos.get(video_path))
+            if compressed:
                 total_compressed += 1
             else:
                 total_skipped += 1
             print()  # Empty line between videos
     
+    if cache is not None:
+        cache.save()
+    if profiler is not None:
+        profiler.write('video', args.profile)
+    
     # Summary
     print(f"\nCompressed: {total_compressed}, Skipped: {total_skipped}, Total: {len(video_files)}\n")
+    
+    return 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
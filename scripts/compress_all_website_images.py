@@ -10,10 +10,11 @@ PURPOSE:
 
 WHAT IT DOES:
     1. Scans all website directories for image files (JPG, PNG, JPEG)
-    2. Analyzes each image to determine if compression is needed
-    3. Compresses images using FFmpeg with configurable quality settings
-    4. Only replaces originals if meaningful file size savings are achieved
-    5. Skips already-optimized images (idempotent - safe to run multiple times)
+    2. Strips metadata (see METADATA below)
+    3. Analyzes each image to determine if compression is needed
+    4. Compresses images using FFmpeg with configurable quality settings
+    5. Only replaces originals if meaningful file size savings are achieved
+    6. Skips already-optimized images (idempotent - safe to run multiple times)
 
 TARGET LOCATIONS:
     - src/resources/images/** (all images, including overview/)
@@ -25,29 +26,98 @@ CONFIGURATION:
     TARGET_QUALITY_JPG = 10       # FFmpeg quality: 2=best, 31=worst
     TARGET_QUALITY_PNG = 9        # PNG compression: 0-9 (higher=more)
     MIN_SAVINGS_PERCENT = 3       # Only replace if >=3% smaller
-    MIN_FILE_SIZE_KB = 500        # Skip files smaller than 500KB
-    SKIP_TOLERANCE_PERCENT = 2    # Skip if within 2% of target size
+    WELL_COMPRESSED_JPG_BPP = 0.3 # Skip 4:2:0 JPEGs below 0.3 bytes per pixel
+    WELL_COMPRESSED_PNG_BPP = 0.05 # Same for PNGs
+    SMALL_IMAGE_KB = 500          # Smaller files are processed in batches
+    SMALL_BATCH_SIZE = 16         # Images per batch
+    PNG_REFILTER_MIN_KB = 20      # Smaller PNGs: Pillow candidates only
 
 BEHAVIOR:
     - IDEMPOTENT: Safe to run multiple times
     - NON-DESTRUCTIVE: Only replaces files with improved versions
     - SMART SKIPPING: Avoids recompressing already-optimized images
     - ATOMIC REPLACEMENT: Uses temp files to prevent corruption
+    - PARALLEL (optional): --jobs N processes N images at a time
+    - CACHED: Verdicts are stored in scripts/.media_cache/images.json, so
+      files unchanged since the last run are skipped after a single stat()
+      (see media_cache.py; --no-cache forces a full re-check)
 
 DEPENDENCIES:
     - ffmpeg (must be installed and in PATH)
-    - ffprobe (must be installed and in PATH)
+    - ffprobe (must be installed and in PATH; only used for files the
+      in-process header readers in media_probe.py can't parse)
+    - Pillow (optional: pip install Pillow; enables the PNG alpha/grayscale/
+      palette reductions, --png-quantize, and baking EXIF orientation/
+      converting colour profiles in the metadata pass)
     - Python 3.6+
 
 USAGE:
     python scripts/compress_all_website_images.py
+    python scripts/compress_all_website_images.py --jobs 4
+    python scripts/compress_all_website_images.py --no-cache
+    python scripts/compress_all_website_images.py src/bio/res/new.jpg
+        (only the listed files; used by update_website.py --watch)
+    python scripts/compress_all_website_images.py --target-ssim 0.98
+    python scripts/compress_all_website_images.py --target-psnr 40
+        (per-image quality search; see QUALITY SEARCH below)
+    python scripts/compress_all_website_images.py --png-quantize
+        (also allow near-lossless 256-colour palettes for PNGs)
+    python scripts/compress_all_website_images.py --profile run.json
+        (per-image wall time, ffmpeg CPU time and bytes saved as JSON;
+        see build_profile.py)
+    python scripts/compress_all_website_images.py --keep-metadata
+        (skip the metadata pass)
+
+    --jobs N spreads the per-image ffprobe/ffmpeg work over N worker
+    processes. Each worker's report is buffered and printed in the usual
+    directory order, so the output matches a serial run.
+
+QUALITY SEARCH:
+    By default every JPEG is encoded at the fixed TARGET_QUALITY_JPG. With
+    --target-ssim or --target-psnr the -q:v is instead searched per image
+    (bounded binary search, see quality_search.py): the smallest file whose
+    SSIM/PSNR against the original still meets the target wins. The chosen
+    quality is cached per file, and the report shows the difference to the
+    fixed setting.
+
+PNG OPTIMIZATION:
+    PNGs go through png_optimizer.py: several lossless candidates
+    (re-filtered, metadata chunks stripped, alpha dropped when fully
+    opaque, grayscale or exact palette when possible) are decoded again and
+    compared pixel by pixel with the original, and the smallest wins.
+    --png-quantize adds a 256-colour palette candidate for flat-colour
+    diagrams, kept only when its PSNR stays above QUANTIZE_MIN_PSNR.
+
+SMALL IMAGES:
+    Icons and blog diagrams are each cheap to compress, but starting
+    ffmpeg for every one of them is not. Images under SMALL_IMAGE_KB are
+    therefore grouped into batches of up to SMALL_BATCH_SIZE per directory
+    (one task per batch with --jobs):
+    - all JPEGs of a batch that need compressing are encoded by a single
+      ffmpeg process (one input and one output per image); the results
+      are identical to encoding them one by one
+    - PNGs under PNG_REFILTER_MIN_KB only get the in-process Pillow
+      candidates of png_optimizer.py, without the ffmpeg re-filter passes
+    Whether an image is worth compressing at all is decided by its bytes
+    per pixel (see needs_compression()), not by its file size.
+
+METADATA:
+    Before anything else, every image (whatever its size) goes through
+    strip_image_metadata.py: EXIF, XMP, comments and similar blocks are
+    removed, EXIF orientation is baked into the pixels and non-sRGB colour
+    profiles are converted to sRGB. ffmpeg ignores EXIF orientation, so
+    without this a compressed portrait photo would lose its rotation.
+    Examined files are cached (section "metadata"); the bytes reclaimed
+    are reported per directory.
 
 OUTPUT:
     Prints detailed progress for each directory and image:
-    - [Skipped - too small] - File below minimum size threshold
-    - [Skipped - already optimized] - Already at target quality
+    - [Metadata stripped] - Metadata removed (before the size check)
+    - [Skipped - already optimized] - Already at target quality, or
+      below the bytes-per-pixel threshold
     - [Compressed] - Successfully compressed with savings percentage
     - [Skipped - no improvement] - Compression didn't meet minimum savings
+    - [Skipped - quality target not met] - No -q:v reaches the SSIM/PSNR target
     - [FFmpeg error] - Error during compression
 
 EXAMPLE OUTPUT:
@@ -59,19 +129,22 @@ EXAMPLE OUTPUT:
     
     src/blogs/0_optical_mouse/res/
     ----------------------------------------
-       [Compressed] sensor.jpg | 2048 KB → 891 KB (-56.5%)
+       [Metadata stripped] sensor.jpg | 2001 KB, -47,104 bytes (EXIF, XMP)
+       [Compressed] sensor.jpg | 2001 KB → 891 KB (-55.5%)
        [Skipped - already optimized] diagram.png
+       Metadata reclaimed: 47,104 bytes
     
     Compressed: 15, Skipped: 42, Total: 57
 
 NOTES:
     - No backups are created (original files are replaced)
-    - Very small files (<500KB) are automatically skipped
+    - There is no minimum file size: small files are only skipped when
+      their bytes per pixel show they are already well compressed
     - Uses standard JPEG format (yuvj420p) for compatibility
     - Preserves color space information (bt709)
 
 AUTHOR: Website maintenance scripts
-LAST MODIFIED: 2026-01-16
+LAST MODIFIED: 2026-10-17
 ================================================================================
 """
 
@@ -80,66 +153,92 @@ import sys
 from pathlib import Path
 import subprocess
 import tempfile
-import json
+import argparse
+import contextlib
+import io
+from concurrent.futures import ProcessPoolExecutor
+from media_probe import probe_image, probe_many
+from media_cache import MediaCache, VERDICT_OPTIMIZED, VERDICT_NO_IMPROVEMENT
+from build_profile import Profiler
+from quality_search import QualitySearch
+from png_optimizer import PngOptimizer
+from strip_image_metadata import MetadataStripper, describe as describe_stripped
 
 # ----------------------------- CONFIG -----------------------------
 TARGET_QUALITY_JPG = 10       # FFmpeg quality: 2 = best, 31 = worst
 TARGET_QUALITY_PNG = 9       # PNG compression level: 0-9 (higher = more compression)
 MIN_SAVINGS_PERCENT = 3      # Only overwrite if new file is at least this % smaller
-MIN_FILE_SIZE_KB = 500        # Skip very small files
-SKIP_TOLERANCE_PERCENT = 2   # Skip if already within 2% of target size
+WELL_COMPRESSED_JPG_BPP = 0.3    # 4:2:0 JPEGs below this many bytes per pixel are left alone
+WELL_COMPRESSED_PNG_BPP = 0.05   # Same for PNGs
+SMALL_IMAGE_KB = 500          # Smaller images are processed in batches (see SMALL IMAGES)
+SMALL_BATCH_SIZE = 16         # Small images per batch (one ffmpeg process per batch)
+PNG_REFILTER_MIN_KB = 20      # Smaller PNGs skip the ffmpeg re-filter passes (Pillow only)
 # ------------------------------------------------------------------
 
 def get_image_info(img_path):
-    """Get image dimensions and format using ffprobe."""
-    cmd = [
-        'ffprobe',
-        '-v', 'error',
-        '-select_streams', 'v:0',
-        '-show_entries', 'stream=width,height,pix_fmt',
-        '-of', 'json',
-        str(img_path)
-    ]
-    
-    try:
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-        if result.returncode == 0:
-            data = json.loads(result.stdout)
-            if 'streams' in data and len(data['streams']) > 0:
-                stream = data['streams'][0]
-                return {
-                    'width': stream.get('width', 0),
-                    'height': stream.get('height', 0),
-                    'pix_fmt': stream.get('pix_fmt', '')
-                }
-    except Exception:
-        pass
-    
-    return None
+    """Get image dimensions and format (in-process header read, ffprobe fallback)."""
+    return probe_image(img_path)
 
 def needs_compression(img_path, info):
     """Check if image needs compression based on current properties."""
     if info is None:
         return True  # Can't determine, try compressing
     
+    # Estimate if already well compressed (rough heuristic)
+    pixels = info.get('width', 0) * info.get('height', 0)
+    if pixels <= 0:
+        return True
+    bytes_per_pixel = img_path.stat().st_size / pixels
+    
     # For JPG, check if it's already in optimal format and well compressed
     pix_fmt = info.get('pix_fmt', '')
     if img_path.suffix.lower() in {'.jpg', '.jpeg'}:
         # If already in standard JPEG format with reasonable size, might skip
-        if pix_fmt in ['yuvj420p', 'yuv420p']:
-            file_size = img_path.stat().st_size
-            width = info.get('width', 0)
-            height = info.get('height', 0)
-            # Estimate if already well compressed (rough heuristic)
-            pixels = width * height
-            if pixels > 0:
-                bytes_per_pixel = file_size / pixels
-                # Well compressed JPG typically has < 0.5 bytes per pixel
-                if bytes_per_pixel < 0.3:
-                    return False  # Already well compressed
+        if pix_fmt in ['yuvj420p', 'yuv420p'] and bytes_per_pixel < WELL_COMPRESSED_JPG_BPP:
+            return False  # Already well compressed
+    elif bytes_per_pixel < WELL_COMPRESSED_PNG_BPP:
+        return False  # Flat image that already compresses to almost nothing
     
     return True
 
+def jpeg_output_args(quality):
+    """FFmpeg output options for JPEG compression - no resolution change, just quality adjustment."""
+    return [
+        '-q:v', str(quality),
+        '-pix_fmt', 'yuvj420p',  # Standard JPEG format
+        '-color_primaries', 'bt709',
+        '-color_trc', 'bt709',
+        '-colorspace', 'bt709',
+    ]
+
+def jpeg_command(img_path, quality, out_path):
+    """FFmpeg command for JPEG compression of one image."""
+    return ['ffmpeg', '-i', str(img_path)] + jpeg_output_args(quality) + ['-y', str(out_path)]
+
+def compress_jpeg_batch(img_paths):
+    """Compress several JPEGs at TARGET_QUALITY_JPG with a single ffmpeg process
+    (one input and one output per image). Returns {path: (temp path, new size)};
+    if the batch fails, each image is compressed on its own instead."""
+    if len(img_paths) < 2:
+        return {img_path: compress_image(img_path) for img_path in img_paths}
+    
+    temp_paths = []
+    cmd = ['ffmpeg', '-y']
+    for img_path in img_paths:
+        cmd += ['-i', str(img_path)]
+    for index in range(len(img_paths)):
+        with tempfile.NamedTemporaryFile(suffix='.jpg', delete=False) as tmp:
+            temp_paths.append(Path(tmp.name))
+        cmd += ['-map', f'{index}:v'] + jpeg_output_args(TARGET_QUALITY_JPG) + [str(temp_paths[-1])]
+    
+    result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    if result.returncode != 0 or any(path.stat().st_size == 0 for path in temp_paths):
+        for path in temp_paths:
+            path.unlink(missing_ok=True)
+        return {img_path: compress_image(img_path) for img_path in img_paths}
+    
+    return {img_path: (path, path.stat().st_size) for img_path, path in zip(img_paths, temp_paths)}
+
 def compress_image(img_path, is_jpg=True):
     """Compress image and return temp file path with compressed version."""
     original_size = img_path.stat().st_size
@@ -151,17 +250,7 @@ def compress_image(img_path, is_jpg=True):
     
     # Build FFmpeg command based on file type
     if is_jpg:
-        # JPEG compression - no resolution change, just quality adjustment
-        cmd = [
-            'ffmpeg',
-            '-i', str(img_path),
-            '-q:v', str(TARGET_QUALITY_JPG),
-            '-pix_fmt', 'yuvj420p',  # Standard JPEG format
-            '-color_primaries', 'bt709',
-            '-color_trc', 'bt709',
-            '-colorspace', 'bt709',
-            '-y', str(temp_path)
-        ]
+        cmd = jpeg_command(img_path, TARGET_QUALITY_JPG, temp_path)
     else:
         # PNG compression - no resolution change, just compression level adjustment
         cmd = [
@@ -181,44 +270,232 @@ def compress_image(img_path, is_jpg=True):
     new_size = temp_path.stat().st_size
     return temp_path, new_size
 
-def process_image(img_path):
-    """Process a single image file."""
+def cache_settings(search=None, png=None):
+    """Settings that change the verdicts stored in the media cache."""
+    return {
+        'target_quality_jpg': TARGET_QUALITY_JPG,
+        'target_quality_png': TARGET_QUALITY_PNG,
+        'min_savings_percent': MIN_SAVINGS_PERCENT,
+        'quality_search': search.settings() if search is not None else None,
+        'png_optimizer': png.settings() if png is not None else None,
+    }
+
+def is_small(img_path):
+    return img_path.stat().st_size < SMALL_IMAGE_KB * 1024
+
+def search_jpeg(img_path, search):
+    """Find the smallest JPEG meeting the quality target.
+    Returns (temp path, new size, report suffix); temp path is None if the target can't be met."""
+    def encode(quality, out_path):
+        result = subprocess.run(jpeg_command(img_path, quality, out_path),
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        return result.returncode == 0
+    
+    result = search.find(img_path, encode, TARGET_QUALITY_JPG)
+    if result is None:
+        return None, img_path.stat().st_size, ''
+    
+    delta = result['fixed_bytes'] - result['bytes']
+    versus = f"{abs(delta)//1024} KB {'smaller' if delta >= 0 else 'larger'} than -q:v {TARGET_QUALITY_JPG}"
+    note = f" | q={result['quality']}, {search.metric.upper()} {result['score']:.4g}, {versus}"
+    return result['path'], result['bytes'], note
+
+def strip_metadata(img_path, info, strip, out=None):
+    """Run the metadata pass on one image; returns 'info', or None if it went stale.
+    The report line goes to 'out' (default: stdout)."""
+    if strip is None:
+        return info
+    try:
+        stripped = strip.run(img_path)
+    except (ValueError, OSError) as e:
+        print(f"   [Metadata error] {img_path.name}: {e}", file=out)
+        return info
+    if stripped is not None:
+        print(f"   [Metadata stripped] {img_path.name} | {describe_stripped(stripped)}", file=out)
+        if stripped['pixels_changed']:
+            return None  # Rotated or converted: the probe result is stale
+    return info
+
+def process_image(img_path, cache=None, info=None, search=None, png=None, strip=None, encoded=None, out=None):
+    """Process a single image file. 'info' may carry a result from probe_many().
+    With a QualitySearch, JPEGs get the highest -q:v that meets its target instead of the fixed one;
+    with a PngOptimizer, PNGs get its smallest candidate instead of the plain ffmpeg re-encode;
+    with a MetadataStripper, metadata is stripped first. 'encoded' may carry a
+    (temp path, size) fixed-quality JPEG from compress_jpeg_batch(), used instead of encoding again.
+    Report lines go to 'out' (default: stdout)."""
+    info = strip_metadata(img_path, info, strip, out)
+    
     original_size = img_path.stat().st_size
     
-    # Skip very small files
-    if original_size < MIN_FILE_SIZE_KB * 1024:
-        print(f"   [Skipped - too small] {img_path.name} ({original_size//1024} KB)")
-        return False
+    # Unchanged since the last run: reuse its verdict without probing
+    if cache is not None:
+        entry = cache.lookup(img_path)
+        if entry is not None:
+            if entry['verdict'] == VERDICT_NO_IMPROVEMENT:
+                print(f"   [Skipped - no improvement] {img_path.name}", file=out)
+            else:
+                print(f"   [Skipped - already optimized] {img_path.name}", file=out)
+            return False
     
     # Get image info
-    info = get_image_info(img_path)
+    if info is None:
+        info = get_image_info(img_path)
     
     # Check if compression needed
     if not needs_compression(img_path, info):
-        print(f"   [Skipped - already optimized] {img_path.name}")
+        print(f"   [Skipped - already optimized] {img_path.name}", file=out)
+        if cache is not None:
+            cache.record(img_path, info, VERDICT_OPTIMIZED)
         return False
     
     # Determine file type
     is_jpg = img_path.suffix.lower() in {'.jpg', '.jpeg'}
     
     # Compress
-    temp_path, new_size = compress_image(img_path, is_jpg)
+    note = ''
+    if search is not None and is_jpg:
+        temp_path, new_size, note = search_jpeg(img_path, search)
+        if temp_path is None:
+            print(f"   [Skipped - quality target not met] {img_path.name}", file=out)
+            if cache is not None:
+                cache.record(img_path, info, VERDICT_NO_IMPROVEMENT)
+            return False
+    elif png is not None and not is_jpg:
+        # Tiny PNGs: Pillow candidates only, no ffmpeg processes
+        refilter = original_size >= PNG_REFILTER_MIN_KB * 1024
+        temp_path, new_size, note = png.optimize(img_path, refilter=refilter)
+    elif encoded is not None and is_jpg:
+        temp_path, new_size = encoded
+    else:
+        temp_path, new_size = compress_image(img_path, is_jpg)
     
     if temp_path is None:
-        print(f"   [FFmpeg error] {img_path.name}")
+        print(f"   [FFmpeg error] {img_path.name}", file=out)
         return False
     
     # Check if compression provides meaningful savings
     if new_size < original_size * (1 - MIN_SAVINGS_PERCENT / 100):
         savings = (original_size - new_size) / original_size * 100
-        print(f"   [Compressed] {img_path.name} | {original_size//1024} KB → {new_size//1024} KB (-{savings:.1f}%)")
+        print(f"   [Compressed] {img_path.name} | {original_size//1024} KB → {new_size//1024} KB (-{savings:.1f}%){note}", file=out)
         temp_path.replace(img_path)  # Atomic replace
+        if strip is not None:
+            # The encoder may have written chunks of its own (pHYs, ...); the compressed
+            # file is kept even if they can't be removed
+            try:
+                strip.run(img_path)
+            except (ValueError, OSError) as e:
+                print(f"   [Metadata strip failed] {img_path.name}: {e}", file=out)
+        if cache is not None:
+            cache.record(img_path, info, VERDICT_OPTIMIZED)
         return True
     else:
-        print(f"   [Skipped - no improvement] {img_path.name}")
+        print(f"   [Skipped - no improvement] {img_path.name}", file=out)
         temp_path.unlink()
+        if cache is not None:
+            cache.record(img_path, info, VERDICT_NO_IMPROVEMENT)
         return False
 
+_worker_cache = None
+_worker_profiler = None
+_worker_search = None
+_worker_png = None
+_worker_strip = None
+
+def init_worker(cache, profiler=None, search=None, png=None, strip=None):
+    """Give each worker process its own copy of the media cache, profiler, quality search,
+    PNG optimizer and metadata stripper."""
+    global _worker_cache, _worker_profiler, _worker_search, _worker_png, _worker_strip
+    _worker_cache = cache
+    _worker_profiler = profiler
+    _worker_search = search
+    _worker_png = png
+    _worker_strip = strip
+
+def process_batch(batch, cache=None, search=None, png=None, strip=None, profiler=None):
+    """Process a batch of (image, info) pairs from one directory, returning
+    [(compressed, report text)] in order. Metadata is stripped first, then every
+    JPEG that will be compressed at the fixed quality is encoded by a single ffmpeg
+    process, then process_image() finishes each image."""
+    reports = [io.StringIO() for _ in batch]
+    infos = []
+    for (img_path, info), report in zip(batch, reports):
+        infos.append(strip_metadata(img_path, info, strip, report))
+    
+    encoded = {}
+    shared = None
+    if search is None:
+        to_encode = []
+        for index, (img_path, _) in enumerate(batch):
+            if img_path.suffix.lower() not in {'.jpg', '.jpeg'}:
+                continue
+            if cache is not None and cache.lookup(img_path) is not None:
+                continue
+            if infos[index] is None:
+                infos[index] = get_image_info(img_path)
+            if needs_compression(img_path, infos[index]):
+                to_encode.append(img_path)
+        if profiler is not None and to_encode:
+            # The batch encode is charged to its images in equal shares
+            encoded, wall_seconds, cpu_seconds = profiler.measure(compress_jpeg_batch, to_encode)
+            shared = (wall_seconds / len(to_encode),
+                      None if cpu_seconds is None else cpu_seconds / len(to_encode))
+        else:
+            encoded = compress_jpeg_batch(to_encode)
+    
+    results = []
+    for (img_path, _), info, report in zip(batch, infos, reports):
+        # strip already ran above; passing it again only costs a cache lookup,
+        # and lets process_image() clean up after the encoder
+        args = (img_path, cache, info, search, png, strip, encoded.get(img_path), report)
+        if profiler is not None:
+            compressed = profiler.run(img_path, process_image, *args,
+                                      shared=shared if img_path in encoded else None)
+        else:
+            compressed = process_image(*args)
+        temp_path = encoded.get(img_path, (None,))[0]
+        if temp_path is not None:
+            temp_path.unlink(missing_ok=True)  # Unused (the image turned out to be cached)
+        results.append((compressed, report.getvalue()))
+    return results
+
+def process_batch_captured(batch):
+    """Process a batch in a worker process, returning ([(compressed, report text)],
+    {'images': cache updates, 'quality': search updates, 'metadata': stripper updates},
+    profile records)."""
+    # Reports are written to their own buffers; anything else a worker prints would
+    # otherwise reach the terminal out of order, so it joins the batch's last report.
+    # (Safe here: a worker process runs one batch at a time.)
+    stray = io.StringIO()
+    with contextlib.redirect_stdout(stray):
+        results = process_batch(batch, _worker_cache, _worker_search, _worker_png, _worker_strip, _worker_profiler)
+    if stray.getvalue() and results:
+        compressed, report = results[-1]
+        results[-1] = (compressed, report + stray.getvalue())
+    updates = {
+        'images': _worker_cache.take_updates() if _worker_cache is not None else {},
+        'quality': _worker_search.take_updates() if _worker_search is not None else None,
+        'metadata': _worker_strip.take_updates() if _worker_strip is not None else None,
+    }
+    records = _worker_profiler.take_records() if _worker_profiler is not None else []
+    return results, updates, records
+
+def make_batches(images, infos):
+    """Split one directory's images into batches: runs of up to SMALL_BATCH_SIZE small
+    images, and every other image on its own."""
+    batches = []
+    small = []
+    for img_path in images:
+        if is_small(img_path):
+            small.append((img_path, infos.get(img_path)))
+            if len(small) == SMALL_BATCH_SIZE:
+                batches.append(small)
+                small = []
+        else:
+            batches.append([(img_path, infos.get(img_path))])
+    if small:
+        batches.append(small)
+    return batches
+
 def find_all_images(repo_root):
     """Find all images in the website directory structure."""
     image_extensions = {'.jpg', '.jpeg', '.png'}
@@ -241,6 +518,23 @@ def find_all_images(repo_root):
     
     return sorted(images)
 
+def select_images(repo_root, paths):
+    """Keep the given paths that are existing images inside the repository, as repo-rooted paths."""
+    image_extensions = {'.jpg', '.jpeg', '.png'}
+    root = repo_root.resolve()
+    images = []
+    
+    for path in paths:
+        path = path.resolve()
+        if not path.is_file() or path.suffix.lower() not in image_extensions:
+            continue
+        try:
+            images.append(repo_root / path.relative_to(root))
+        except ValueError:
+            print(f"   Ignoring {path} (outside the repository)")
+    
+    return sorted(set(images))
+
 def check_dependencies():
     """Check if required tools are installed."""
     try:
@@ -252,31 +546,75 @@ def check_dependencies():
         print("Install from: https://ffmpeg.org/download.html")
         return False
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Compress all website images with FFmpeg.")
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help="number of images to process at the same time (default: 1)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="ignore the media cache and probe every image again")
+    parser.add_argument('--profile', type=Path, metavar='PATH',
+                        help="write per-image timing and size figures to this JSON file")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument('--target-ssim', type=float, metavar='SCORE',
+                        help="search each JPEG's -q:v for the smallest file with at least this SSIM (e.g. 0.98)")
+    target.add_argument('--target-psnr', type=float, metavar='DB',
+                        help="search each JPEG's -q:v for the smallest file with at least this PSNR (e.g. 40)")
+    parser.add_argument('--png-quantize', action='store_true',
+                        help="also try a lossy 256-colour palette for PNGs (kept only if visually near-identical)")
+    parser.add_argument('--keep-metadata', action='store_true',
+                        help="don't strip EXIF/XMP/comments or normalise orientation and colour profiles first")
+    parser.add_argument('paths', nargs='*', type=Path,
+                        help="only process these image files (default: scan the whole site)")
+    args = parser.parse_args(argv)
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    return args
+
+def main(argv=None):
+    """Run the script; returns the process exit status."""
+    args = parse_args(argv)
+    
     print("\nImage Compression")
     print("-" * 40)
     
     # Check dependencies
     if not check_dependencies():
-        sys.exit(1)
+        return 1
     
     # Get repository root
     script_dir = Path(__file__).parent
     repo_root = script_dir.parent
     
     print(f"\nRepository: {repo_root}")
-    print(f"Target quality (JPG): -q:v {TARGET_QUALITY_JPG}")
-    print(f"Target quality (PNG): compression_level {TARGET_QUALITY_PNG}")
+    search = None
+    if args.target_ssim is not None:
+        search = QualitySearch('ssim', args.target_ssim, repo_root, use_cache=not args.no_cache)
+    elif args.target_psnr is not None:
+        search = QualitySearch('psnr', args.target_psnr, repo_root, use_cache=not args.no_cache)
+    
+    if search is not None:
+        print(f"Target quality (JPG): {search.describe()} (searched per image, fixed -q:v {TARGET_QUALITY_JPG} for comparison)")
+    else:
+        print(f"Target quality (JPG): -q:v {TARGET_QUALITY_JPG}")
+    png = PngOptimizer(quantize=args.png_quantize)
+    print(f"Target quality (PNG): {png.describe()}")
+    strip = None if args.keep_metadata else MetadataStripper(repo_root, use_cache=not args.no_cache)
+    print(f"Metadata: {'kept' if strip is None else 'stripped (orientation baked in, colour converted to sRGB)'}")
     print(f"Mode: Compression only (resolution unchanged)")
+    print(f"Workers: {args.jobs}")
     print()
     
     # Find all images
-    print("Scanning for images...")
-    images = find_all_images(repo_root)
+    if args.paths:
+        print("Checking given images...")
+        images = select_images(repo_root, args.paths)
+    else:
+        print("Scanning for images...")
+        images = find_all_images(repo_root)
     
     if not images:
         print("   No images found.")
-        return
+        return 0
     
     print(f"   Found {len(images)} image(s)\n")
     
@@ -288,23 +626,82 @@ def main():
             images_by_dir[dir_path] = []
         images_by_dir[dir_path].append(img)
     
+    cache = None if args.no_cache else MediaCache('images', cache_settings(search, png), repo_root)
+    
+    # Flatten into report order so worker results line up with the grouped output
+    ordered = [img for dir_path in sorted(images_by_dir.keys()) for img in sorted(images_by_dir[dir_path])]
+    
+    # Probe every image that will actually be examined in one batch up front
+    to_probe = [img for img in ordered if cache is None or cache.lookup(img) is None]
+    infos = probe_many(to_probe, 'image')
+    
+    # Small images travel in batches (never across directories, so the report stays grouped)
+    batches_by_dir = {dir_path: make_batches(sorted(images_by_dir[dir_path]), infos)
+                      for dir_path in sorted(images_by_dir.keys())}
+    batches = [batch for dir_batches in batches_by_dir.values() for batch in dir_batches]
+    
+    profiler = Profiler(repo_root) if args.profile else None
+    
+    pool = None
+    if args.jobs > 1:
+        # map() yields results in submission order, so the report stays deterministic
+        pool = ProcessPoolExecutor(max_workers=args.jobs, initializer=init_worker, initargs=(cache, profiler, search, png, strip))
+        results = pool.map(process_batch_captured, batches)
+    else:
+        results = ((process_batch(batch, cache, search, png, strip, profiler), None, None)
+                   for batch in batches)
+    
     # Process each directory
     total_compressed = 0
     total_skipped = 0
     
-    for dir_path in sorted(images_by_dir.keys()):
-        rel_path = dir_path.relative_to(repo_root)
-        print(f"\n{rel_path}/")
-        print("-" * 40)
-        
-        for img_path in sorted(images_by_dir[dir_path]):
-            if process_image(img_path):
-                total_compressed += 1
-            else:
-                total_skipped += 1
+    try:
+        for dir_path in sorted(images_by_dir.keys()):
+            rel_path = dir_path.relative_to(repo_root)
+            print(f"\n{rel_path}/")
+            print("-" * 40)
+            
+            for _ in batches_by_dir[dir_path]:
+                items, updates, records = next(results)
+                for compressed, output in items:
+                    print(output, end='')
+                    if compressed:
+                        total_compressed += 1
+                    else:
+                        total_skipped += 1
+                if updates and cache is not None:
+                    cache.merge(updates['images'])
+                if updates and search is not None:
+                    search.merge(updates['quality'])
+                if updates and strip is not None:
+                    strip.merge(updates['metadata'])
+                if records:
+                    profiler.records.extend(records)
+            
+            reclaimed = strip.reclaimed.get(rel_path.as_posix()) if strip is not None else None
+            if reclaimed:
+                print(f"   Metadata reclaimed: {reclaimed:,} bytes")
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        if cache is not None:
+            cache.save()
+        if search is not None:
+            search.save()
+        if strip is not None:
+            strip.save()
+        if profiler is not None:
+            profiler.write('images', args.profile)
     
     # Summary
-    print(f"\nCompressed: {total_compressed}, Skipped: {total_skipped}, Total: {len(images)}\n")
+    print(f"\nCompressed: {total_compressed}, Skipped: {total_skipped}, Total: {len(images)}")
+    if search is not None and search.summary():
+        print(search.summary())
+    if strip is not None and strip.reclaimed:
+        print(f"Metadata stripped: {sum(strip.reclaimed.values()):,} bytes reclaimed")
+    print()
+    
+    return 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
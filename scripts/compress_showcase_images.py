@@ -40,11 +40,19 @@ DEPENDENCIES:
 
 USAGE:
     python scripts/compress_showcase_images.py
+    python scripts/compress_showcase_images.py --target-ssim 0.98
+    python scripts/compress_showcase_images.py --target-psnr 40
+
+    With --target-ssim/--target-psnr the quality is no longer fixed: each
+    image gets the highest -q:v whose SSIM/PSNR against the original still
+    meets the target (bounded binary search, cached per file; see
+    quality_search.py). The report shows the size difference to TARGET_QV.
 
 OUTPUT:
     Prints working folder, lists all images found, and shows results:
     - [Compressed] - File successfully compressed
     - [Skipped] - File not improved or too small
+    - [Skipped - quality target not met] - No -q:v reaches the target
     - [Error] - FFmpeg processing error
 
 WARNING:
@@ -65,6 +73,8 @@ import os
 from pathlib import Path
 import subprocess
 import tempfile
+import argparse
+from quality_search import QualitySearch
 
 # ----------------------------- CONFIG -----------------------------
 TARGET_QV = 5          # Quality: 2 = best (large files), 31 = worst (small files).
@@ -72,45 +82,82 @@ MIN_SAVINGS_PERCENT = 3 # Only overwrite if new file is at least this % smaller
 TARGET_FOLDER_REL = "../src/resources/images/overview"  # Fixed folder relative to script location
 # ------------------------------------------------------------------
 
-def compress_and_replace_if_better(img_path):
-    original_size = img_path.stat().st_size
-    if original_size < 50 * 1024:  # Skip very small files (<50 KB)
-        print(f"   [Skipped - too small] {img_path.name}")
-        return
-
-    # Temporary file for safe processing
-    with tempfile.NamedTemporaryFile(suffix='.jpg', delete=False) as tmp:
-        temp_path = Path(tmp.name)
-
-    # FFmpeg: fixed quality + force 8-bit per channel
+def encode_jpeg(img_path, quality, out_path):
+    """FFmpeg: given quality + force 8-bit per channel. Returns True on success."""
     cmd = [
         'ffmpeg',
         '-i', str(img_path),
-        '-q:v', str(TARGET_QV),
+        '-q:v', str(quality),
         '-pix_fmt', 'yuvj420p',       # Ensures 8-bit per channel (standard JPEG)
         '-color_primaries', 'bt709',
         '-color_trc', 'bt709',
         '-colorspace', 'bt709',
         '-y',
-        str(temp_path)
+        str(out_path)
     ]
 
     result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-    if result.returncode != 0:
-        print(f"   [FFmpeg error] {img_path.name}")
-        temp_path.unlink(missing_ok=True)
+    return result.returncode == 0
+
+def compress_and_replace_if_better(img_path, search=None):
+    original_size = img_path.stat().st_size
+    if original_size < 50 * 1024:  # Skip very small files (<50 KB)
+        print(f"   [Skipped - too small] {img_path.name}")
         return
 
+    note = ''
+    if search is not None:
+        if search.is_settled(img_path):
+            print(f"   [Skipped - already optimized] {img_path.name}")
+            return
+        if search.is_unmet(img_path):
+            print(f"   [Skipped - quality target not met] {img_path.name}")
+            return
+
+        # Smallest file that still meets the SSIM/PSNR target
+        result = search.find(img_path, lambda q, out: encode_jpeg(img_path, q, out), TARGET_QV)
+        if result is None:
+            print(f"   [Skipped - quality target not met] {img_path.name}")
+            return
+        temp_path = result['path']
+        delta = result['fixed_bytes'] - result['bytes']
+        note = (f" | q={result['quality']}, {search.metric.upper()} {result['score']:.4g}, "
+                f"{abs(delta)//1024} KB {'smaller' if delta >= 0 else 'larger'} than -q:v {TARGET_QV}")
+    else:
+        # Temporary file for safe processing
+        with tempfile.NamedTemporaryFile(suffix='.jpg', delete=False) as tmp:
+            temp_path = Path(tmp.name)
+
+        if not encode_jpeg(img_path, TARGET_QV, temp_path):
+            print(f"   [FFmpeg error] {img_path.name}")
+            temp_path.unlink(missing_ok=True)
+            return
+
     new_size = temp_path.stat().st_size
     if new_size < original_size * (1 - MIN_SAVINGS_PERCENT / 100):
         savings = (original_size - new_size) / original_size * 100
-        print(f"   [Compressed] {img_path.name} | {original_size//1024} KB → {new_size//1024} KB (-{savings:.1f}%)")
+        print(f"   [Compressed] {img_path.name} | {original_size//1024} KB → {new_size//1024} KB (-{savings:.1f}%){note}")
         temp_path.replace(img_path)  # Safe atomic replace
+        if search is not None:
+            search.settle(img_path, result)
     else:
         print(f"   [Skipped - no improvement] {img_path.name}")
         temp_path.unlink()
+        if search is not None:
+            search.settle(img_path, result)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Compress the showcase (overview) JPEGs with FFmpeg.")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument('--target-ssim', type=float, metavar='SCORE',
+                        help="search each image's -q:v for the smallest file with at least this SSIM (e.g. 0.98)")
+    target.add_argument('--target-psnr', type=float, metavar='DB',
+                        help="search each image's -q:v for the smallest file with at least this PSNR (e.g. 40)")
+    return parser.parse_args()
 
 def main():
+    args = parse_args()
+
     # Folder to process: fixed relative path from script location
     script_dir = Path(__file__).parent.resolve()
     target_folder = script_dir / TARGET_FOLDER_REL
@@ -124,7 +171,16 @@ def main():
     print("JPEG Compression Script")
     print("=" * 60)
     print(f"Search folder: {target_folder}")
-    print(f"Target quality: -q:v {TARGET_QV} (8-bit per channel)")
+    search = None
+    if args.target_ssim is not None:
+        search = QualitySearch('ssim', args.target_ssim, script_dir.parent)
+    elif args.target_psnr is not None:
+        search = QualitySearch('psnr', args.target_psnr, script_dir.parent)
+
+    if search is not None:
+        print(f"Target quality: {search.describe()}, searched per image (8-bit per channel)")
+    else:
+        print(f"Target quality: -q:v {TARGET_QV} (8-bit per channel)")
     print()
 
     # Find all JPG/JPEG files
@@ -145,7 +201,12 @@ def main():
     print("Starting compression...\n")
 
     for img_path in jpg_files:
-        compress_and_replace_if_better(img_path)
+        compress_and_replace_if_better(img_path, search)
+
+    if search is not None:
+        search.save()
+        if search.summary():
+            print(f"\n{search.summary()}")
 
     print("\nDone! All files in the folder have been processed.")
 
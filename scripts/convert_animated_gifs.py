@@ -0,0 +1,504 @@
+"""
+================================================================================
+CONVERT ANIMATED GIFS
+================================================================================
+
+PURPOSE:
+    Animated GIFs are usually 5-20x larger than the same animation as a
+    video (e.g. the 663 KB starship-superheavy.gif in the embedded systems
+    blog). This script writes every animated GIF as a muted, looping
+    WebM (VP9) and MP4 (H.264) plus a poster JPEG of its first frame, and
+    script.js plays those instead of the GIF.
+
+WHAT IT DOES:
+    1. Scans src/resources/images, src/blogs/*/res and src/bio/res for GIFs
+    2. Reads each GIF's blocks in-process to count its frames; static GIFs
+       (a single frame) are left alone
+    3. Skips GIFs whose content hasn't changed since they were converted
+       (SHA-256 recorded in the manifest)
+    4. Encodes WebM and MP4 (no audio track, even dimensions, yuv420p) and
+       a poster JPEG of the first frame
+    5. Drops videos that are not smaller than the GIF; a GIF with no
+       smaller video gets no entry and keeps being served as it is
+    6. Deletes the files of GIFs that no longer exist
+    7. Writes src/resources/derivatives/animations_manifest.json
+
+OUTPUT LOCATION:
+    src/resources/derivatives/ mirrors the src/ tree, like the image
+    derivatives (see generate_image_derivatives.py):
+
+        src/blogs/1_embedded_systems_overview/res/embedded.gif
+        -> src/resources/derivatives/blogs/1_embedded_systems_overview/res/embedded.gif.webm
+        -> src/resources/derivatives/blogs/1_embedded_systems_overview/res/embedded.gif.mp4
+        -> src/resources/derivatives/blogs/1_embedded_systems_overview/res/embedded.gif-poster.jpg
+
+    compress_all_video_files.py leaves this folder alone.
+
+MANIFEST FORMAT:
+    Paths are relative to src/, the folder script.js lives in:
+
+    {
+      "version": 1,
+      "settings": { ... },
+      "animations": {
+        "blogs/1_embedded_systems_overview/res/embedded.gif": {
+          "sha256": "...",
+          "width": 400,
+          "height": 300,
+          "frames": 48,
+          "duration": 3.84,
+          "bytes": 641024,
+          "poster": {"src": "resources/derivatives/.../embedded.gif-poster.jpg", "bytes": 9120},
+          "sources": [
+            {"src": "resources/derivatives/.../embedded.gif.webm", "type": "video/webm", "bytes": 84210},
+            {"src": "resources/derivatives/.../embedded.gif.mp4", "type": "video/mp4", "bytes": 97804}
+          ]
+        }
+      }
+    }
+
+    script.js replaces <img> GIFs in blog posts and tooltip media with a
+    <video autoplay loop muted playsinline> listing these sources in order.
+
+CONFIGURATION:
+    WEBM_CRF = 36          # libvpx-vp9 CRF: 0=best, 63=worst
+    MP4_CRF = 26           # libx264 CRF: 0=best, 51=worst
+    MP4_PRESET = 'slow'    # libx264 preset (slower = smaller)
+    POSTER_QUALITY = 4     # Poster JPEG -q:v: 2=best, 31=worst
+
+BEHAVIOR:
+    - IDEMPOTENT: Safe to run multiple times
+    - INCREMENTAL: Unchanged GIFs cost a single stat() (media cache,
+      section "animations") or a hash check on a fresh checkout
+    - SETTINGS-AWARE: Changing an encoder setting converts everything again
+    - NON-DESTRUCTIVE: The GIFs themselves are never modified
+
+DEPENDENCIES:
+    - ffmpeg (must be installed and in PATH; built with libvpx-vp9 and/or
+      libx264)
+    - Python 3.6+
+
+USAGE:
+    python scripts/convert_animated_gifs.py
+    python scripts/convert_animated_gifs.py --jobs 4
+    python scripts/convert_animated_gifs.py --no-cache
+    python scripts/convert_animated_gifs.py --force     (convert all again)
+
+EXAMPLE OUTPUT:
+    Animated GIFs
+    ----------------------------------------
+    Formats: webm, mp4
+
+    src/blogs/1_embedded_systems_overview/res/
+    ----------------------------------------
+       [Converted] embedded.gif | 48 frames, 626 KB → webm 82 KB, mp4 96 KB
+       [Static] logo.gif
+       [Up to date] connectors.gif
+
+    Converted: 1, Kept as GIF: 1, Up to date: 5, Removed: 0, Total: 7
+
+AUTHOR: Website maintenance scripts
+LAST MODIFIED: 2026-10-17
+================================================================================
+"""
+
+import sys
+import json
+import struct
+import subprocess
+import argparse
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from media_cache import MediaCache, hash_file, VERDICT_OPTIMIZED, VERDICT_NO_IMPROVEMENT
+
+# ----------------------------- CONFIG -----------------------------
+WEBM_CRF = 36                 # libvpx-vp9 CRF: 0 = best, 63 = worst
+MP4_CRF = 26                  # libx264 CRF: 0 = best, 51 = worst
+MP4_PRESET = 'slow'           # libx264 preset (slower = smaller files)
+POSTER_QUALITY = 4            # Poster JPEG -q:v: 2 = best, 31 = worst
+OUTPUT_DIR = 'src/resources/derivatives'
+MANIFEST_NAME = 'animations_manifest.json'
+MANIFEST_VERSION = 1
+# ------------------------------------------------------------------
+
+# Video formats in the order the browser should try them, with the ffmpeg encoder each needs
+FORMATS = {
+    'webm': {
+        'encoder': 'libvpx-vp9',
+        'type': 'video/webm',
+        'args': ['-c:v', 'libvpx-vp9', '-crf', str(WEBM_CRF), '-b:v', '0', '-row-mt', '1'],
+    },
+    'mp4': {
+        'encoder': 'libx264',
+        'type': 'video/mp4',
+        'args': ['-c:v', 'libx264', '-crf', str(MP4_CRF), '-preset', MP4_PRESET,
+                 '-movflags', '+faststart'],
+    },
+}
+
+# H.264/VP9 in yuv420p need even dimensions
+EVEN_SIZE_FILTER = 'scale=trunc(iw/2)*2:trunc(ih/2)*2'
+
+def cache_settings():
+    """Settings that change the conversions; the manifest and media cache store them."""
+    return {
+        'webm_crf': WEBM_CRF,
+        'mp4_crf': MP4_CRF,
+        'mp4_preset': MP4_PRESET,
+        'poster_quality': POSTER_QUALITY,
+    }
+
+def available_formats():
+    """Formats whose encoder the local ffmpeg provides, in order of preference."""
+    try:
+        result = subprocess.run(['ffmpeg', '-hide_banner', '-encoders'],
+                                capture_output=True, text=True, timeout=10)
+    except (subprocess.TimeoutExpired, FileNotFoundError):
+        return []
+
+    encoders = {line.split()[1] for line in result.stdout.splitlines() if len(line.split()) > 1}
+    return [fmt for fmt, spec in FORMATS.items() if spec['encoder'] in encoders]
+
+def find_gifs(repo_root):
+    """Find all GIFs the site shows."""
+    search_paths = [repo_root / 'src' / 'resources' / 'images', repo_root / 'src' / 'bio' / 'res']
+    search_paths += sorted((repo_root / 'src' / 'blogs').glob('*/res'))
+
+    gifs = []
+    for search_path in search_paths:
+        if search_path.exists():
+            for gif_path in search_path.rglob('*'):
+                if gif_path.is_file() and gif_path.suffix.lower() == '.gif':
+                    gifs.append(gif_path)
+
+    return sorted(gifs)
+
+def site_path(path, repo_root):
+    """Path relative to src/, with forward slashes (the form script.js uses)."""
+    return path.relative_to(repo_root / 'src').as_posix()
+
+def skip_sub_blocks(data, pos):
+    """Position just past a chain of GIF data sub-blocks."""
+    while data[pos]:
+        pos += data[pos] + 1
+    return pos + 1
+
+def read_gif(gif_path):
+    """Walk a GIF's blocks. Returns {'width', 'height', 'frames', 'duration'}, or None
+    if the file isn't a readable GIF."""
+    data = gif_path.read_bytes()
+    if data[:6] not in (b'GIF87a', b'GIF89a') or len(data) < 13:
+        return None
+
+    width, height, flags = struct.unpack('<HHB', data[6:11])
+    pos = 13
+    if flags & 0x80:
+        pos += 3 << ((flags & 0x07) + 1)   # Global colour table
+
+    frames = 0
+    delay = 0           # Hundredths of a second
+    try:
+        while pos < len(data):
+            block = data[pos]
+            if block == 0x3B:               # Trailer
+                break
+            if block == 0x21:               # Extension
+                if data[pos + 1] == 0xF9:   # Graphic control: carries the frame delay
+                    delay += struct.unpack('<H', data[pos + 4:pos + 6])[0]
+                pos = skip_sub_blocks(data, pos + 2)
+            elif block == 0x2C:             # Image descriptor
+                frames += 1
+                local_flags = data[pos + 9]
+                pos += 10
+                if local_flags & 0x80:
+                    pos += 3 << ((local_flags & 0x07) + 1)
+                pos = skip_sub_blocks(data, pos + 1)   # LZW minimum code size, then data
+            else:
+                break                       # Garbage: keep what was read
+    except IndexError:
+        pass                                # Truncated file
+
+    if not frames:
+        return None
+    return {'width': width, 'height': height, 'frames': frames, 'duration': delay / 100}
+
+def encode_video(gif_path, out_path, fmt):
+    """Encode the GIF as a muted video. Returns True if it was written."""
+    cmd = ['ffmpeg', '-i', str(gif_path), '-vf', EVEN_SIZE_FILTER, '-pix_fmt', 'yuv420p', '-an']
+    cmd += FORMATS[fmt]['args'] + ['-y', str(out_path)]
+
+    result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    if result.returncode != 0 or not out_path.exists():
+        out_path.unlink(missing_ok=True)
+        return False
+    return True
+
+def encode_poster(gif_path, out_path):
+    """Write the first frame as a JPEG. Returns True if it was written."""
+    cmd = [
+        'ffmpeg',
+        '-i', str(gif_path),
+        '-frames:v', '1',
+        '-q:v', str(POSTER_QUALITY),
+        '-pix_fmt', 'yuvj420p',
+        '-y', str(out_path)
+    ]
+    result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    if result.returncode != 0 or not out_path.exists():
+        out_path.unlink(missing_ok=True)
+        return False
+    return True
+
+def convert_gif(gif_path, gif_info, repo_root, formats, sha256):
+    """Write the videos and poster of one animated GIF. Returns its manifest entry,
+    None if no video came out smaller than the GIF, or False on failure."""
+    source_bytes = gif_path.stat().st_size
+    out_dir = repo_root / OUTPUT_DIR / Path(site_path(gif_path, repo_root)).parent
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    sources = []
+    failed = False
+    for fmt in formats:
+        out_path = out_dir / f"{gif_path.name}.{fmt}"
+        if not encode_video(gif_path, out_path, fmt):
+            failed = True
+            continue
+
+        video_bytes = out_path.stat().st_size
+        if video_bytes >= source_bytes:
+            out_path.unlink()  # No smaller than the GIF: serve the GIF instead
+            continue
+
+        sources.append({
+            'src': site_path(out_path, repo_root),
+            'type': FORMATS[fmt]['type'],
+            'bytes': video_bytes,
+        })
+
+    if not sources:
+        return False if failed else None
+
+    poster_path = out_dir / f"{gif_path.name}-poster.jpg"
+    if not encode_poster(gif_path, poster_path):
+        for source in sources:
+            (repo_root / 'src' / source['src']).unlink(missing_ok=True)
+        return False
+
+    return dict(gif_info, sha256=sha256, bytes=source_bytes,
+                poster={'src': site_path(poster_path, repo_root), 'bytes': poster_path.stat().st_size},
+                sources=sources)
+
+def entry_files(entry):
+    """All files (relative to src/) an entry refers to."""
+    return [entry['poster']['src']] + [source['src'] for source in entry['sources']]
+
+def remove_files(entry, repo_root, keep=()):
+    """Delete an entry's video and poster files, except those listed in 'keep'."""
+    removed = 0
+    for src in entry_files(entry):
+        if src in keep:
+            continue
+        path = repo_root / 'src' / src
+        if path.exists():
+            path.unlink()
+            removed += 1
+    return removed
+
+def is_up_to_date(gif_path, entry, repo_root, cache):
+    """True if the manifest entry still describes the GIF and its files exist."""
+    if entry is None:
+        return False
+    if not all((repo_root / 'src' / src).exists() for src in entry_files(entry)):
+        return False
+
+    # Unchanged since the last run: a single stat()
+    if cache is not None and cache.lookup(gif_path) is not None:
+        return True
+
+    # Fresh checkout or touched file: compare content
+    if hash_file(gif_path) == entry['sha256']:
+        if cache is not None:
+            cache.record(gif_path, None, VERDICT_OPTIMIZED)
+        return True
+    return False
+
+def load_manifest(manifest_path):
+    """Read the manifest; entries made with other settings are dropped."""
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+    if data.get('version') != MANIFEST_VERSION:
+        return {}
+    animations = data.get('animations', {})
+    if data.get('settings') != cache_settings():
+        # Keep the entries so their old files get cleaned up, but force conversion
+        for entry in animations.values():
+            entry['sha256'] = None
+    return animations
+
+def write_manifest_if_changed(manifest_path, animations):
+    """Write the manifest only if its content differs from what is on disk. Returns True if written."""
+    data = {
+        'version': MANIFEST_VERSION,
+        'settings': cache_settings(),
+        'animations': dict(sorted(animations.items())),
+    }
+    content = json.dumps(data, indent=2, ensure_ascii=False)
+
+    try:
+        if manifest_path.read_text(encoding='utf-8') == content:
+            return False
+    except FileNotFoundError:
+        pass
+
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    manifest_path.write_text(content, encoding='utf-8')
+    return True
+
+def describe(entry):
+    """One-line summary of a converted entry."""
+    videos = ', '.join(f"{Path(s['src']).suffix[1:]} {s['bytes']//1024} KB" for s in entry['sources'])
+    return f"{entry['frames']} frames, {entry['bytes']//1024} KB → {videos}"
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Convert animated GIFs to looping WebM/MP4 videos with poster frames.")
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help="number of GIFs to convert at the same time (default: 1)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="ignore the media cache and hash every GIF again")
+    parser.add_argument('--force', action='store_true',
+                        help="convert every animated GIF again")
+    args = parser.parse_args(argv)
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    return args
+
+def main(argv=None):
+    """Run the script; returns the process exit status."""
+    args = parse_args(argv)
+
+    print("\nAnimated GIFs")
+    print("-" * 40)
+
+    formats = available_formats()
+    if not formats:
+        print("\nError: ffmpeg with libvpx-vp9 or libx264 must be installed and in PATH")
+        print("Install from: https://ffmpeg.org/download.html")
+        return 1
+
+    repo_root = Path(__file__).parent.parent
+    manifest_path = repo_root / OUTPUT_DIR / MANIFEST_NAME
+
+    print(f"\nFormats: {', '.join(formats)}")
+    print()
+
+    gifs = find_gifs(repo_root)
+    previous = load_manifest(manifest_path)
+    cache = None if args.no_cache else MediaCache('animations', cache_settings(), repo_root)
+
+    # Decide what needs work before starting any encoder
+    manifest = {}
+    kept = {}      # GIFs served as they are: path -> report label
+    todo = []
+    for gif_path in gifs:
+        key = site_path(gif_path, repo_root)
+        entry = previous.get(key)
+        if not args.force and is_up_to_date(gif_path, entry, repo_root, cache):
+            manifest[key] = entry
+            continue
+
+        cached = cache.lookup(gif_path) if cache is not None and not args.force else None
+        if cached is not None and cached['verdict'] == VERDICT_NO_IMPROVEMENT:
+            # Static, or no video beat it last time
+            static = cached['info'] is None or cached['info']['frames'] < 2
+            kept[gif_path] = "[Static]" if static else "[Skipped - no improvement]"
+            continue
+
+        gif_info = read_gif(gif_path)
+        if gif_info is None or gif_info['frames'] < 2:
+            kept[gif_path] = "[Static]"
+            if cache is not None:
+                cache.record(gif_path, gif_info, VERDICT_NO_IMPROVEMENT)
+        else:
+            todo.append((gif_path, gif_info))
+
+    def work(item):
+        gif_path, gif_info = item
+        return convert_gif(gif_path, gif_info, repo_root, formats, hash_file(gif_path))
+
+    with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+        results = {gif_path: entry for (gif_path, _), entry in zip(todo, pool.map(work, todo))}
+
+    # Report in directory order
+    converted = 0
+    failed = 0
+    current_dir = None
+    for gif_path in gifs:
+        if gif_path.parent != current_dir:
+            current_dir = gif_path.parent
+            print(f"\n{current_dir.relative_to(repo_root)}/")
+            print("-" * 40)
+
+        key = site_path(gif_path, repo_root)
+        old_entry = previous.get(key)
+        if gif_path in kept:
+            print(f"   {kept[gif_path]} {gif_path.name}")
+            if old_entry is not None:
+                remove_files(old_entry, repo_root)
+            continue
+        if gif_path not in results:
+            print(f"   [Up to date] {gif_path.name}")
+            continue
+
+        entry = results[gif_path]
+        if entry is False:
+            print(f"   [FFmpeg error] {gif_path.name}")
+            failed += 1
+            if old_entry is not None:
+                remove_files(old_entry, repo_root)
+            continue
+        if entry is None:
+            print(f"   [Skipped - no improvement] {gif_path.name}")
+            kept[gif_path] = None
+            if old_entry is not None:
+                remove_files(old_entry, repo_root)
+            if cache is not None:
+                cache.record(gif_path, read_gif(gif_path), VERDICT_NO_IMPROVEMENT)
+            continue
+
+        # Files from the previous conversion that this one didn't write again
+        if old_entry is not None:
+            remove_files(old_entry, repo_root, keep=set(entry_files(entry)))
+
+        manifest[key] = entry
+        converted += 1
+        if cache is not None:
+            cache.record(gif_path, None, VERDICT_OPTIMIZED)
+        print(f"   [Converted] {gif_path.name} | {describe(entry)}")
+
+    # GIFs that were deleted or moved
+    removed = 0
+    for key in sorted(previous.keys() - {site_path(p, repo_root) for p in gifs}):
+        remove_files(previous[key], repo_root)
+        if cache is not None:
+            cache.forget(repo_root / 'src' / key)
+        removed += 1
+        print(f"   [Removed] {key}")
+
+    if cache is not None:
+        cache.save()
+
+    if write_manifest_if_changed(manifest_path, manifest):
+        print(f"\nUpdated {manifest_path.relative_to(repo_root)}")
+
+    up_to_date = len(gifs) - converted - failed - len(kept)
+    print(f"\nConverted: {converted}, Kept as GIF: {len(kept)}, Up to date: {up_to_date}, "
+          f"Removed: {removed}, Total: {len(gifs)}\n")
+
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -16,6 +16,8 @@ WHAT IT DOES:
        - Title/name (formatted from folder name)
        - Date (from markdown file)
        - Audio file (for poems only)
+       - Size, dominant colour and inline placeholder of every image in the folder's res/
+         (see image_placeholders.py)
     4. Generates two manifest files:
        - src/blogs/blogs_manifest.json
        - src/poems/poems_manifest.json
@@ -25,26 +27,48 @@ MANIFEST STRUCTURE (Blogs):
       {
         "folder": "0_optical_mouse",
         "title": "0 - Optical Mouse",
-        "date": "2024-12-15"
+        "date": "2024-12-15",
+        "images": {
+          "mouse_3d_top.png": {"width": 1920, "height": 1080, "color": "#e8e8e6",
+                               "placeholder": "data:image/jpeg;base64,..."},
+          ...
+        }
       },
       ...
     ]
 
+    "images" is left out when res/ has no images (currently every poem).
+
 MANIFEST STRUCTURE (Poems):
     [
       {
         "folder": "5_letter_to_a_faded_friend",
         "name": "5 - Letter To A Faded Friend",
         "audio": "track.mp3",
-        "date": "2024-11-20"
+        "date": "2024-11-20",
+        "audio_sources": [
+          {"src": "track.opus", "type": "audio/ogg; codecs=opus", "bytes": 241000},
+          {"src": "track.mp3", "type": "audio/mpeg", "bytes": 481000}
+        ]
       },
       ...
     ]
 
+    "audio_sources" lists every encoding of the track (same file name,
+    any extension in AUDIO_TYPES; compress_all_audio_files.py writes the
+    Opus next to the MP3), smallest first: the player takes the first one
+    the browser can play. "audio" stays the MP3 (or the only file) for
+    older clients. Both are null/left out when the folder has no audio.
+
 DATE EXTRACTION:
-    Looks for "date: YYYY-MM-DD" or "date: YYYY-MM" line in markdown files.
+    Reads the front matter at the top of each markdown file, either between
+    '---' lines or as bare "key: value" lines, and stops at its end, so the
+    body of long posts is never read.
+    Looks for "date: YYYY-MM-DD" or "date: YYYY-MM" in that front matter.
     Supports both full dates (YYYY-MM-DD) and partial dates (YYYY-MM).
     Entries without dates use empty string and are reported as warnings.
+    Other front-matter fields (e.g. "summary: ...") are copied into the
+    manifest entry unless they clash with a generated field.
 
 FOLDER NAMING CONVENTION:
     Folders should be named: "<number>_<title_with_underscores>"
@@ -65,16 +89,26 @@ SORTING:
     - This allows newest content to be added with higher numbers
 
 BEHAVIOR:
-    - OVERWRITES: Existing manifest files are completely replaced
+    - INCREMENTAL: Each folder is fingerprinted (markdown mtime/size, the
+      folder listing, the size/mtime of every file in res/ and of the
+      audio files). Only folders whose fingerprint changed since the
+      last run are reparsed; the rest reuse their previous entry
+      (state kept in scripts/.media_cache/manifests.json). Placeholders
+      are also cached by content hash, so a reparsed folder only decodes
+      the images that actually changed
+    - WRITE ON CHANGE: A manifest file is only rewritten when its content
+      actually changes, so later steps and git see no spurious writes
     - VALIDATION: Skips folders without required markdown files
     - WARNING OUTPUT: Reports missing dates or markdown files
 
 DEPENDENCIES:
     - Python 3.6+
-    - No external dependencies
+    - Pillow (optional) or ffmpeg, for the image placeholders
 
 USAGE:
     python scripts/generate_content_manifests.py
+    python scripts/generate_content_manifests.py --full    (reparse every folder)
+    python scripts/generate_content_manifests.py --only poems
 
 OUTPUT:
     Prints detailed progress for both blogs and poems:
@@ -93,6 +127,7 @@ EXAMPLE OUTPUT:
       0_optical_mouse - 0 - Optical Mouse (2024-12-15)
       1_embedded_systems_overview - 1 - Embedded Systems Overview (2024-12-10)
     
+    Reparsed 1 of 2 folder(s)
     Saved manifest with 2 blog(s)
     Location: /path/to/src/blogs/blogs_manifest.json
     
@@ -101,7 +136,8 @@ EXAMPLE OUTPUT:
     Scanning: /path/to/src/poems
       5_letter_to_a_faded_friend - 5 - Letter To A Faded Friend (track.mp3) (2024-11-20)
     
-    Saved manifest with 1 poem(s)
+    Reparsed 0 of 1 folder(s)
+    Manifest unchanged (1 poem(s))
     Location: /path/to/src/poems/poems_manifest.json
     
     All manifests generated successfully
@@ -117,7 +153,7 @@ NOTES:
     - Missing dates result in empty string (not null)
 
 AUTHOR: Website maintenance scripts
-LAST MODIFIED: 2026-01-16
+LAST MODIFIED: 2026-10-17
 ================================================================================
 """
 
@@ -126,28 +162,81 @@ import os
 from pathlib import Path
 from datetime import datetime
 import re
+import sys
+import argparse
+from image_placeholders import Placeholders, PLACEHOLDER_EXTS
+
+# Per-folder fingerprints from the last run (local build state, ignored by git)
+STATE_FILE = Path(__file__).parent / '.media_cache' / 'manifests.json'
+STATE_VERSION = 3
+
+# Audio encodings listed in a poem's audio_sources: extension -> MIME type for canPlayType()
+AUDIO_TYPES = {
+    '.opus': 'audio/ogg; codecs=opus',
+    '.ogg': 'audio/ogg',
+    '.m4a': 'audio/mp4',
+    '.aac': 'audio/aac',
+    '.mp3': 'audio/mpeg',
+}
+
+# Front matter: "key: value" lines, optionally between '---' markers
+FRONT_MATTER_LINE = re.compile(r'^([A-Za-z_][\w-]*)\s*:\s*(.*?)\s*$')
+DATE_PATTERN = re.compile(r'^\d{4}-\d{2}(?:-\d{2})?$')
+MAX_FRONT_MATTER_LINES = 100  # Give up on an unterminated block after this many lines
 
 def get_repo_root():
     """Get the repository root directory."""
     script_dir = Path(__file__).parent
     return script_dir.parent
 
-def extract_date_from_markdown(md_path):
-    """Extract date from simple 'date: YYYY-MM-DD' or 'date: YYYY-MM' line (no YAML markers)."""
-    try:
-        with open(md_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+def read_front_matter(md_path):
+    """Read the 'key: value' front matter at the top of a markdown file as a dict.
+    
+    Accepts a block delimited by '---' lines or bare 'key: value' lines at the
+    start of the file. Reading stops at the end of the block, so the body of
+    long posts is never loaded.
+    """
+    front_matter = {}
+    
+    with open(md_path, 'r', encoding='utf-8-sig') as f:
+        first_line = f.readline()
+        delimited = first_line.strip() == '---'
+        line = f.readline() if delimited else first_line
         
-        # Look for simple "date: YYYY-MM-DD" or "date: YYYY-MM" line at start of file
-        date_match = re.search(r'^date:\s*(\d{4}-\d{2}(?:-\d{2})?)\s*$', content, re.MULTILINE)
-        if date_match:
-            return date_match.group(1)
+        for _ in range(MAX_FRONT_MATTER_LINES):
+            if not line:
+                break
             
-    except Exception as e:
-        print(f"  Warning: Error reading date from {md_path}: {e}")
+            stripped = line.strip()
+            if delimited and stripped == '---':
+                break
+            
+            match = FRONT_MATTER_LINE.match(stripped)
+            if match:
+                front_matter[match.group(1)] = match.group(2).strip('"\'')
+            elif not delimited and (stripped or front_matter):
+                break  # First line that isn't front matter ends a bare block
+            
+            line = f.readline()
     
-    # Return empty string if no date found
-    return ""
+    return front_matter
+
+def load_front_matter(md_path):
+    """read_front_matter() that reports read errors and returns an empty dict instead of raising."""
+    try:
+        return read_front_matter(md_path)
+    except Exception as e:
+        print(f"  Warning: Error reading front matter from {md_path}: {e}")
+        return {}
+
+def date_from_front_matter(front_matter):
+    """Return the 'YYYY-MM-DD' or 'YYYY-MM' date from front matter, or empty string."""
+    date = front_matter.get('date', '')
+    return date if DATE_PATTERN.match(date) else ""
+
+def extract_date_from_markdown(md_path):
+    """Extract 'date: YYYY-MM-DD' or 'date: YYYY-MM' from a markdown file's front matter."""
+    return date_from_front_matter(load_front_matter(md_path))
 
 def format_date(date_string):
     """Format date from YYYY-MM-DD to readable format (e.g., 'Jan 15, 2024')."""
@@ -175,7 +264,201 @@ def parse_date_for_sorting(date_string):
     except ValueError:
         return datetime(1970, 1, 1)
 
-def make_blog_manifest():
+def load_state():
+    """Load per-folder fingerprints and entries from the last run."""
+    try:
+        with open(STATE_FILE, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        if state.get('version') == STATE_VERSION:
+            return state
+    except (FileNotFoundError, json.JSONDecodeError):
+        pass
+    return {'version': STATE_VERSION, 'blogs': {}, 'poems': {}}
+
+def save_state(state):
+    """Save per-folder fingerprints and entries for the next run."""
+    STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with open(STATE_FILE, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=1, ensure_ascii=False)
+
+def folder_fingerprint(folder, md_file):
+    """Cheap change detector for a content folder: markdown mtime/size, the folder listing
+    and the mtime/size of each file in res/ (images there feed the placeholders) and of
+    each audio file (their sizes go into audio_sources)."""
+    stat = md_file.stat()
+    res_dir = folder / 'res'
+    res_files = sorted(p for p in res_dir.iterdir() if p.is_file()) if res_dir.is_dir() else []
+    audio_files = sorted(p for p in folder.iterdir() if p.is_file() and p.suffix.lower() in AUDIO_TYPES)
+    return {
+        'md': [stat.st_mtime_ns, stat.st_size],
+        'listing': sorted(p.name for p in folder.iterdir()),
+        'res': [[p.name, p.stat().st_mtime_ns, p.stat().st_size] for p in res_files],
+        'audio': [[p.name, p.stat().st_mtime_ns, p.stat().st_size] for p in audio_files],
+    }
+
+def audio_sources(folder):
+    """[{src, type, bytes}] for every encoding of a poem's track, smallest first. The track
+    is the folder's MP3 (or its first audio file); other encodings share its file name."""
+    files = sorted(p for p in folder.iterdir() if p.is_file() and p.suffix.lower() in AUDIO_TYPES)
+    if not files:
+        return []
+    track = next((p for p in files if p.suffix.lower() == '.mp3'), files[0])
+    sources = [{'src': p.name, 'type': AUDIO_TYPES[p.suffix.lower()], 'bytes': p.stat().st_size}
+               for p in files if p.stem == track.stem]
+    return sorted(sources, key=lambda source: source['bytes'])
+
+def res_images(folder, placeholders):
+    """{filename: {width, height, color, placeholder}} for the images in a folder's res/."""
+    res_dir = folder / 'res'
+    if not res_dir.is_dir():
+        return {}
+    
+    images = {}
+    for img_path in sorted(res_dir.iterdir()):
+        if img_path.is_file() and img_path.suffix.lower() in PLACEHOLDER_EXTS:
+            info = placeholders.get(img_path)
+            if info is not None:
+                images[img_path.name] = info
+    return images
+
+def collect_entries(content_dir, md_name, build_entry, state_section, incremental, placeholders):
+    """Build one entry per content folder, reparsing only folders whose fingerprint changed.
+    Returns (entries, new state section, number of folders reparsed)."""
+    entries = []
+    new_state = {}
+    reparsed = 0
+    
+    for folder in sorted(content_dir.iterdir()):
+        if not folder.is_dir():
+            continue
+        
+        md_file = folder / md_name
+        
+        if not md_file.exists():
+            print(f"  Skipping {folder.name}: {md_name} not found")
+            continue
+        
+        fingerprint = folder_fingerprint(folder, md_file)
+        fingerprint['placeholders'] = placeholders.settings()  # New placeholder settings redo the images
+        cached = state_section.get(folder.name)
+        
+        if incremental and cached and cached.get('fingerprint') == fingerprint:
+            entry = cached['entry']
+        else:
+            entry = build_entry(folder, md_file)
+            images = res_images(folder, placeholders)
+            if images:
+                entry['images'] = images
+            reparsed += 1
+        
+        new_state[folder.name] = {'fingerprint': fingerprint, 'entry': entry}
+        entries.append(entry)
+    
+    return entries, new_state, reparsed
+
+def write_manifest_if_changed(manifest_path, entries):
+    """Write the manifest only if its content differs from what is on disk. Returns True if written."""
+    content = json.dumps(entries, indent=2, ensure_ascii=False)
+    
+    try:
+        if manifest_path.read_text(encoding='utf-8') == content:
+            return False
+    except FileNotFoundError:
+        pass
+    
+    manifest_path.write_text(content, encoding='utf-8')
+    return True
+
+def folder_number_key(entry):
+    """Sort key: the folder's leading number (9999 if none)."""
+    match = re.match(r'^(\d+)', entry['folder'])
+    return int(match.group(1)) if match else 9999
+
+def build_blog_entry(folder, blog_file):
+    """Parse one blog folder into its manifest entry."""
+    # Extract date from the front matter (only the block at the top is read)
+    front_matter = load_front_matter(blog_file)
+    date = date_from_front_matter(front_matter)
+    if not date:
+        print(f"  No date found in {folder.name}/blog.md, using empty date")
+        date = ""
+    
+    # Do NOT add formatted date to markdown file anymore
+    
+    # Extract title from folder name with proper spacing
+    folder_name = folder.name
+    title = folder_name
+    if folder_name[0].isdigit():
+        parts = folder_name.split('.', 1)
+        if len(parts) > 1:
+            title = parts[1].strip()
+    
+    # Replace underscores with spaces: "1_optical_mouse" → "1 optical mouse"
+    title = title.replace('_', ' ')
+    # Add spacing around number: "1 optical" → "1 - optical"
+    title = re.sub(r'^(\d+)\s+', r'\1 - ', title)
+    # Capitalize first letter of each word while preserving rest
+    title = ' '.join(word[0].upper() + word[1:] if word else '' for word in title.split())
+    
+    entry = {
+        'folder': folder.name,
+        'title': title,
+        'date': date
+    }
+    
+    # Any other front-matter fields are carried into the manifest as-is
+    for key, value in front_matter.items():
+        entry.setdefault(key, value)
+    
+    return entry
+
+def build_poem_entry(folder, poem_file):
+    """Parse one poem folder into its manifest entry."""
+    # Extract date from the front matter (only the block at the top is read)
+    front_matter = load_front_matter(poem_file)
+    date = date_from_front_matter(front_matter)
+    if not date:
+        print(f"  No date found in {folder.name}/poem.md, using empty date")
+        date = ""
+    
+    # Do NOT add formatted date to markdown file anymore
+    
+    # Audio: every encoding of the track; "audio" keeps the MP3 for older clients
+    sources = audio_sources(folder)
+    audio_file = next((source['src'] for source in sources if source['type'] == AUDIO_TYPES['.mp3']),
+                      sources[0]['src'] if sources else None)
+    
+    # Extract name from folder with proper spacing
+    folder_name = folder.name
+    name = folder_name
+    if folder_name[0].isdigit():
+        parts = folder_name.split('.', 1)
+        if len(parts) > 1:
+            name = parts[1].strip()
+    
+    # Replace underscores and dashes with spaces
+    name = name.replace('_', ' ').replace('-', ' ')
+    # Add spacing around number: "1 intro" → "1 - intro"
+    name = re.sub(r'^(\d+)\s+', r'\1 - ', name)
+    # Capitalize first letter of each word while preserving rest
+    name = ' '.join(word[0].upper() + word[1:] if word else '' for word in name.split())
+    
+    entry = {
+        'folder': folder.name,
+        'name': name,
+        'audio': audio_file,
+        'date': date
+    }
+    if sources:
+        entry['audio_sources'] = sources
+    
+    # Any other front-matter fields are carried into the manifest as-is
+    for key, value in front_matter.items():
+        entry.setdefault(key, value)
+    
+    return entry
+
+def make_blog_manifest(state=None, incremental=True, placeholders=None):
     """Generate blogs_manifest.json from blog folders."""
     print("\nGenerating Blogs Manifest")
     print("-" * 40)
@@ -189,63 +472,32 @@ def make_blog_manifest():
     
     print(f"Scanning: {blogs_dir}")
     
-    blogs = []
+    if state is None:
+        state = load_state()
+    if placeholders is None:
+        placeholders = Placeholders()
     
-    for folder in sorted(blogs_dir.iterdir()):
-        if not folder.is_dir():
-            continue
-        
-        blog_file = folder / 'blog.md'
-        
-        if not blog_file.exists():
-            print(f"  Skipping {folder.name}: blog.md not found")
-            continue
-        
-        # Extract date from markdown
-        date = extract_date_from_markdown(blog_file)
-        if not date:
-            print(f"  No date found in {folder.name}/blog.md, using empty date")
-            date = ""
-        
-        # Do NOT add formatted date to markdown file anymore
-        
-        # Extract title from folder name with proper spacing
-        folder_name = folder.name
-        title = folder_name
-        if folder_name[0].isdigit():
-            parts = folder_name.split('.', 1)
-            if len(parts) > 1:
-                title = parts[1].strip()
-        
-        # Replace underscores with spaces: "1_optical_mouse" → "1 optical mouse"
-        title = title.replace('_', ' ')
-        # Add spacing around number: "1 optical" → "1 - optical"
-        title = re.sub(r'^(\d+)\s+', r'\1 - ', title)
-        # Capitalize first letter of each word while preserving rest
-        title = ' '.join(word[0].upper() + word[1:] if word else '' for word in title.split())
-        
-        blog_entry = {
-            'folder': folder.name,
-            'title': title,
-            'date': date
-        }
-        
-        blogs.append(blog_entry)
-        print(f"  {folder.name} - {title} ({date})")
+    blogs, state['blogs'], reparsed = collect_entries(
+        blogs_dir, 'blog.md', build_blog_entry, state.get('blogs', {}), incremental,
+        placeholders)
+    
+    for blog in blogs:
+        print(f"  {blog['folder']} - {blog['title']} ({blog['date']})")
     
     # Sort by folder number (highest first, so lowest gets index 0 at bottom)
-    blogs.sort(key=lambda x: int(re.match(r'^(\d+)', x['folder']).group(1)) if re.match(r'^(\d+)', x['folder']) else 9999, reverse=True)
+    blogs.sort(key=folder_number_key, reverse=True)
     
     manifest_path = blogs_dir / 'blogs_manifest.json'
-    with open(manifest_path, 'w', encoding='utf-8') as f:
-        json.dump(blogs, f, indent=2, ensure_ascii=False)
-    
-    print(f"\nSaved manifest with {len(blogs)} blog(s)")
+    print(f"\nReparsed {reparsed} of {len(blogs)} folder(s)")
+    if write_manifest_if_changed(manifest_path, blogs):
+        print(f"Saved manifest with {len(blogs)} blog(s)")
+    else:
+        print(f"Manifest unchanged ({len(blogs)} blog(s))")
     print(f"Location: {manifest_path}")
     
     return True
 
-def make_poem_manifest():
+def make_poem_manifest(state=None, incremental=True, placeholders=None):
     """Generate poems_manifest.json from poem folders."""
     print("\nGenerating Poems Manifest")
     print("-" * 40)
@@ -259,80 +511,64 @@ def make_poem_manifest():
     
     print(f"Scanning: {poems_dir}")
     
-    poems = []
+    if state is None:
+        state = load_state()
+    if placeholders is None:
+        placeholders = Placeholders()
     
-    for folder in sorted(poems_dir.iterdir()):
-        if not folder.is_dir():
-            continue
-        
-        poem_file = folder / 'poem.md'
-        
-        if not poem_file.exists():
-            print(f"  Skipping {folder.name}: poem.md not found")
-            continue
-        
-        # Extract date from markdown
-        date = extract_date_from_markdown(poem_file)
-        if not date:
-            print(f"  No date found in {folder.name}/poem.md, using empty date")
-            date = ""
-        
-        # Do NOT add formatted date to markdown file anymore
-        
-        # Check for audio file
-        audio_file = None
-        for file in folder.iterdir():
-            if file.suffix.lower() == '.mp3':
-                audio_file = file.name
-                break
-        
-        # Extract name from folder with proper spacing
-        folder_name = folder.name
-        name = folder_name
-        if folder_name[0].isdigit():
-            parts = folder_name.split('.', 1)
-            if len(parts) > 1:
-                name = parts[1].strip()
-        
-        # Replace underscores and dashes with spaces
-        name = name.replace('_', ' ').replace('-', ' ')
-        # Add spacing around number: "1 intro" → "1 - intro"
-        name = re.sub(r'^(\d+)\s+', r'\1 - ', name)
-        # Capitalize first letter of each word while preserving rest
-        name = ' '.join(word[0].upper() + word[1:] if word else '' for word in name.split())
-        
-        poem_entry = {
-            'folder': folder.name,
-            'name': name,
-            'audio': audio_file,
-            'date': date
-        }
-        
-        poems.append(poem_entry)
-        audio_str = f" ({audio_file})" if audio_file else ""
-        print(f"  {folder.name} - {name}{audio_str} ({date})")
+    poems, state['poems'], reparsed = collect_entries(
+        poems_dir, 'poem.md', build_poem_entry, state.get('poems', {}), incremental,
+        placeholders)
+    
+    for poem in poems:
+        audio_str = f" ({poem['audio']})" if poem['audio'] else ""
+        print(f"  {poem['folder']} - {poem['name']}{audio_str} ({poem['date']})")
     
     # Sort by folder number (highest first, so lowest gets index 0 at bottom)
-    poems.sort(key=lambda x: int(re.match(r'^(\d+)', x['folder']).group(1)) if re.match(r'^(\d+)', x['folder']) else 9999, reverse=True)
+    poems.sort(key=folder_number_key, reverse=True)
     
     manifest_path = poems_dir / 'poems_manifest.json'
-    with open(manifest_path, 'w', encoding='utf-8') as f:
-        json.dump(poems, f, indent=2, ensure_ascii=False)
-    
-    print(f"\nSaved manifest with {len(poems)} poem(s)")
+    print(f"\nReparsed {reparsed} of {len(poems)} folder(s)")
+    if write_manifest_if_changed(manifest_path, poems):
+        print(f"Saved manifest with {len(poems)} poem(s)")
+    else:
+        print(f"Manifest unchanged ({len(poems)} poem(s))")
     print(f"Location: {manifest_path}")
     
     return True
 
-if __name__ == '__main__':
+def main(argv=None):
+    """Run the script; returns the process exit status."""
+    parser = argparse.ArgumentParser(description="Generate blogs_manifest.json and poems_manifest.json.")
+    parser.add_argument('--full', action='store_true',
+                        help="reparse every folder instead of only the ones that changed")
+    parser.add_argument('--only', choices=['blogs', 'poems'],
+                        help="regenerate just one of the two manifests")
+    args = parser.parse_args(argv)
+    
     print("\nManifest Generation")
     print("-" * 40)
     
-    blog_success = make_blog_manifest()
-    poem_success = make_poem_manifest()
+    state = load_state()
+    placeholders = Placeholders()
+    blog_success = True
+    poem_success = True
+    if args.only != 'poems':
+        blog_success = make_blog_manifest(state, incremental=not args.full, placeholders=placeholders)
+    if args.only != 'blogs':
+        poem_success = make_poem_manifest(state, incremental=not args.full, placeholders=placeholders)
+    save_state(state)
+    placeholders.save()
+    if placeholders.computed:
+        print(f"\nComputed {placeholders.computed} image placeholder(s)")
     
     if blog_success and poem_success:
         print("\nAll manifests generated successfully")
     else:
         print("\nSome manifests failed to generate")
     print()
+    
+    return 0 if blog_success and poem_success else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
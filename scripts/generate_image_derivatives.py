@@ -0,0 +1,436 @@
+"""
+================================================================================
+GENERATE IMAGE DERIVATIVES
+================================================================================
+
+PURPOSE:
+    Generate smaller, modern-format copies of every website image so the
+    browser can pick the right one through srcset instead of downloading the
+    full-resolution JPG/PNG (e.g. the 912 KB overview/14.jpg on a phone).
+
+WHAT IT DOES:
+    1. Scans src/resources/images, src/blogs/*/res and src/bio/res for
+       JPG/PNG images
+    2. Skips images whose content hasn't changed since their derivatives
+       were generated (SHA-256 recorded in the manifest)
+    3. Writes each image at several widths in every available format:
+       WebP (libwebp) and AVIF (libaom-av1), as far as the local ffmpeg
+       supports them
+    4. Drops variants that are not smaller than the original file
+    5. Deletes derivatives of images that no longer exist
+    6. Writes src/resources/derivatives/derivatives_manifest.json
+
+OUTPUT LOCATION:
+    src/resources/derivatives/ mirrors the src/ tree. Each variant is named
+    after the original file name plus its width:
+
+        src/resources/images/overview/14.jpg
+        -> src/resources/derivatives/resources/images/overview/14.jpg-480w.webp
+        -> src/resources/derivatives/resources/images/overview/14.jpg-480w.avif
+        -> src/resources/derivatives/resources/images/overview/14.jpg-960w.webp
+        ...
+
+MANIFEST FORMAT:
+    Paths are relative to src/, the folder script.js lives in:
+
+    {
+      "version": 1,
+      "settings": { ... },
+      "images": {
+        "resources/images/overview/14.jpg": {
+          "sha256": "...",
+          "width": 2000,
+          "height": 1500,
+          "bytes": 933888,
+          "variants": [
+            {"src": "resources/derivatives/resources/images/overview/14.jpg-480w.webp",
+             "format": "webp", "width": 480, "height": 360, "bytes": 31210},
+            ...
+          ]
+        }
+      }
+    }
+
+    script.js builds srcset from the variants of the best format the
+    browser supports, plus the original at its full width.
+
+CONFIGURATION:
+    DERIVATIVE_WIDTHS = (480, 960, 1600)   # Widths generated (never upscaled)
+    WEBP_QUALITY = 80                      # libwebp quality: 0-100
+    AVIF_CRF = 32                          # libaom-av1 CRF: 0=best, 63=worst
+
+BEHAVIOR:
+    - IDEMPOTENT: Safe to run multiple times
+    - INCREMENTAL: Unchanged images cost a single stat() (media cache,
+      section "derivatives") or a hash check on a fresh checkout
+    - SETTINGS-AWARE: Changing the widths or encoder settings regenerates
+      everything
+    - NON-DESTRUCTIVE: Original images are never modified
+
+DEPENDENCIES:
+    - ffmpeg (must be installed and in PATH; built with libwebp and/or
+      libaom-av1)
+    - Python 3.6+
+
+USAGE:
+    python scripts/generate_image_derivatives.py
+    python scripts/generate_image_derivatives.py --jobs 4
+    python scripts/generate_image_derivatives.py --no-cache
+    python scripts/generate_image_derivatives.py --force     (regenerate all)
+
+EXAMPLE OUTPUT:
+    Image Derivatives
+    ----------------------------------------
+    Widths: 480, 960, 1600
+    Formats: webp, avif
+
+    src/resources/images/overview/
+    ----------------------------------------
+       [Generated] 14.jpg | 6 variants, 912 KB → 41-214 KB
+       [Up to date] 15.jpg
+       [Skip] broken.jpg (can't read image size)
+
+    Generated: 1, Up to date: 66, Skipped: 1, Removed: 0, Total: 68
+
+AUTHOR: Website maintenance scripts
+LAST MODIFIED: 2026-10-17
+================================================================================
+"""
+
+import sys
+import json
+import subprocess
+import argparse
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from media_probe import probe_image
+from media_cache import MediaCache, hash_file, VERDICT_OPTIMIZED
+
+# ----------------------------- CONFIG -----------------------------
+DERIVATIVE_WIDTHS = (480, 960, 1600)   # Widths to generate (never upscaled)
+WEBP_QUALITY = 80                      # libwebp quality: 0-100 (higher = better)
+AVIF_CRF = 32                          # libaom-av1 CRF: 0 = best, 63 = worst
+AVIF_CPU_USED = 6                      # libaom-av1 speed: 0 = slowest, 8 = fastest
+OUTPUT_DIR = 'src/resources/derivatives'
+MANIFEST_NAME = 'derivatives_manifest.json'
+MANIFEST_VERSION = 1
+# ------------------------------------------------------------------
+
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png'}
+
+# Output formats in order of preference, with the ffmpeg encoder each needs
+FORMATS = {
+    'avif': {
+        'encoder': 'libaom-av1',
+        'args': ['-c:v', 'libaom-av1', '-still-picture', '1', '-crf', str(AVIF_CRF), '-b:v', '0',
+                 '-cpu-used', str(AVIF_CPU_USED), '-pix_fmt', 'yuv420p'],
+    },
+    'webp': {
+        'encoder': 'libwebp',
+        'args': ['-c:v', 'libwebp', '-quality', str(WEBP_QUALITY), '-compression_level', '6'],
+    },
+}
+
+# Pixel formats that may carry transparency (AVIF output here is opaque yuv420p)
+ALPHA_PIX_FMTS = {'rgba', 'rgba64be', 'ya8', 'ya16be', 'pal8', 'bgra', 'argb'}
+
+UNREADABLE = 'unreadable'  # generate_derivatives() result for images whose size can't be read
+
+def cache_settings():
+    """Settings that change the derivatives; the manifest and media cache store them."""
+    return {
+        'widths': list(DERIVATIVE_WIDTHS),
+        'webp_quality': WEBP_QUALITY,
+        'avif_crf': AVIF_CRF,
+    }
+
+def available_formats():
+    """Formats whose encoder the local ffmpeg provides, in order of preference."""
+    try:
+        result = subprocess.run(['ffmpeg', '-hide_banner', '-encoders'],
+                                capture_output=True, text=True, timeout=10)
+    except (subprocess.TimeoutExpired, FileNotFoundError):
+        return []
+
+    encoders = {line.split()[1] for line in result.stdout.splitlines() if len(line.split()) > 1}
+    return [fmt for fmt, spec in FORMATS.items() if spec['encoder'] in encoders]
+
+def find_source_images(repo_root):
+    """Find all images that get derivatives."""
+    search_paths = [repo_root / 'src' / 'resources' / 'images', repo_root / 'src' / 'bio' / 'res']
+    search_paths += sorted((repo_root / 'src' / 'blogs').glob('*/res'))
+
+    images = []
+    for search_path in search_paths:
+        if search_path.exists():
+            for img_path in search_path.rglob('*'):
+                if img_path.is_file() and img_path.suffix.lower() in IMAGE_EXTENSIONS:
+                    images.append(img_path)
+
+    return sorted(images)
+
+def site_path(path, repo_root):
+    """Path relative to src/, with forward slashes (the form script.js uses)."""
+    return path.relative_to(repo_root / 'src').as_posix()
+
+def variant_sizes(width, height):
+    """(width, height) pairs to generate for an image, smallest first. Heights are even."""
+    sizes = []
+    for target in sorted({min(w, width) for w in DERIVATIVE_WIDTHS}):
+        scaled = max(2, round(height * target / width / 2) * 2)
+        sizes.append((target, scaled))
+    return sizes
+
+def encode_variant(img_path, out_path, fmt, size, original_size):
+    """Encode one variant. Returns True if it was written."""
+    width, height = size
+    cmd = ['ffmpeg', '-i', str(img_path)]
+    if size != original_size:
+        cmd += ['-vf', f'scale={width}:{height}:flags=lanczos']
+    cmd += FORMATS[fmt]['args'] + ['-frames:v', '1', '-y', str(out_path)]
+
+    result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    if result.returncode != 0 or not out_path.exists():
+        out_path.unlink(missing_ok=True)
+        return False
+    return True
+
+def generate_derivatives(img_path, repo_root, formats, sha256):
+    """Generate all variants of one image. Returns its manifest entry, UNREADABLE if the
+    image can't be probed (e.g. truncated), or None if an encode failed and no variant
+    was written."""
+    info = probe_image(img_path)
+    if not info or not info.get('width') or not info.get('height'):
+        return UNREADABLE
+    width, height = info['width'], info['height']
+
+    source_bytes = img_path.stat().st_size
+    out_dir = repo_root / OUTPUT_DIR / Path(site_path(img_path, repo_root)).parent
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    variants = []
+    failed = False
+    for fmt in formats:
+        if fmt == 'avif' and info.get('pix_fmt') in ALPHA_PIX_FMTS:
+            continue  # Would lose transparency
+        for size in variant_sizes(width, height):
+            out_path = out_dir / f"{img_path.name}-{size[0]}w.{fmt}"
+            if not encode_variant(img_path, out_path, fmt, size, (width, height)):
+                failed = True
+                continue
+
+            variant_bytes = out_path.stat().st_size
+            if variant_bytes >= source_bytes:
+                out_path.unlink()  # No smaller than the original: serve the original instead
+                continue
+
+            variants.append({
+                'src': site_path(out_path, repo_root),
+                'format': fmt,
+                'width': size[0],
+                'height': size[1],
+                'bytes': variant_bytes,
+            })
+
+    if failed and not variants:
+        return None  # Not recorded anywhere, so the next run tries again
+
+    return {
+        'sha256': sha256,
+        'width': width,
+        'height': height,
+        'bytes': source_bytes,
+        'variants': variants,
+    }
+
+def remove_variants(entry, repo_root, keep=()):
+    """Delete an entry's variant files, except those listed in 'keep'."""
+    removed = 0
+    for variant in entry.get('variants', []):
+        if variant['src'] in keep:
+            continue
+        path = repo_root / 'src' / variant['src']
+        if path.exists():
+            path.unlink()
+            removed += 1
+    return removed
+
+def is_up_to_date(img_path, entry, repo_root, cache):
+    """True if the manifest entry still describes the image and its variant files exist."""
+    if entry is None:
+        return False
+    if not all((repo_root / 'src' / v['src']).exists() for v in entry['variants']):
+        return False
+
+    # Unchanged since the last run: a single stat()
+    if cache is not None and cache.lookup(img_path) is not None:
+        return True
+
+    # Fresh checkout or touched file: compare content
+    if hash_file(img_path) == entry['sha256']:
+        if cache is not None:
+            cache.record(img_path, None, VERDICT_OPTIMIZED)
+        return True
+    return False
+
+def load_manifest(manifest_path):
+    """Read the manifest; entries made with other settings are dropped."""
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+    if data.get('version') != MANIFEST_VERSION:
+        return {}
+    images = data.get('images', {})
+    if data.get('settings') != cache_settings():
+        # Keep the entries so their old files get cleaned up, but force regeneration
+        for entry in images.values():
+            entry['sha256'] = None
+    return images
+
+def write_manifest_if_changed(manifest_path, images):
+    """Write the manifest only if its content differs from what is on disk. Returns True if written."""
+    data = {
+        'version': MANIFEST_VERSION,
+        'settings': cache_settings(),
+        'images': dict(sorted(images.items())),
+    }
+    content = json.dumps(data, indent=2, ensure_ascii=False)
+
+    try:
+        if manifest_path.read_text(encoding='utf-8') == content:
+            return False
+    except FileNotFoundError:
+        pass
+
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    manifest_path.write_text(content, encoding='utf-8')
+    return True
+
+def describe(entry, source_bytes):
+    """One-line summary of a generated entry."""
+    if not entry['variants']:
+        return "no smaller variants"
+    sizes = [v['bytes'] for v in entry['variants']]
+    return (f"{len(sizes)} variants, {source_bytes//1024} KB → "
+            f"{min(sizes)//1024}-{max(sizes)//1024} KB")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate responsive WebP/AVIF variants of website images.")
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help="number of images to encode at the same time (default: 1)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="ignore the media cache and hash every image again")
+    parser.add_argument('--force', action='store_true',
+                        help="regenerate the derivatives of every image")
+    args = parser.parse_args(argv)
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    return args
+
+def main(argv=None):
+    """Run the script; returns the process exit status."""
+    args = parse_args(argv)
+
+    print("\nImage Derivatives")
+    print("-" * 40)
+
+    formats = available_formats()
+    if not formats:
+        print("\nError: ffmpeg with libwebp or libaom-av1 must be installed and in PATH")
+        print("Install from: https://ffmpeg.org/download.html")
+        return 1
+
+    repo_root = Path(__file__).parent.parent
+    manifest_path = repo_root / OUTPUT_DIR / MANIFEST_NAME
+
+    print(f"\nWidths: {', '.join(str(w) for w in DERIVATIVE_WIDTHS)}")
+    print(f"Formats: {', '.join(formats)}")
+    print()
+
+    images = find_source_images(repo_root)
+    previous = load_manifest(manifest_path)
+    cache = None if args.no_cache else MediaCache('derivatives', cache_settings(), repo_root)
+
+    # Decide what needs work before starting any encoder
+    manifest = {}
+    todo = []
+    for img_path in images:
+        key = site_path(img_path, repo_root)
+        entry = previous.get(key)
+        if not args.force and is_up_to_date(img_path, entry, repo_root, cache):
+            manifest[key] = entry
+        else:
+            todo.append(img_path)
+
+    def work(img_path):
+        return generate_derivatives(img_path, repo_root, formats, hash_file(img_path))
+
+    with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+        results = dict(zip(todo, pool.map(work, todo)))
+
+    # Report in directory order
+    generated = 0
+    failed = 0
+    skipped = 0
+    current_dir = None
+    for img_path in images:
+        if img_path.parent != current_dir:
+            current_dir = img_path.parent
+            print(f"\n{current_dir.relative_to(repo_root)}/")
+            print("-" * 40)
+
+        key = site_path(img_path, repo_root)
+        if img_path not in results:
+            print(f"   [Up to date] {img_path.name}")
+            continue
+
+        entry = results[img_path]
+        old_entry = previous.get(key)
+        if entry == UNREADABLE:
+            print(f"   [Skip] {img_path.name} (can't read image size)")
+            skipped += 1
+            if old_entry is not None:
+                remove_variants(old_entry, repo_root)
+            continue
+        if entry is None:
+            print(f"   [FFmpeg error] {img_path.name}")
+            failed += 1
+            if old_entry is not None:
+                remove_variants(old_entry, repo_root)
+            continue
+
+        # Files from the previous generation that the new one didn't write again
+        if old_entry is not None:
+            remove_variants(old_entry, repo_root, keep={v['src'] for v in entry['variants']})
+
+        manifest[key] = entry
+        generated += 1
+        if cache is not None:
+            cache.record(img_path, None, VERDICT_OPTIMIZED)
+        print(f"   [Generated] {img_path.name} | {describe(entry, entry['bytes'])}")
+
+    # Images that were deleted or moved
+    removed = 0
+    for key in sorted(previous.keys() - {site_path(p, repo_root) for p in images}):
+        remove_variants(previous[key], repo_root)
+        if cache is not None:
+            cache.forget(repo_root / 'src' / key)
+        removed += 1
+        print(f"   [Removed] {key}")
+
+    if cache is not None:
+        cache.save()
+
+    if write_manifest_if_changed(manifest_path, manifest):
+        print(f"\nUpdated {manifest_path.relative_to(repo_root)}")
+
+    print(f"\nGenerated: {generated}, Up to date: {len(images) - generated - failed - skipped}, "
+          f"Skipped: {skipped}, Removed: {removed}, Total: {len(images)}\n")
+
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
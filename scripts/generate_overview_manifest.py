@@ -7,22 +7,53 @@ GENERATE OVERVIEW IMAGE MANIFEST
 PURPOSE:
     Generate a manifest JSON file listing all images in the overview/showcase
     directory. This manifest is used by the website to display the image
-    gallery on the main page.
+    gallery on the main page. Each image carries its size, byte size,
+    dominant colour and a tiny inline placeholder, so the page can lay out
+    the gallery, paint something before the full image arrives and decide
+    what to load first.
 
 WHAT IT DOES:
     1. Scans src/resources/images/overview/ directory
     2. Finds all image files (JPG, JPEG, PNG, GIF, WEBP, SVG, BMP)
-    3. Creates a JSON array with all image filenames
-    4. Writes to src/resources/images/overview/overview_manifest.json
+    3. Reads each image's width/height, dominant colour and a 16 px JPEG
+       placeholder in-process (see image_placeholders.py; cached by content
+       hash, so unchanged images are not decoded again) and its byte size
+    4. Writes the list of filenames to
+       src/resources/images/overview/overview_manifest.json and the per-image
+       details to overview_details.json next to it
 
 MANIFEST STRUCTURE:
+    overview_manifest.json - a plain array of filenames:
     [
       "image1.jpg",
-      "image2.png",
-      "image3.gif",
+      "image2.svg",
       ...
     ]
 
+    overview_details.json - the details of each image, by filename:
+    {
+      "version": 1,
+      "images": {
+        "image1.jpg": {"bytes": 933888, "width": 2000, "height": 1500,
+                       "color": "#4a5b3c", "placeholder": "data:image/jpeg;base64,..."},
+        "image2.svg": {"bytes": 2048},
+        ...
+      }
+    }
+
+    Images that can't be decoded (SVG) only carry their bytes. The details
+    live in their own file so overview_manifest.json keeps the format every
+    reader knows; script.js merges them in when they are there.
+
+COMPATIBILITY:
+    - overview_manifest.json never changes format: any reader of the
+      original filename array (including an older, cached script.js)
+      keeps working
+    - overview_details.json is versioned ("version"). New versions may
+      only add fields, so every reader of an older version still reads
+      it; a change that isn't additive needs a new file name instead
+    - script.js reads the manifest with or without the details file
+
 SUPPORTED IMAGE FORMATS:
     - JPG/JPEG (most common)
     - PNG (transparency support)
@@ -34,6 +65,7 @@ SUPPORTED IMAGE FORMATS:
 DEFAULT PATHS:
     Source directory: src/resources/images/overview
     Output file: src/resources/images/overview/overview_manifest.json
+    Details file: overview_details.json, next to the output file
 
 COMMAND LINE ARGUMENTS (OPTIONAL):
     python scripts/generate_overview_manifest.py [SRC_DIR] [OUT_FILE]
@@ -46,14 +78,15 @@ COMMAND LINE ARGUMENTS (OPTIONAL):
       python scripts/generate_overview_manifest.py custom/path output.json
 
 BEHAVIOR:
-    - OVERWRITES: Existing manifest file is replaced
+    - OVERWRITES: Existing manifest and details files are replaced
+    - CACHED: Placeholders are kept in scripts/.media_cache/placeholders.json
     - ALPHABETICAL: Images are sorted alphabetically by filename
     - CASE-INSENSITIVE: File extensions checked with .lower()
     - FILES ONLY: Subdirectories are ignored
 
 DEPENDENCIES:
     - Python 3.6+
-    - No external dependencies
+    - Pillow (optional) or ffmpeg, for the placeholders
 
 USAGE:
     python scripts/generate_overview_manifest.py
@@ -63,7 +96,7 @@ OUTPUT:
     Returns exit code 0 on success, 2 if source directory not found.
 
 EXAMPLE OUTPUT:
-    src/resources/images/overview/overview_manifest.json
+    Wrote 16 entries to src/resources/images/overview/overview_manifest.json (2 placeholder(s) computed)
 
 ERROR HANDLING:
     If source directory doesn't exist:
@@ -72,6 +105,7 @@ ERROR HANDLING:
 
 NOTES:
     - Manifest includes only filenames, not full paths
+    - Placeholders add roughly 0.5 KB per image to the details file
     - JavaScript on the website constructs full paths from manifest
     - Files are included in the order they appear in the directory
     - Hidden files (starting with .) are included if they match extensions
@@ -82,27 +116,46 @@ USE CASE:
     hardcoding filenames.
 
 AUTHOR: Website maintenance scripts
-LAST MODIFIED: 2026-01-16
+LAST MODIFIED: 2026-10-17
 ================================================================================
 """
 from pathlib import Path
 import sys
 import json
 import re
+from image_placeholders import Placeholders
 
 DEFAULT_SRC = Path("src/resources/images/overview")
 DEFAULT_OUT = DEFAULT_SRC / "overview_manifest.json"
 
 IMAGE_EXTS = {".jpg", ".jpeg", ".png", ".gif", ".webp", ".svg", ".bmp"}
+DETAILS_NAME = "overview_details.json"  # Written next to the manifest
+DETAILS_VERSION = 1  # Bump only for added fields (see COMPATIBILITY)
+
+
+def write_manifest(out, images):
+    """Write 'images' (dicts with "name" and the details of each image) as the plain
+    filename array 'out' and the details file next to it. 'out' stays readable by
+    every reader of the original manifest; the details file by every reader of
+    details version 1 or later (see COMPATIBILITY)."""
+    details = {
+        "version": DETAILS_VERSION,
+        "images": {entry["name"]: {k: v for k, v in entry.items() if k != "name"} for entry in images},
+    }
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps([entry["name"] for entry in images], indent=2, ensure_ascii=False))
+    out.with_name(DETAILS_NAME).write_text(json.dumps(details, indent=2, ensure_ascii=False))
 
 
-def main():
-    src = Path(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SRC
-    out = Path(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_OUT
+def main(argv=None):
+    """Write the manifest; returns the process exit status."""
+    argv = sys.argv[1:] if argv is None else argv
+    src = Path(argv[0]) if len(argv) > 0 else DEFAULT_SRC
+    out = Path(argv[1]) if len(argv) > 1 else DEFAULT_OUT
 
     if not src.exists() or not src.is_dir():
         print(f"Source directory not found: {src}", file=sys.stderr)
-        sys.exit(2)
+        return 2
 
     files = [p.name for p in src.iterdir() if p.is_file() and p.suffix.lower() in IMAGE_EXTS]
 
@@ -113,10 +166,18 @@ def main():
 
     files.sort(key=alphanum_key)
 
-    out.parent.mkdir(parents=True, exist_ok=True)
-    out.write_text(json.dumps(files, indent=2, ensure_ascii=False))
-    print(f"Wrote {len(files)} entries to {out}")
+    placeholders = Placeholders()
+    images = []
+    for name in files:
+        entry = {"name": name, "bytes": (src / name).stat().st_size}
+        entry.update(placeholders.get(src / name) or {})
+        images.append(entry)
+    placeholders.save()
+
+    write_manifest(out, images)
+    print(f"Wrote {len(files)} entries to {out} ({placeholders.computed} placeholder(s) computed)")
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,169 @@
+"""
+================================================================================
+IMAGE PLACEHOLDERS (used by the manifest generators)
+================================================================================
+
+PURPOSE:
+    Give the website something to paint before a full image arrives. For
+    every image listed in a manifest this computes its display size and a
+    tiny blurred stand-in (a 16 px wide JPEG, inlined as a base64 data URI
+    of a few hundred bytes) and its dominant colour, so script.js can
+    reserve the layout and show the placeholder while the real file
+    downloads.
+
+WHAT IT DOES:
+    1. Reads the image size (after EXIF orientation, as the browser shows it)
+    2. Scales the image down to PLACEHOLDER_WIDTH pixels wide, flattening
+       transparency onto white
+    3. Encodes it as a small JPEG and returns it as a data: URI
+    4. Picks the dominant colour of the scaled-down pixels: the most
+       populated bucket of a coarse colour histogram, averaged
+    5. Caches the result by content hash (scripts/.media_cache/placeholders.json),
+       so unchanged images cost a single stat() on the next run
+
+USAGE:
+    from image_placeholders import Placeholders
+
+    placeholders = Placeholders(repo_root)
+    entry = placeholders.get(img_path)
+    # {'width': 2000, 'height': 1500, 'color': '#4a5b3c',
+    #  'placeholder': 'data:image/jpeg;base64,...'}
+    # or None for files that can't be decoded (e.g. SVG)
+    placeholders.save()
+
+DEPENDENCIES:
+    - Pillow (optional: pip install Pillow)
+    - Without Pillow, ffmpeg (must be in PATH) scales and encodes the
+      placeholder and media_probe reads the size (in-process for JPG/PNG)
+
+AUTHOR: Website maintenance scripts
+LAST MODIFIED: 2026-10-17
+================================================================================
+"""
+
+import io
+import base64
+import subprocess
+from pathlib import Path
+from media_cache import MediaCache, VERDICT_OPTIMIZED
+from media_probe import probe_image
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = None
+
+# --- CONFIG ---
+PLACEHOLDER_WIDTH = 16      # Pixels; the height follows the aspect ratio
+PLACEHOLDER_QUALITY = 60    # Pillow JPEG quality (ffmpeg fallback: -q:v 8)
+PLACEHOLDER_EXTS = {'.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp'}
+COLOR_BUCKET_BITS = 3       # Histogram buckets per channel: 2**3 = 8
+
+def placeholder_height(width, height):
+    return max(1, round(PLACEHOLDER_WIDTH * height / width))
+
+def dominant_color(rgb):
+    """'#rrggbb' of the most common colour in packed RGB bytes (mean of its histogram bucket)."""
+    shift = 8 - COLOR_BUCKET_BITS
+    buckets = {}
+    for i in range(0, len(rgb) - 2, 3):
+        pixel = rgb[i:i + 3]
+        key = (pixel[0] >> shift, pixel[1] >> shift, pixel[2] >> shift)
+        buckets.setdefault(key, []).append(pixel)
+
+    pixels = max(buckets.values(), key=len)
+    mean = [round(sum(p[c] for p in pixels) / len(pixels)) for c in range(3)]
+    return '#{:02x}{:02x}{:02x}'.format(*mean)
+
+def pillow_placeholder(img_path):
+    """(width, height, JPEG bytes, dominant colour) using Pillow."""
+    with Image.open(img_path) as img:
+        img = ImageOps.exif_transpose(img)
+        width, height = img.size
+        small = img.convert('RGBA')
+        small.thumbnail((PLACEHOLDER_WIDTH, placeholder_height(width, height)), Image.Resampling.LANCZOS)
+
+    flat = Image.new('RGB', small.size, (255, 255, 255))
+    flat.paste(small, mask=small.getchannel('A'))
+    buffer = io.BytesIO()
+    flat.save(buffer, 'JPEG', quality=PLACEHOLDER_QUALITY, optimize=True)
+    return width, height, buffer.getvalue(), dominant_color(flat.tobytes())
+
+def ffmpeg_scaled(img_path, size, output_args):
+    """Stdout of ffmpeg scaling the first frame to size, or None."""
+    cmd = [
+        'ffmpeg', '-v', 'error',
+        '-i', str(img_path),
+        '-frames:v', '1',
+        '-vf', f'scale={size[0]}:{size[1]}:flags=lanczos',
+        *output_args, '-',
+    ]
+    result = subprocess.run(cmd, capture_output=True)
+    if result.returncode != 0 or not result.stdout:
+        return None
+    return result.stdout
+
+def ffmpeg_placeholder(img_path):
+    """(width, height, JPEG bytes, dominant colour) using media_probe/ffmpeg, or None."""
+    info = probe_image(img_path)
+    if not info or not info.get('width') or not info.get('height'):
+        return None
+    width, height = info['width'], info['height']
+    size = (PLACEHOLDER_WIDTH, placeholder_height(width, height))
+
+    jpeg = ffmpeg_scaled(img_path, size, ['-q:v', '8', '-f', 'image2pipe', '-c:v', 'mjpeg'])
+    rgb = ffmpeg_scaled(img_path, size, ['-f', 'rawvideo', '-pix_fmt', 'rgb24'])
+    if jpeg is None or rgb is None:
+        return None
+    return width, height, jpeg, dominant_color(rgb)
+
+class Placeholders:
+    """Size and inline placeholder per image, cached by content hash."""
+
+    def __init__(self, root=None, use_cache=True):
+        self.root = Path(root) if root else Path(__file__).parent.parent
+        self.cache = MediaCache('placeholders', self.settings(), self.root) if use_cache else None
+        self.computed = 0
+
+    def settings(self):
+        """Settings that change the placeholders (the cache is discarded when they do)."""
+        return {
+            'engine': 'pillow' if Image is not None else 'ffmpeg',
+            'width': PLACEHOLDER_WIDTH,
+            'quality': PLACEHOLDER_QUALITY,
+            'color_bucket_bits': COLOR_BUCKET_BITS,
+        }
+
+    def get(self, img_path):
+        """Return {'width', 'height', 'color', 'placeholder'} for an image, or None if it can't be read."""
+        img_path = Path(img_path)
+        if img_path.suffix.lower() not in PLACEHOLDER_EXTS:
+            return None
+
+        entry = self.cache.lookup(img_path) if self.cache is not None else None
+        if entry is not None:
+            return entry['info']
+
+        try:
+            result = pillow_placeholder(img_path) if Image is not None else ffmpeg_placeholder(img_path)
+        except Exception:
+            result = None
+
+        info = None
+        if result is not None:
+            width, height, jpeg, color = result
+            info = {
+                'width': width,
+                'height': height,
+                'color': color,
+                'placeholder': 'data:image/jpeg;base64,' + base64.b64encode(jpeg).decode('ascii'),
+            }
+        self.computed += 1
+
+        if self.cache is not None:
+            self.cache.record(img_path, info, VERDICT_OPTIMIZED)
+        return info
+
+    def save(self):
+        if self.cache is not None:
+            self.cache.save()
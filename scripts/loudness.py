@@ -0,0 +1,180 @@
+"""
+================================================================================
+LOUDNESS NORMALIZATION (used by compress_all_audio_files.py)
+================================================================================
+
+PURPOSE:
+    Bring every poem track to the same perceived loudness (EBU R128), so
+    the volume doesn't jump from page to page. Uses ffmpeg's loudnorm
+    filter in its accurate two-pass form.
+
+HOW IT WORKS:
+    - Pass 1 (analysis): loudnorm with print_format=json measures the
+      track's integrated loudness (I), true peak (TP), loudness range
+      (LRA) and threshold. This decodes the whole file, so the result is
+      cached (media cache section "loudness"), keyed by the SHA-256 of the
+      content: a renamed or re-checked-out track is never analysed twice.
+      Within a run every measurement is also kept in memory (keyed by path,
+      size and mtime), with or without the media cache
+    - Pass 2 (encode): the caller adds the filter from second_pass(path) to
+      its own encode;
+      it feeds the measured values back to loudnorm in linear mode, which
+      applies one constant gain instead of dynamic compression
+    - needs_normalizing() tells whether a track is off target by more than
+      TOLERANCE_LU (or peaks above the true-peak limit), so tracks that are
+      already normalized are left alone
+
+USAGE:
+    from loudness import Loudness
+
+    loudness = Loudness(target_i=-16, max_duration=60, root=repo_root)
+    if loudness.needs_normalizing(path):
+        loudnorm, sample_rate = loudness.second_pass(path)
+        # ... encode with -af loudnorm,afade=... -ar sample_rate
+    loudness.save()
+
+NOTES:
+    - Only the first max_duration seconds are measured, the part the
+      encode keeps
+    - loudnorm resamples to 192 kHz internally; second_pass() also returns
+      the source rate so the caller can resample back
+    - Worker processes collect cache changes and totals with
+      take_updates(); the parent applies them with merge()
+
+AUTHOR: Website maintenance scripts
+LAST MODIFIED: 2026-10-17
+================================================================================
+"""
+
+import re
+import json
+import subprocess
+from pathlib import Path
+from media_cache import MediaCache, VERDICT_OPTIMIZED, hash_file
+
+TARGET_I = -16.0           # Integrated loudness in LUFS (common for web/podcast audio)
+TARGET_TP = -1.5           # True-peak ceiling in dBTP
+TARGET_LRA = 11.0          # Loudness range in LU
+TOLERANCE_LU = 1.0         # Tracks this close to TARGET_I are not re-encoded
+DEFAULT_SAMPLE_RATE = 44100
+
+SAMPLE_RATE_PATTERN = re.compile(r'Audio: .*?, (\d+) Hz')
+
+def measure_loudness(audio_path, target_i, max_duration=0):
+    """Run loudnorm's analysis pass. Returns {'input_i', 'input_tp', 'input_lra',
+    'input_thresh', 'target_offset', 'sample_rate'} or None (error, or silence)."""
+    cmd = ['ffmpeg', '-hide_banner', '-nostats', '-i', str(audio_path)]
+    if max_duration > 0:
+        cmd.extend(['-t', str(max_duration)])
+    cmd.extend([
+        '-map', '0:a:0',
+        '-af', f'loudnorm=I={target_i}:TP={TARGET_TP}:LRA={TARGET_LRA}:print_format=json',
+        '-f', 'null', '-',
+    ])
+    result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, errors='replace')
+    start = result.stderr.rfind('{')
+    if result.returncode != 0 or start < 0:
+        return None
+
+    try:
+        data = json.loads(result.stderr[start:result.stderr.index('}', start) + 1])
+        measured = {key: float(data[key]) for key in
+                    ('input_i', 'input_tp', 'input_lra', 'input_thresh', 'target_offset')}
+    except (ValueError, KeyError):
+        return None
+    if any(value in (float('inf'), float('-inf')) for value in measured.values()):
+        return None  # Silent track: nothing to normalize
+
+    rate = SAMPLE_RATE_PATTERN.search(result.stderr)
+    measured['sample_rate'] = int(rate.group(1)) if rate else DEFAULT_SAMPLE_RATE
+    return measured
+
+class Loudness:
+    """Cached loudnorm measurements and the matching second-pass filter."""
+
+    def __init__(self, target_i=TARGET_I, max_duration=0, root=None, use_cache=True):
+        self.target_i = target_i
+        self.max_duration = max_duration
+        self.cache = MediaCache('loudness', self.settings(), root) if use_cache else None
+        self.totals = {'measured': 0}  # Analysis passes actually run
+        self._measured = {}  # (path, size, mtime_ns) -> measurement, for this run
+
+    def settings(self):
+        """Settings that change the measurements and results (also part of the audio cache settings)."""
+        return {
+            'target_i': self.target_i,
+            'target_tp': TARGET_TP,
+            'target_lra': TARGET_LRA,
+            'tolerance_lu': TOLERANCE_LU,
+            'max_duration': self.max_duration,
+        }
+
+    def describe(self):
+        return f"EBU R128, I {self.target_i:g} LUFS, TP {TARGET_TP:g} dBTP, LRA {TARGET_LRA:g} LU (two-pass)"
+
+    def measure(self, audio_path):
+        """Measurement of the file as it is now; kept in memory for the run and
+        cached on disk by content hash."""
+        stat = Path(audio_path).stat()
+        key = (str(Path(audio_path).resolve()), stat.st_size, stat.st_mtime_ns)
+        if key not in self._measured:
+            self._measured[key] = self._lookup_or_measure(audio_path)
+        return self._measured[key]
+
+    def _lookup_or_measure(self, audio_path):
+        if self.cache is not None:
+            entry = self.cache.lookup(audio_path)
+            if entry is not None:
+                return entry['info']
+
+            # Same content under another path (renamed, copied) counts as a hit too
+            sha256 = hash_file(audio_path)
+            for known in self.cache.entries.values():
+                if known.get('sha256') == sha256:
+                    self.cache.record(audio_path, known['info'], VERDICT_OPTIMIZED)
+                    return known['info']
+
+        measured = measure_loudness(audio_path, self.target_i, self.max_duration)
+        self.totals['measured'] += 1
+        if self.cache is not None:
+            self.cache.record(audio_path, measured, VERDICT_OPTIMIZED)
+        return measured
+
+    def needs_normalizing(self, audio_path):
+        measured = self.measure(audio_path)
+        if measured is None:
+            return False
+        return (abs(measured['input_i'] - self.target_i) > TOLERANCE_LU
+                or measured['input_tp'] > TARGET_TP + TOLERANCE_LU)
+
+    def second_pass(self, audio_path):
+        """(loudnorm filter, source sample rate) for the file's encode, from one
+        measurement; (None, None) if it couldn't be measured."""
+        measured = self.measure(audio_path)
+        if measured is None:
+            return None, None
+        loudnorm = (f"loudnorm=I={self.target_i}:TP={TARGET_TP}:LRA={TARGET_LRA}"
+                    f":measured_I={measured['input_i']}:measured_TP={measured['input_tp']}"
+                    f":measured_LRA={measured['input_lra']}:measured_thresh={measured['input_thresh']}"
+                    f":offset={measured['target_offset']}:linear=true")
+        return loudnorm, measured['sample_rate']
+
+    def take_updates(self):
+        """Return and clear cache changes and totals (for worker processes)."""
+        updates = {
+            'cache': self.cache.take_updates() if self.cache is not None else {},
+            'totals': self.totals,
+        }
+        self.totals = {'measured': 0}
+        return updates
+
+    def merge(self, updates):
+        """Apply changes collected in another process."""
+        if self.cache is not None:
+            self.cache.merge(updates['cache'])
+        for key, value in updates['totals'].items():
+            self.totals[key] += value
+
+    def save(self):
+        if self.cache is not None:
+            self.cache.save()
@@ -0,0 +1,177 @@
+"""
+================================================================================
+MEDIA CACHE (shared by the compression scripts)
+================================================================================
+
+PURPOSE:
+    Remember what the compression scripts already decided about each media
+    file, so unchanged files cost a single stat() on the next run instead of
+    an ffprobe call plus the needs_compression() heuristics.
+
+HOW IT WORKS:
+    - One JSON file per section under scripts/.media_cache/ ("images.json",
+      "audio.json", "video.json", ...), so scripts running in parallel never
+      write the same file
+    - Entries are keyed by the path relative to the repository root and
+      store size, mtime and a SHA-256 of the content, the probe result and
+      the verdict ("optimized" or "no_improvement")
+    - A lookup is a hit when size and mtime match. If only the mtime changed
+      (e.g. after a git checkout) the content hash decides, and the entry is
+      refreshed with the new mtime
+    - Each section stores the settings it was built with. Changing a setting
+      (e.g. TARGET_QUALITY_JPG) discards that section's verdicts
+
+USAGE:
+    from media_cache import MediaCache
+
+    cache = MediaCache('images', settings={'q': 10}, root=repo_root)
+    entry = cache.lookup(path)          # None on a miss
+    cache.record(path, info, 'optimized')
+    cache.save()
+
+NOTES:
+    - The cache directory is local build state and is ignored by git
+    - Delete it (or pass --no-cache to a script) to force a full run
+    - Worker processes collect their changes with take_updates(); the
+      parent applies them with merge() and is the only one that saves
+
+AUTHOR: Website maintenance scripts
+LAST MODIFIED: 2026-10-17
+================================================================================
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+CACHE_DIR = Path(__file__).parent / '.media_cache'
+CACHE_VERSION = 1
+
+VERDICT_OPTIMIZED = 'optimized'
+VERDICT_NO_IMPROVEMENT = 'no_improvement'
+
+def hash_file(path, chunk_size=1024 * 1024):
+    """Return the SHA-256 hex digest of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class MediaCache:
+    """Per-file probe results and verdicts for one section of the cache."""
+
+    def __init__(self, section, settings=None, root=None, cache_dir=CACHE_DIR):
+        self.section = section
+        self.settings = settings or {}
+        self.root = Path(root) if root else Path(__file__).parent.parent
+        self.cache_file = Path(cache_dir) / f'{section}.json'
+        self.entries = {}
+        self.updates = {}
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+
+        # Verdicts made with other settings are no longer valid
+        if data.get('version') == CACHE_VERSION and data.get('settings') == self.settings:
+            self.entries = data.get('entries', {})
+
+    def key(self, path):
+        """Cache key for a path: repository-relative, forward slashes."""
+        path = Path(path)
+        try:
+            return path.resolve().relative_to(self.root.resolve()).as_posix()
+        except ValueError:
+            return path.resolve().as_posix()
+
+    def lookup(self, path):
+        """Return the cached entry for an unchanged file, or None."""
+        key = self.key(path)
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+
+        try:
+            stat = Path(path).stat()
+        except OSError:
+            return None
+
+        if stat.st_size != entry.get('size'):
+            return None
+
+        if stat.st_mtime_ns == entry.get('mtime_ns'):
+            return entry
+
+        # Same size but touched (checkout, copy): fall back to the content hash
+        if entry.get('sha256') and hash_file(path) == entry['sha256']:
+            entry = dict(entry, mtime_ns=stat.st_mtime_ns)
+            self.entries[key] = entry
+            self.updates[key] = entry
+            return entry
+
+        return None
+
+    def record(self, path, info, verdict):
+        """Store the probe result and verdict for the file as it is now on disk."""
+        stat = Path(path).stat()
+        entry = {
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'sha256': hash_file(path),
+            'info': info,
+            'verdict': verdict,
+        }
+        key = self.key(path)
+        self.entries[key] = entry
+        self.updates[key] = entry
+
+    def forget(self, path):
+        """Drop a file's entry (e.g. after it was deleted or renamed)."""
+        key = self.key(path)
+        self.entries.pop(key, None)
+        self.updates[key] = None
+
+    def take_updates(self):
+        """Return and clear the changes made since the last call (for worker processes)."""
+        updates, self.updates = self.updates, {}
+        return updates
+
+    def merge(self, updates):
+        """Apply changes collected in another process."""
+        for key, entry in updates.items():
+            if entry is None:
+                self.entries.pop(key, None)
+            else:
+                self.entries[key] = entry
+            self.updates[key] = entry
+
+    def save(self):
+        """Write this section's cache file if anything changed."""
+        if not self.updates:
+            return
+
+        data = {
+            'version': CACHE_VERSION,
+            'settings': self.settings,
+            'entries': dict(sorted(self.entries.items())),
+        }
+
+        # Write to a temp file next to the cache, then swap it in atomically
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self.cache_file.parent, prefix=f'.{self.section}.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=1)
+            os.replace(tmp_name, self.cache_file)
+        except Exception:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+        self.updates = {}
@@ -0,0 +1,600 @@
+"""
+================================================================================
+MEDIA PROBE (shared by the compression scripts)
+================================================================================
+
+PURPOSE:
+    Gather the metadata the compression scripts need (image size and pixel
+    format, audio bitrate/duration/codec, video properties) for many files
+    with as few process launches as possible.
+
+HOW IT WORKS:
+    - Formats with simple headers are read directly in Python (no process):
+        * JPEG: SOF marker (size, components, chroma subsampling)
+        * PNG: IHDR chunk (size, bit depth, colour type)
+        * MP3: ID3v2 skip, first MPEG audio frame, Xing/Info/VBRI header
+          (LAME delay/padding subtracted), ID3v2 TXXX frames (read_id3_txxx)
+        * Ogg Opus/Vorbis: comment header (read_vorbis_comments)
+    - Anything the readers can't handle falls back to ffprobe, exactly as
+      the scripts used to do. probe_many() runs those fallbacks in a small
+      thread pool instead of one after another
+    - Every function returns the same dict shapes the needs_compression()
+      functions expect:
+        image: {'width', 'height', 'pix_fmt'}
+        audio: {'bitrate', 'duration', 'codec', 'sample_rate'}
+        video: {'width', 'height', 'codec', 'pix_fmt', 'fps',
+                'duration', 'size', 'bitrate'}
+      or None when nothing could be read
+
+USAGE:
+    from media_probe import probe_audio, probe_many
+
+    info = probe_audio(path)                     # one file
+    infos = probe_many(paths, 'audio')           # {path: info}
+
+    tests/test_media_probe.py compares the image readers against ffprobe
+    on the site's own JPG/PNG files (skipped when ffprobe isn't installed).
+
+DEPENDENCIES:
+    - Python 3.6+
+    - ffprobe (only for files the in-process readers can't parse)
+
+AUTHOR: Website maintenance scripts
+LAST MODIFIED: 2026-10-17
+================================================================================
+"""
+
+import json
+import struct
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# ----------------------------- CONFIG -----------------------------
+PROBE_JOBS = 4               # Concurrent ffprobe processes for fallbacks
+FFPROBE_TIMEOUT = 10         # Seconds per ffprobe call
+MP3_SYNC_SEARCH_BYTES = 64 * 1024  # How far past the ID3 tag to look for the first frame
+OGG_HEADER_SEARCH_BYTES = 64 * 1024  # How far into an Ogg file to look for the comment header
+# ------------------------------------------------------------------
+
+# ============================== FFPROBE ===============================
+
+def run_ffprobe(path, entries, stream):
+    """Run ffprobe on one file and return its parsed JSON output, or None."""
+    cmd = ['ffprobe', '-v', 'error', '-select_streams', stream]
+    for entry in entries:
+        cmd.extend(['-show_entries', entry])
+    cmd.extend(['-of', 'json', str(path)])
+
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=FFPROBE_TIMEOUT)
+        if result.returncode == 0:
+            return json.loads(result.stdout)
+    except Exception:
+        pass
+
+    return None
+
+def ffprobe_image_info(img_path):
+    """Get image dimensions and format using ffprobe."""
+    data = run_ffprobe(img_path, ['stream=width,height,pix_fmt'], 'v:0')
+    if data and 'streams' in data and len(data['streams']) > 0:
+        stream = data['streams'][0]
+        return {
+            'width': stream.get('width', 0),
+            'height': stream.get('height', 0),
+            'pix_fmt': stream.get('pix_fmt', '')
+        }
+    return None
+
+def ffprobe_audio_info(audio_path):
+    """Get audio bitrate, duration, and format using ffprobe."""
+    data = run_ffprobe(audio_path, ['stream=bit_rate,duration,codec_name,sample_rate', 'format=duration,bit_rate'], 'a:0')
+    if data is None:
+        return None
+
+    try:
+        # Try to get bitrate from stream first, then format
+        bitrate = None
+        duration = None
+        codec = None
+        sample_rate = None
+
+        if 'streams' in data and len(data['streams']) > 0:
+            stream = data['streams'][0]
+            bitrate = stream.get('bit_rate')
+            duration = stream.get('duration')
+            codec = stream.get('codec_name')
+            sample_rate = stream.get('sample_rate')
+
+        if 'format' in data:
+            if bitrate is None:
+                bitrate = data['format'].get('bit_rate')
+            if duration is None:
+                duration = data['format'].get('duration')
+
+        return {
+            'bitrate': int(bitrate) if bitrate else None,
+            'duration': float(duration) if duration else None,
+            'codec': codec,
+            'sample_rate': int(sample_rate) if sample_rate else None
+        }
+    except (TypeError, ValueError):
+        return None
+
+def ffprobe_video_info(video_path):
+    """Get video properties using ffprobe."""
+    data = run_ffprobe(video_path, ['stream=width,height,codec_name,bit_rate,r_frame_rate,pix_fmt',
+                                    'format=duration,size,bit_rate'], 'v:0')
+    if data is None:
+        return None
+
+    try:
+        info = {}
+
+        if 'streams' in data and len(data['streams']) > 0:
+            stream = data['streams'][0]
+            info['width'] = stream.get('width', 0)
+            info['height'] = stream.get('height', 0)
+            info['codec'] = stream.get('codec_name', '')
+            info['pix_fmt'] = stream.get('pix_fmt', '')
+
+            # Parse framerate
+            fps_str = stream.get('r_frame_rate', '0/1')
+            try:
+                num, denom = fps_str.split('/')
+                info['fps'] = float(num) / float(denom) if float(denom) > 0 else 0
+            except (ValueError, ZeroDivisionError):
+                info['fps'] = 0
+
+        if 'format' in data:
+            info['duration'] = float(data['format'].get('duration', 0))
+            info['size'] = int(data['format'].get('size', 0))
+            info['bitrate'] = int(data['format'].get('bit_rate', 0))
+
+        return info
+    except (TypeError, ValueError) as e:
+        print(f"Error getting video info: {e}")
+        return None
+
+# ============================== JPEG / PNG ===============================
+
+# SOF markers (baseline, extended, progressive; Huffman and arithmetic)
+_JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCD, 0xCE, 0xCF}
+
+# Luma-to-chroma sampling ratio (h, v) -> ffmpeg pix_fmt
+_JPEG_SUBSAMPLING = {
+    (1, 1): 'yuvj444p',
+    (2, 1): 'yuvj422p',
+    (2, 2): 'yuvj420p',
+    (1, 2): 'yuvj440p',
+    (4, 1): 'yuvj411p',
+}
+
+# PNG (colour type, bit depth) -> ffmpeg pix_fmt
+_PNG_PIX_FMTS = {
+    (0, 1): 'monob',
+    (0, 8): 'gray',
+    (0, 16): 'gray16be',
+    (2, 8): 'rgb24',
+    (2, 16): 'rgb48be',
+    (3, 1): 'pal8',
+    (3, 2): 'pal8',
+    (3, 4): 'pal8',
+    (3, 8): 'pal8',
+    (4, 8): 'ya8',
+    (4, 16): 'ya16be',
+    (6, 8): 'rgba',
+    (6, 16): 'rgba64be',
+}
+
+_PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+def read_jpeg_header(img_path):
+    """Read width, height and pix_fmt from a JPEG's SOF marker."""
+    adobe_transform = None
+
+    with open(img_path, 'rb') as f:
+        if f.read(2) != b'\xff\xd8':
+            return None
+
+        while True:
+            byte = f.read(1)
+            if not byte:
+                return None
+            if byte != b'\xff':
+                continue
+
+            # Skip fill bytes
+            marker = f.read(1)
+            while marker == b'\xff':
+                marker = f.read(1)
+            if not marker:
+                return None
+            marker = marker[0]
+
+            # Standalone markers carry no length
+            if marker in (0x01, 0x00) or 0xD0 <= marker <= 0xD7:
+                continue
+            if marker in (0xD9, 0xDA):
+                return None  # End of image / start of scan before any SOF
+
+            length_bytes = f.read(2)
+            if len(length_bytes) < 2:
+                return None
+            length = struct.unpack('>H', length_bytes)[0]
+            segment = f.read(length - 2)
+            if len(segment) < length - 2:
+                return None
+
+            if marker == 0xEE and segment[:5] == b'Adobe' and len(segment) >= 12:
+                adobe_transform = segment[11]
+                continue
+
+            if marker not in _JPEG_SOF_MARKERS:
+                continue
+
+            precision = segment[0]
+            height, width = struct.unpack('>HH', segment[1:5])
+            components = segment[5]
+            sampling = [(segment[7 + 3 * i] >> 4, segment[7 + 3 * i] & 0x0F) for i in range(components)]
+
+            # 12-bit, CMYK, RGB-coded (Adobe transform 0) or unusual layouts: let ffprobe decide
+            if precision != 8 or width == 0 or height == 0:
+                return None
+            if components == 1:
+                pix_fmt = 'gray'
+            elif components == 3 and adobe_transform != 0 and sampling[1] == sampling[2]:
+                # Only the ratio matters: 1x2 luma with 1x2 chroma is still 4:4:4
+                (luma_h, luma_v), (chroma_h, chroma_v) = sampling[0], sampling[1]
+                if chroma_h and chroma_v and luma_h % chroma_h == 0 and luma_v % chroma_v == 0:
+                    pix_fmt = _JPEG_SUBSAMPLING.get((luma_h // chroma_h, luma_v // chroma_v))
+                else:
+                    pix_fmt = None
+            else:
+                pix_fmt = None
+
+            if pix_fmt is None:
+                return None
+
+            return {'width': width, 'height': height, 'pix_fmt': pix_fmt}
+
+def read_png_header(img_path):
+    """Read width, height and pix_fmt from a PNG's IHDR chunk."""
+    with open(img_path, 'rb') as f:
+        data = f.read(26)
+
+    if len(data) < 26 or data[:8] != _PNG_SIGNATURE or data[12:16] != b'IHDR':
+        return None
+
+    width, height, bit_depth, color_type = struct.unpack('>IIBB', data[16:26])
+    pix_fmt = _PNG_PIX_FMTS.get((color_type, bit_depth))
+    if pix_fmt is None or width == 0 or height == 0:
+        return None
+
+    return {'width': width, 'height': height, 'pix_fmt': pix_fmt}
+
+def read_image_header(img_path):
+    """Read image size and pixel format from JPEG/PNG headers without spawning ffprobe."""
+    suffix = Path(img_path).suffix.lower()
+    try:
+        if suffix in ('.jpg', '.jpeg'):
+            return read_jpeg_header(img_path)
+        if suffix == '.png':
+            return read_png_header(img_path)
+    except (OSError, struct.error, IndexError):
+        pass
+    return None
+
+# ============================== MP3 ===============================
+
+# Layer III bitrates in kbps, indexed by the 4-bit bitrate field
+_MP3_BITRATES_V1 = [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 0]
+_MP3_BITRATES_V2 = [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160, 0]
+
+# Sample rates indexed by the 2-bit version field (0 = MPEG 2.5, 2 = MPEG 2, 3 = MPEG 1)
+_MP3_SAMPLE_RATES = {
+    0: [11025, 12000, 8000],
+    2: [22050, 24000, 16000],
+    3: [44100, 48000, 32000],
+}
+
+def _parse_mp3_frame_header(header):
+    """Decode a 4-byte MPEG Layer III frame header, or return None."""
+    if len(header) < 4 or header[0] != 0xFF or (header[1] & 0xE0) != 0xE0:
+        return None
+
+    version = (header[1] >> 3) & 0x03
+    layer = (header[1] >> 1) & 0x03
+    bitrate_index = (header[2] >> 4) & 0x0F
+    rate_index = (header[2] >> 2) & 0x03
+    padding = (header[2] >> 1) & 0x01
+    channel_mode = (header[3] >> 6) & 0x03
+
+    # Layer III only (layer bits 01), no reserved version/rate, no free format
+    if version == 1 or layer != 1 or rate_index == 3 or bitrate_index in (0, 15):
+        return None
+
+    is_v1 = version == 3
+    bitrate = (_MP3_BITRATES_V1 if is_v1 else _MP3_BITRATES_V2)[bitrate_index] * 1000
+    sample_rate = _MP3_SAMPLE_RATES[version][rate_index]
+    samples_per_frame = 1152 if is_v1 else 576
+    frame_length = (144 if is_v1 else 72) * bitrate // sample_rate + padding
+
+    return {
+        'is_v1': is_v1,
+        'bitrate': bitrate,
+        'sample_rate': sample_rate,
+        'samples_per_frame': samples_per_frame,
+        'frame_length': frame_length,
+        'mono': channel_mode == 3,
+    }
+
+def _id3v2_size(data):
+    """Size of a leading ID3v2 tag (header included), or 0."""
+    if len(data) < 10 or data[:3] != b'ID3':
+        return 0
+    size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+    footer = 10 if data[5] & 0x10 else 0
+    return 10 + size + footer
+
+def _syncsafe(data):
+    return (data[0] << 21) | (data[1] << 14) | (data[2] << 7) | data[3]
+
+def _decode_id3_text(encoding, data):
+    """Decode an ID3 text field ($00 Latin-1, $01 UTF-16 with BOM, $02 UTF-16BE, $03 UTF-8)."""
+    codec = {0: 'latin-1', 1: 'utf-16', 2: 'utf-16-be', 3: 'utf-8'}.get(encoding)
+    if codec is None:
+        return None
+    return data.decode(codec, errors='replace')
+
+def read_id3_txxx(audio_path):
+    """User-defined text frames (TXXX) of a file's ID3v2.3/2.4 tag as {description: value},
+    read from the tag alone (no decoding). Empty if there is no readable tag."""
+    try:
+        with open(audio_path, 'rb') as f:
+            head = f.read(10)
+            tag_size = _id3v2_size(head)
+            if not tag_size or head[3] not in (3, 4):
+                return {}
+            data = f.read(tag_size - 10)
+    except OSError:
+        return {}
+
+    version, flags = head[3], head[5]
+    offset = 0
+    if flags & 0x40:  # Extended header
+        if len(data) < 4:
+            return {}
+        offset = _syncsafe(data) if version == 4 else 4 + struct.unpack('>I', data[:4])[0]
+
+    frames = {}
+    while offset + 10 <= len(data) and data[offset:offset + 1] != b'\x00':
+        frame_id = data[offset:offset + 4]
+        size_bytes = data[offset + 4:offset + 8]
+        size = _syncsafe(size_bytes) if version == 4 else struct.unpack('>I', size_bytes)[0]
+        body = data[offset + 10:offset + 10 + size]
+        offset += 10 + size
+        if frame_id != b'TXXX' or len(body) < 2:
+            continue
+
+        # Encoding byte, then "description\0value" (a two-byte terminator for UTF-16)
+        encoding = body[0]
+        separator = b'\x00\x00' if encoding in (1, 2) else b'\x00'
+        split = body.find(separator, 1)
+        while encoding in (1, 2) and split > 0 and (split - 1) % 2:
+            split = body.find(separator, split + 1)  # Keep UTF-16 code units aligned
+        if split < 0:
+            continue
+        description = _decode_id3_text(encoding, body[1:split])
+        value = _decode_id3_text(encoding, body[split + len(separator):])
+        if description is not None and value is not None:
+            frames[description] = value.rstrip('\x00')
+    return frames
+
+def read_vorbis_comments(audio_path):
+    """Comments of an Ogg Opus/Vorbis file (the OpusTags or Vorbis comment header) as
+    {lowercased key: value}, read from the headers alone (no decoding). Empty if none."""
+    try:
+        with open(audio_path, 'rb') as f:
+            data = f.read(OGG_HEADER_SEARCH_BYTES)
+    except OSError:
+        return {}
+    if data[:4] != b'OggS':
+        return {}
+
+    offset = -1
+    for magic in (b'OpusTags', b'\x03vorbis'):
+        found = data.find(magic)
+        if found >= 0:
+            offset = found + len(magic)
+            break
+    if offset < 0:
+        return {}
+
+    def read_string(offset):
+        if offset + 4 > len(data):
+            return None, offset
+        length = struct.unpack('<I', data[offset:offset + 4])[0]
+        end = offset + 4 + length
+        if end > len(data):
+            return None, offset
+        return data[offset + 4:end].decode('utf-8', errors='replace'), end
+
+    vendor, offset = read_string(offset)
+    if vendor is None or offset + 4 > len(data):
+        return {}
+    count = struct.unpack('<I', data[offset:offset + 4])[0]
+    offset += 4
+
+    comments = {}
+    for _ in range(count):
+        comment, offset = read_string(offset)
+        if comment is None:
+            break  # Header continues on a later page: keep what was read
+        key, sep, value = comment.partition('=')
+        if sep:
+            comments[key.lower()] = value
+    return comments
+
+def read_mp3_info(audio_path):
+    """Read bitrate and duration from MP3 frame headers without spawning ffprobe."""
+    path = Path(audio_path)
+    if path.suffix.lower() != '.mp3':
+        return None
+
+    try:
+        file_size = path.stat().st_size
+        with open(path, 'rb') as f:
+            head = f.read(10)
+            audio_start = _id3v2_size(head)
+            f.seek(audio_start)
+            data = f.read(MP3_SYNC_SEARCH_BYTES)
+
+            # ID3v1 tag at the very end doesn't count as audio
+            audio_end = file_size
+            if file_size >= 128:
+                f.seek(file_size - 128)
+                if f.read(3) == b'TAG':
+                    audio_end -= 128
+    except OSError:
+        return None
+
+    # Find the first frame whose successor also starts with a valid header
+    offset = 0
+    frame = None
+    while offset + 4 <= len(data):
+        offset = data.find(b'\xff', offset)
+        if offset < 0 or offset + 4 > len(data):
+            return None
+        candidate = _parse_mp3_frame_header(data[offset:offset + 4])
+        if candidate:
+            next_offset = offset + candidate['frame_length']
+            if next_offset + 4 > len(data) or _parse_mp3_frame_header(data[next_offset:next_offset + 4]):
+                frame = candidate
+                break
+        offset += 1
+
+    if frame is None:
+        return None
+
+    audio_start += offset
+    audio_bytes = audio_end - audio_start
+
+    # A Xing/Info or VBRI header in the first frame gives the exact frame count
+    frames = None
+    if frame['is_v1']:
+        side_info = 17 if frame['mono'] else 32
+    else:
+        side_info = 9 if frame['mono'] else 17
+    gapless = 0
+    xing_start = offset + 4 + side_info
+    xing = data[xing_start:xing_start + 16]
+    if xing[:4] in (b'Xing', b'Info') and len(xing) >= 12:
+        flags = struct.unpack('>I', xing[4:8])[0]
+        if flags & 0x01:
+            frames = struct.unpack('>I', xing[8:12])[0]
+            if flags & 0x02 and len(xing) >= 16:
+                audio_bytes = struct.unpack('>I', xing[12:16])[0]
+
+        # The LAME extension after the Xing fields records the encoder delay and
+        # padding, which decoders drop: subtract them so the duration is exact
+        lame_start = xing_start + 8 + 4 * bool(flags & 0x01) + 4 * bool(flags & 0x02)
+        lame_start += 100 * bool(flags & 0x04) + 4 * bool(flags & 0x08)
+        lame = data[lame_start:lame_start + 24]
+        if len(lame) == 24 and lame[:4] in (b'LAME', b'Lavc', b'Lavf'):
+            delay = (lame[21] << 4) | (lame[22] >> 4)
+            padding = ((lame[22] & 0x0F) << 8) | lame[23]
+            gapless = delay + padding
+    else:
+        vbri = data[offset + 36:offset + 36 + 18]
+        if vbri[:4] == b'VBRI' and len(vbri) >= 18:
+            audio_bytes = struct.unpack('>I', vbri[10:14])[0]
+            frames = struct.unpack('>I', vbri[14:18])[0]
+
+    if frames:
+        samples = frames * frame['samples_per_frame']
+        if 0 < gapless < samples:
+            samples -= gapless
+        duration = samples / frame['sample_rate']
+        bitrate = int(audio_bytes * 8 / duration) if duration > 0 else frame['bitrate']
+    else:
+        # Constant bitrate: duration follows from the stream size
+        bitrate = frame['bitrate']
+        duration = audio_bytes * 8 / bitrate
+
+    return {
+        'bitrate': bitrate,
+        'duration': duration,
+        'codec': 'mp3',
+        'sample_rate': frame['sample_rate']
+    }
+
+# ============================== DISPATCH ===============================
+
+# In-process readers tried in order before falling back to ffprobe
+READERS = {
+    'image': [read_image_header],
+    'audio': [read_mp3_info],
+    'video': [],
+}
+
+FFPROBE_FALLBACKS = {
+    'image': ffprobe_image_info,
+    'audio': ffprobe_audio_info,
+    'video': ffprobe_video_info,
+}
+
+def read_in_process(path, kind):
+    """Try the in-process readers for a file; None if none of them could parse it."""
+    for reader in READERS[kind]:
+        try:
+            info = reader(path)
+        except Exception:
+            info = None
+        if info is not None:
+            return info
+    return None
+
+def probe(path, kind):
+    """Probe one file: in-process readers first, then ffprobe."""
+    info = read_in_process(path, kind)
+    if info is None:
+        info = FFPROBE_FALLBACKS[kind](path)
+    return info
+
+def probe_image(img_path):
+    return probe(img_path, 'image')
+
+def probe_audio(audio_path):
+    return probe(audio_path, 'audio')
+
+def probe_video(video_path):
+    return probe(video_path, 'video')
+
+def probe_many(paths, kind, jobs=PROBE_JOBS):
+    """Probe many files of one kind, returning {path: info}.
+
+    Files the in-process readers understand cost no process at all; the rest
+    go through ffprobe, several at a time.
+    """
+    results = {}
+    fallback = []
+
+    for path in paths:
+        info = read_in_process(path, kind)
+        if info is not None:
+            results[path] = info
+        else:
+            fallback.append(path)
+
+    if fallback:
+        if jobs > 1 and len(fallback) > 1:
+            with ThreadPoolExecutor(max_workers=jobs) as pool:
+                for path, info in zip(fallback, pool.map(FFPROBE_FALLBACKS[kind], fallback)):
+                    results[path] = info
+        else:
+            for path in fallback:
+                results[path] = FFPROBE_FALLBACKS[kind](path)
+
+    return results
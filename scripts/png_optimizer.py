@@ -0,0 +1,280 @@
+"""
+================================================================================
+PNG OPTIMIZER (used by compress_all_website_images.py)
+================================================================================
+
+PURPOSE:
+    Make PNGs smaller without touching a single pixel. Re-encoding through
+    ffmpeg at -compression_level 9 alone rarely beats the originals (CAD
+    renders, plots), so this tries several lossless encodings per image and
+    keeps the smallest one.
+
+LOSSLESS TIER (always):
+    - Re-filter: ffmpeg's PNG encoder with several row filters
+      (-pred mixed / paeth / none) at compression level 9
+    - Strip chunks: text, XMP, EXIF, timestamps and pHYs are dropped; the
+      colour chunks (sRGB, gAMA, cHRM, iCCP) are kept
+    - Reduce (needs Pillow, 8-bit images only):
+        * drop the alpha channel when every pixel is opaque
+        * store grey images (R = G = B everywhere) as grayscale
+        * store images with <= 256 distinct colours as an exact palette,
+          at 1/2/4/8 bits per pixel
+    - Every candidate is decoded again and compared with the original; any
+      pixel difference discards it
+
+QUANTIZE TIER (opt-in, needs Pillow):
+    - Reduces images with more than 256 colours (anti-aliased diagrams,
+      plots) to a 256-colour palette without dithering
+    - Kept only if its PSNR against the original (all channels, alpha
+      included) is at least QUANTIZE_MIN_PSNR, so photos are left alone
+
+USAGE:
+    from png_optimizer import PngOptimizer
+
+    optimizer = PngOptimizer(quantize=False)
+    temp_path, new_size, note = optimizer.optimize(img_path)
+    # temp_path is None if no candidate could be written;
+    # otherwise the caller replaces or deletes it
+
+    optimizer.optimize(img_path, refilter=False)
+    # Pillow candidates only, no ffmpeg process (used for small images,
+    # where process startup costs more than the re-filter saves)
+
+DEPENDENCIES:
+    - ffmpeg (must be installed and in PATH)
+    - Pillow (optional: pip install Pillow). Without it only the re-filter
+      candidates are tried, verified by comparing ffmpeg's frame hashes
+
+AUTHOR: Website maintenance scripts
+LAST MODIFIED: 2026-10-17
+================================================================================
+"""
+
+import math
+import struct
+import subprocess
+import tempfile
+from pathlib import Path
+
+try:
+    from PIL import Image, ImageChops, ImageStat, PngImagePlugin
+except ImportError:
+    Image = None
+
+PNG_PREDICTORS = ('mixed', 'paeth', 'none')   # ffmpeg -pred values tried
+QUANTIZE_MIN_PSNR = 40.0                       # dB; lower-scoring palettes are rejected
+EIGHT_BIT_MODES = {'1', 'L', 'LA', 'P', 'PA', 'RGB', 'RGBA'}
+
+def temp_png():
+    with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp:
+        return Path(tmp.name)
+
+def ffmpeg_png(src, pred):
+    """Re-encode src with one PNG row filter. Returns the temp path or None."""
+    out = temp_png()
+    cmd = [
+        'ffmpeg',
+        '-i', str(src),
+        '-pred', pred,
+        '-compression_level', '9',
+        '-y', str(out)
+    ]
+    result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    if result.returncode != 0 or out.stat().st_size == 0:
+        out.unlink(missing_ok=True)
+        return None
+    return out
+
+def frame_hash(path):
+    """Hash of the decoded pixels in their native format (ffmpeg), or None."""
+    cmd = ['ffmpeg', '-v', 'error', '-i', str(path), '-f', 'hash', '-hash', 'sha256', '-']
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    return result.stdout.strip() if result.returncode == 0 else None
+
+def pixels(img):
+    """8-bit RGBA bytes of a Pillow image, used for exact comparisons."""
+    return img.convert('RGBA').tobytes()
+
+def psnr(a, b):
+    """PSNR over all RGBA channels of two Pillow images, in dB."""
+    diff = ImageStat.Stat(ImageChops.difference(a.convert('RGBA'), b.convert('RGBA')))
+    mse = sum(diff.sum2) / (a.width * a.height * 4)
+    return float('inf') if mse == 0 else 10 * math.log10(255 ** 2 / mse)
+
+def colour_chunks(img):
+    """PngInfo carrying only the colour-management chunks of the original."""
+    info = PngImagePlugin.PngInfo()
+    if 'srgb' in img.info:
+        info.add(b'sRGB', struct.pack('>B', img.info['srgb']))
+    if 'gamma' in img.info:
+        info.add(b'gAMA', struct.pack('>I', round(img.info['gamma'] * 100000)))
+    if 'chromaticity' in img.info:
+        info.add(b'cHRM', struct.pack('>8I', *(round(v * 100000) for v in img.info['chromaticity'])))
+    return info
+
+def exact_palette(img):
+    """Palette ('P') copy of an image with <= 256 colours, or None if it has more."""
+    rgba = img.convert('RGBA')
+    colours = rgba.getcolors(256)
+    if colours is None:
+        return None
+
+    # Most frequent first keeps the common indices small, which compresses better
+    colours.sort(key=lambda item: -item[0])
+    index = {colour: i for i, (_, colour) in enumerate(colours)}
+    paletted = Image.frombytes('P', img.size, bytes(index[c] for c in rgba.getdata()))
+    paletted.putpalette([channel for _, colour in colours for channel in colour[:3]])
+
+    alphas = [colour[3] for _, colour in colours]
+    if any(a != 255 for a in alphas):
+        paletted.info['transparency'] = bytes(alphas)
+    return paletted
+
+def bits_for(colour_count):
+    for bits in (1, 2, 4):
+        if colour_count <= 1 << bits:
+            return bits
+    return 8
+
+class PngOptimizer:
+    """Lossless PNG candidates (plus optional palette quantization); the smallest wins."""
+
+    def __init__(self, quantize=False):
+        self.quantize = quantize and Image is not None
+
+    def settings(self):
+        """Settings that change the results (part of the image cache settings)."""
+        return {
+            'engine': 'pillow+ffmpeg' if Image is not None else 'ffmpeg',
+            'predictors': list(PNG_PREDICTORS),
+            'quantize': self.quantize,
+            'quantize_min_psnr': QUANTIZE_MIN_PSNR if self.quantize else None,
+        }
+
+    def describe(self):
+        parts = ['lossless (re-filter, strip chunks'
+                 + (', drop alpha, grayscale, palette)' if Image is not None else '; install Pillow for reductions)')]
+        if self.quantize:
+            parts.append(f"palette quantization (PSNR >= {QUANTIZE_MIN_PSNR:g} dB)")
+        return ' + '.join(parts)
+
+    def optimize(self, img_path, refilter=True):
+        """Return (temp path of the smallest verified candidate, its size, report note).
+        The temp path is None if no candidate could be produced. With refilter=False
+        (and Pillow installed) no ffmpeg re-filter candidates are tried."""
+        candidates = []   # (path, label)
+        try:
+            if Image is not None:
+                candidates = self._pillow_candidates(img_path, refilter)
+            else:
+                candidates = self._ffmpeg_candidates(img_path)
+
+            if not candidates:
+                return None, img_path.stat().st_size, ''
+
+            candidates.sort(key=lambda item: item[0].stat().st_size)
+            best_path, label = candidates.pop(0)
+            return best_path, best_path.stat().st_size, f" | {label}"
+        finally:
+            for path, _ in candidates:
+                path.unlink(missing_ok=True)
+
+    def _ffmpeg_candidates(self, img_path):
+        """Re-filtered copies whose decoded frames hash like the original's."""
+        reference = frame_hash(img_path)
+        candidates = []
+        for pred in PNG_PREDICTORS:
+            path = ffmpeg_png(img_path, pred)
+            if path is None:
+                continue
+            if reference is not None and frame_hash(path) == reference:
+                candidates.append((path, f"lossless, filter {pred}"))
+            else:
+                path.unlink()
+        return candidates
+
+    def _pillow_candidates(self, img_path, refilter=True):
+        with Image.open(img_path) as original:
+            original.load()
+            if original.mode not in EIGHT_BIT_MODES:
+                # 16-bit and other modes Pillow can't compare exactly
+                return self._ffmpeg_candidates(img_path)
+
+            reference = pixels(original)
+            candidates = []
+
+            def add(path, label, lossless=True):
+                if path is None:
+                    return
+                with Image.open(path) as check:
+                    ok = pixels(check) == reference if lossless else True
+                if ok:
+                    candidates.append((path, label))
+                else:
+                    path.unlink()
+
+            for reduced, label in self._reductions(original):
+                # Pillow's own encoder, then ffmpeg's row filters on the same pixels
+                source = temp_png()
+                save_options = {'optimize': True, 'pnginfo': colour_chunks(original)}
+                if 'icc_profile' in original.info:
+                    save_options['icc_profile'] = original.info['icc_profile']
+                if reduced.mode == 'P':
+                    save_options['bits'] = bits_for(len(reduced.getpalette()) // 3)
+                    if 'transparency' in reduced.info:
+                        save_options['transparency'] = reduced.info['transparency']
+                reduced.save(source, **save_options)
+                add(source, f"lossless, {label}")
+
+                for pred in PNG_PREDICTORS if refilter else ():
+                    add(ffmpeg_png(source, pred), f"lossless, {label}, filter {pred}")
+
+            if self.quantize and original.convert('RGBA').getcolors(256) is None:
+                candidates += self._quantized(original)
+
+        return candidates
+
+    def _reductions(self, original):
+        """Lossless re-representations of the image, each with a label for the report."""
+        img = original
+        steps = []
+
+        if img.mode in ('P', 'PA', '1'):
+            img = img.convert('RGBA')
+        if img.mode in ('RGBA', 'LA') and img.getchannel('A').getextrema() == (255, 255):
+            img = img.convert('RGB' if img.mode == 'RGBA' else 'L')
+            steps.append('alpha dropped')
+        if img.mode in ('RGB', 'RGBA'):
+            r, g, b = img.getchannel('R'), img.getchannel('G'), img.getchannel('B')
+            if ImageChops.difference(r, g).getbbox() is None and ImageChops.difference(r, b).getbbox() is None:
+                img = img.convert('LA' if img.mode == 'RGBA' else 'L')
+                steps.append('grayscale')
+
+        reductions = [(img, ', '.join(steps) or 'same colour type')]
+
+        if img.mode != 'L':
+            paletted = exact_palette(img)
+            if paletted is not None:
+                colours = len(paletted.getpalette()) // 3
+                reductions.append((paletted, ', '.join(steps + [f"{colours}-colour palette"])))
+
+        return reductions
+
+    def _quantized(self, original):
+        """256-colour palette version if it stays above the PSNR threshold."""
+        rgba = original.convert('RGBA')
+        if rgba.getchannel('A').getextrema() == (255, 255):
+            quantized = rgba.convert('RGB').quantize(256, method=Image.Quantize.MEDIANCUT, dither=Image.Dither.NONE)
+        else:
+            quantized = rgba.quantize(256, method=Image.Quantize.FASTOCTREE, dither=Image.Dither.NONE)
+
+        score = psnr(rgba, quantized)
+        if score < QUANTIZE_MIN_PSNR:
+            return []
+
+        path = temp_png()
+        save_options = {'optimize': True, 'pnginfo': colour_chunks(original)}
+        if 'transparency' in quantized.info:
+            save_options['transparency'] = quantized.info['transparency']
+        quantized.save(path, **save_options)
+        return [(path, f"quantized to 256 colours, PSNR {score:.1f} dB")]
@@ -0,0 +1,240 @@
+"""
+================================================================================
+QUALITY SEARCH (shared by the JPEG compression scripts)
+================================================================================
+
+PURPOSE:
+    Pick the JPEG quality per image instead of using one fixed -q:v for
+    every file. A fixed setting over-compresses detailed photos and leaves
+    wasted bytes in smooth ones; searching for the highest -q:v (smallest
+    file) that still looks like the original fixes both.
+
+HOW IT WORKS:
+    find() runs these steps for one image:
+    1. Known image (media cache section "quality", validated by size/mtime
+       and the SHA-256 of the content): one encode at the quality chosen
+       last time, returned without measuring it again. Only if that encode
+       fails does the search below run. An image no quality met last time
+       returns None straight away
+    2. Bisection over -q:v (2 = best, 31 = worst): encode at the midpoint
+       of the remaining range and compare it with the original using
+       ffmpeg's ssim or psnr filter
+       - meets the target: it becomes the best candidate (the previous one
+         is deleted) and the search moves to higher -q:v (smaller files)
+       - misses the target, or can't be measured: the search moves to
+         lower -q:v
+       It stops when the range is empty, after SEARCH_MAX_STEPS encodes
+       (the 30 values need at most 5), or as soon as an encode fails
+    3. No candidate met the target: find() returns None and the caller
+       keeps its fixed setting. Unless the search was cut short by a failed
+       encode, this is cached too, so the image isn't searched again until
+       it or the settings change
+    4. Size check against the fixed setting: the encode at the script's
+       fixed quality is measured for the report (reusing the search's own
+       encode when the bisection already tried that quality; if it fails,
+       the best candidate's size stands in). This only feeds
+       'fixed_bytes'; the chosen candidate is kept either way
+    5. The chosen quality and score are cached for step 1 next time
+    Files that were replaced by (or didn't improve over) a searched encode
+    can be marked with settle(); is_settled() then lets the caller skip
+    them, so re-running doesn't re-encode an already-lossy result over and
+    over. is_unmet() does the same for images no quality met.
+
+METRICS:
+    ssim  Overall SSIM ("All") of the planes, 1.0 = identical
+    psnr  Average PSNR in dB, higher = closer
+
+USAGE:
+    from quality_search import QualitySearch
+
+    search = QualitySearch('ssim', 0.98, root=repo_root)
+    result = search.find(img_path, encode, fixed_quality=10)
+    # encode(quality, out_path) -> bool writes one candidate
+    # result: {'path', 'quality', 'score', 'bytes', 'fixed_bytes'} or None
+    search.save()
+
+NOTES:
+    - Both inputs are converted to yuv444p before measuring, so JPEGs with
+      different chroma subsampling compare correctly
+    - Worker processes collect cache changes and totals with
+      take_updates(); the parent applies them with merge()
+
+AUTHOR: Website maintenance scripts
+LAST MODIFIED: 2026-10-17
+================================================================================
+"""
+
+import re
+import subprocess
+import tempfile
+from pathlib import Path
+from media_cache import MediaCache, VERDICT_OPTIMIZED
+
+QUALITY_BEST = 2           # -q:v range searched
+QUALITY_WORST = 31
+SEARCH_MAX_STEPS = 6       # Encodes per image, at most
+
+# ffmpeg filter and the pattern of the score it prints on stderr
+METRICS = {
+    'ssim': ('ssim', re.compile(r'SSIM .*All:([0-9.]+|inf)')),
+    'psnr': ('psnr', re.compile(r'PSNR .*average:([0-9.]+|inf)')),
+}
+
+def measure(reference, candidate, metric):
+    """Score 'candidate' against 'reference' with ffmpeg's ssim/psnr filter, or None on failure."""
+    filter_name, pattern = METRICS[metric]
+    cmd = [
+        'ffmpeg', '-hide_banner',
+        '-i', str(candidate),
+        '-i', str(reference),
+        '-lavfi', f'[0:v]format=yuv444p[a];[1:v]format=yuv444p[b];[a][b]{filter_name}',
+        '-f', 'null', '-',
+    ]
+    result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, errors='replace')
+    match = pattern.search(result.stderr)
+    if result.returncode != 0 or not match:
+        return None
+    return float(match.group(1))
+
+class QualitySearch:
+    """Per-image quality search with a cache of the chosen settings."""
+
+    def __init__(self, metric, target, root=None, use_cache=True):
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric: {metric}")
+        self.metric = metric
+        self.target = target
+        self.cache = MediaCache('quality', self.settings(), root) if use_cache else None
+        self.totals = {'files': 0, 'bytes': 0, 'fixed_bytes': 0}
+
+    def settings(self):
+        """Settings that change the chosen qualities (also part of the image cache settings)."""
+        return {
+            'metric': self.metric,
+            'target': self.target,
+            'range': [QUALITY_BEST, QUALITY_WORST],
+            'max_steps': SEARCH_MAX_STEPS,
+        }
+
+    def describe(self):
+        unit = ' dB' if self.metric == 'psnr' else ''
+        return f"{self.metric.upper()} >= {self.target}{unit}"
+
+    def find(self, img_path, encode, fixed_quality):
+        """Return the smallest encode of img_path that meets the target, or None if none does.
+        The caller owns result['path'] (a temp file) and must replace or delete it."""
+        entry = self.cache.lookup(img_path) if self.cache is not None else None
+        if entry is not None and entry['info'] and entry['info'].get('unmet'):
+            return None  # Searched before with these settings: nothing meets the target
+        if entry is not None and entry['info'] and not entry['info'].get('settled'):
+            # Known image: one encode at the quality chosen last time
+            known = entry['info']
+            path = self._encode(encode, known['quality'])
+            if path is not None:
+                result = dict(known, path=path, bytes=path.stat().st_size)
+                self._count(result)
+                return result
+
+        sizes = {}
+        best = None
+        low, high = QUALITY_BEST, QUALITY_WORST
+        steps = 0
+        failed = False
+
+        while low <= high and steps < SEARCH_MAX_STEPS:
+            quality = (low + high) // 2
+            steps += 1
+            path = self._encode(encode, quality)
+            if path is None:
+                failed = True
+                break
+            sizes[quality] = path.stat().st_size
+            score = measure(img_path, path, self.metric)
+
+            if score is not None and score >= self.target:
+                # Good enough: keep it and try a smaller file
+                if best is not None:
+                    best['path'].unlink(missing_ok=True)
+                best = {'path': path, 'quality': quality, 'score': score, 'bytes': sizes[quality]}
+                low = quality + 1
+            else:
+                path.unlink(missing_ok=True)
+                high = quality - 1
+
+        if best is None:
+            if self.cache is not None and not failed:
+                self.cache.record(img_path, {'unmet': True}, VERDICT_OPTIMIZED)
+            return None
+
+        # Size at the fixed setting, for the report
+        if fixed_quality not in sizes:
+            path = self._encode(encode, fixed_quality)
+            if path is not None:
+                sizes[fixed_quality] = path.stat().st_size
+                path.unlink()
+        best['fixed_bytes'] = sizes.get(fixed_quality, best['bytes'])
+
+        if self.cache is not None:
+            self.cache.record(img_path, {k: v for k, v in best.items() if k != 'path'}, VERDICT_OPTIMIZED)
+        self._count(best)
+        return best
+
+    def settle(self, img_path, result):
+        """Remember that img_path is final (the replaced file, or an original that didn't improve),
+        so re-running doesn't search, and degrade, it again."""
+        if self.cache is not None:
+            info = {k: v for k, v in result.items() if k != 'path'}
+            self.cache.record(img_path, dict(info, settled=True), VERDICT_OPTIMIZED)
+
+    def is_settled(self, img_path):
+        """True if img_path is unchanged since settle() was called for it."""
+        entry = self.cache.lookup(img_path) if self.cache is not None else None
+        return bool(entry and entry['info'] and entry['info'].get('settled'))
+
+    def is_unmet(self, img_path):
+        """True if img_path is unchanged since a search found no quality that meets the target."""
+        entry = self.cache.lookup(img_path) if self.cache is not None else None
+        return bool(entry and entry['info'] and entry['info'].get('unmet'))
+
+    def _encode(self, encode, quality):
+        """Encode one candidate to a temp file; returns its path or None."""
+        with tempfile.NamedTemporaryFile(suffix='.jpg', delete=False) as tmp:
+            path = Path(tmp.name)
+        if not encode(quality, path) or path.stat().st_size == 0:
+            path.unlink(missing_ok=True)
+            return None
+        return path
+
+    def _count(self, result):
+        self.totals['files'] += 1
+        self.totals['bytes'] += result['bytes']
+        self.totals['fixed_bytes'] += result['fixed_bytes']
+
+    def take_updates(self):
+        """Return and clear cache changes and totals (for worker processes)."""
+        updates = {
+            'cache': self.cache.take_updates() if self.cache is not None else {},
+            'totals': self.totals,
+        }
+        self.totals = {'files': 0, 'bytes': 0, 'fixed_bytes': 0}
+        return updates
+
+    def merge(self, updates):
+        """Apply changes collected in another process."""
+        if self.cache is not None:
+            self.cache.merge(updates['cache'])
+        for key, value in updates['totals'].items():
+            self.totals[key] += value
+
+    def save(self):
+        if self.cache is not None:
+            self.cache.save()
+
+    def summary(self):
+        """One line comparing the searched qualities with the fixed setting, or None."""
+        if not self.totals['files']:
+            return None
+        saved = self.totals['fixed_bytes'] - self.totals['bytes']
+        direction = "saved" if saved >= 0 else "spent"
+        return (f"Quality search ({self.describe()}): {abs(saved)//1024} KB {direction} "
+                f"against the fixed setting over {self.totals['files']} image(s)")
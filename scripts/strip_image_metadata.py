@@ -0,0 +1,511 @@
+"""
+================================================================================
+STRIP IMAGE METADATA
+================================================================================
+
+PURPOSE:
+    Remove metadata the website never uses from JPG/PNG images: EXIF blocks
+    with embedded thumbnails and maker notes, XMP, Photoshop resources,
+    comments and trailing data. Camera photos often carry tens of KB of it.
+    The pass keeps how an image looks: EXIF orientation is baked into the
+    pixels and non-sRGB colour profiles are converted to sRGB, once.
+
+WHAT IT DOES:
+    JPEG (lossless, pure Python):
+    - Drops APP1 (EXIF, XMP), APP2 other than ICC (FlashPix, MPF),
+      APP3-APP13 and APP15 (Photoshop, ...), COM segments and any data
+      after the end-of-image marker (e.g. MPF preview images)
+    - Keeps APP0 (JFIF), APP14 (Adobe colour transform) and everything the
+      decoder needs
+    PNG (lossless, pure Python):
+    - Drops text chunks (tEXt, zTXt, iTXt), eXIf, tIME, pHYs and other
+      ancillary chunks browsers don't use
+    - Keeps colour chunks (sRGB, gAMA, cHRM, cICP, sBIT), transparency and
+      APNG animation chunks
+    Colour and orientation (needs Pillow):
+    - EXIF orientation != 1: the image is rotated/flipped so it displays
+      the same without the EXIF block
+    - ICC profile that isn't sRGB: pixels are converted to sRGB and the
+      profile is dropped. An sRGB profile is simply dropped (browsers
+      assume sRGB)
+    These two steps re-encode the image (JPEG with the original
+    quantization tables and chroma subsampling; PNG losslessly). Without Pillow the
+    orientation survives as a minimal 34-byte EXIF block and non-sRGB
+    profiles are kept.
+
+CACHE:
+    Every examined file is recorded in the media cache (section
+    "metadata", scripts/.media_cache/metadata.json), so the pass never
+    looks at an unchanged file again.
+
+USAGE:
+    python scripts/strip_image_metadata.py
+    python scripts/strip_image_metadata.py --dry-run     (report only)
+    python scripts/strip_image_metadata.py --no-cache
+    python scripts/strip_image_metadata.py src/blogs/x/res/photo.jpg
+
+    compress_all_website_images.py runs the same pass (MetadataStripper)
+    on every image before compressing it, unless --keep-metadata is given.
+
+EXAMPLE OUTPUT:
+    Image Metadata
+    ----------------------------------------
+
+    src/blogs/0_optical_mouse/res/
+    ----------------------------------------
+       [Stripped] antenna_assembly.jpg | 2655 KB → 2207 KB (EXIF, orientation baked)
+       [Clean] blender.png
+       Reclaimed: 448 KB
+
+    Stripped: 5, Clean: 62, Reclaimed: 512 KB
+
+DEPENDENCIES:
+    - Python 3.6+
+    - Pillow (optional: pip install Pillow) for orientation and colour
+      profile conversion
+
+AUTHOR: Website maintenance scripts
+LAST MODIFIED: 2026-10-17
+================================================================================
+"""
+
+import io
+import sys
+import zlib
+import struct
+import tempfile
+import argparse
+from pathlib import Path
+from media_cache import MediaCache, VERDICT_OPTIMIZED
+from build_profile import format_kb
+
+try:
+    from PIL import Image, ImageOps, ImageCms, JpegImagePlugin
+except ImportError:
+    Image = None
+
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png'}
+
+# JPEG markers
+SOI, EOI, SOS = 0xD8, 0xD9, 0xDA
+APP0, APP1, APP2, APP14, COM = 0xE0, 0xE1, 0xE2, 0xEE, 0xFE
+STANDALONE_MARKERS = {0x01, *range(0xD0, 0xD8)}   # TEM, RST0-7: no length field
+ICC_SIGNATURE = b'ICC_PROFILE\x00'
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+# Ancillary PNG chunks worth keeping; everything else ancillary is dropped
+PNG_KEEP_CHUNKS = {b'tRNS', b'gAMA', b'cHRM', b'sRGB', b'iCCP', b'cICP', b'sBIT', b'acTL', b'fcTL', b'fdAT'}
+
+ORIENTATION_TAG = 0x0112
+
+# ---------------------------------------------------------------- JPEG
+
+def jpeg_segments(data):
+    """Split a JPEG into [(marker, bytes)] segments; entropy-coded data belongs to the
+    preceding SOS, and anything after EOI is returned as marker None."""
+    if data[:2] != b'\xff\xd8':
+        raise ValueError("not a JPEG")
+
+    segments = [(SOI, data[:2])]
+    pos = 2
+    while pos < len(data):
+        if data[pos] != 0xFF:
+            raise ValueError("corrupt JPEG marker stream")
+        marker = data[pos + 1]
+        if marker == 0xFF:  # Fill byte
+            pos += 1
+            continue
+        if marker == EOI:
+            segments.append((EOI, data[pos:pos + 2]))
+            if pos + 2 < len(data):
+                segments.append((None, data[pos + 2:]))
+            return segments
+        if marker in STANDALONE_MARKERS:
+            segments.append((marker, data[pos:pos + 2]))
+            pos += 2
+            continue
+
+        length = struct.unpack('>H', data[pos + 2:pos + 4])[0]
+        end = pos + 2 + length
+        if marker == SOS:
+            # Entropy-coded data runs until the next marker that isn't stuffing or RSTn
+            end = data.find(b'\xff', end)
+            while end != -1 and (data[end + 1] == 0x00 or 0xD0 <= data[end + 1] <= 0xD7):
+                end = data.find(b'\xff', end + 2)
+            if end == -1:
+                end = len(data)
+        segments.append((marker, data[pos:end]))
+        pos = end
+
+    return segments  # Missing EOI: keep what is there
+
+def is_icc_segment(marker, segment):
+    return marker == APP2 and segment[4:4 + len(ICC_SIGNATURE)] == ICC_SIGNATURE
+
+def jpeg_icc_profile(segments):
+    """Reassemble an ICC profile split over APP2 segments, or None."""
+    chunks = []
+    for marker, segment in segments:
+        if is_icc_segment(marker, segment):
+            body = segment[4 + len(ICC_SIGNATURE):]
+            chunks.append((body[0], body[2:]))   # (sequence number, data)
+    return b''.join(data for _, data in sorted(chunks)) if chunks else None
+
+def jpeg_exif(segments):
+    for marker, segment in segments:
+        if marker == APP1 and segment[4:10] == b'Exif\x00\x00':
+            return segment[10:]
+    return None
+
+def minimal_exif(orientation):
+    """APP1 segment with nothing but the orientation tag (little-endian TIFF)."""
+    tiff = b'II*\x00' + struct.pack('<I', 8)
+    tiff += struct.pack('<H', 1) + struct.pack('<HHIHH', ORIENTATION_TAG, 3, 1, orientation, 0)
+    tiff += struct.pack('<I', 0)
+    payload = b'Exif\x00\x00' + tiff
+    return b'\xff\xe1' + struct.pack('>H', len(payload) + 2) + payload
+
+def strip_jpeg(data, keep_icc, orientation=1):
+    """Return (stripped bytes, labels of what was removed)."""
+    segments = jpeg_segments(data)
+    removed = {}
+    kept = []
+
+    for marker, segment in segments:
+        if marker is None:
+            label = 'trailing data'
+        elif marker == COM:
+            label = 'comment'
+        elif marker == APP1:
+            label = 'XMP' if segment[4:8] == b'http' else 'EXIF'
+        elif is_icc_segment(marker, segment):
+            label = None if keep_icc else 'ICC profile'
+        elif 0xE0 <= marker <= 0xEF and marker not in (APP0, APP14):
+            label = f'APP{marker - 0xE0}'
+        else:
+            label = None
+
+        if label is None:
+            kept.append(segment)
+        else:
+            removed[label] = removed.get(label, 0) + len(segment)
+
+    if orientation != 1:
+        # No Pillow to bake it in: keep just the orientation after SOI/APP0
+        at = 2 if len(kept) > 1 and kept[1][:2] == b'\xff\xe0' else 1
+        kept.insert(at, minimal_exif(orientation))
+
+    return b''.join(kept), removed
+
+# ---------------------------------------------------------------- PNG
+
+def png_chunks(data):
+    """Split a PNG into [(type, raw chunk bytes)]."""
+    if data[:8] != PNG_SIGNATURE:
+        raise ValueError("not a PNG")
+
+    chunks = []
+    pos = 8
+    while pos + 8 <= len(data):
+        length = struct.unpack('>I', data[pos:pos + 4])[0]
+        chunk_type = data[pos + 4:pos + 8]
+        end = pos + 12 + length
+        chunks.append((chunk_type, data[pos:end]))
+        pos = end
+        if chunk_type == b'IEND':
+            break
+    return chunks
+
+def png_icc_profile(chunks):
+    for chunk_type, raw in chunks:
+        if chunk_type == b'iCCP':
+            body = raw[8:-4]
+            name_end = body.index(b'\x00')
+            return zlib.decompress(body[name_end + 2:])
+    return None
+
+def png_exif(chunks):
+    for chunk_type, raw in chunks:
+        if chunk_type == b'eXIf':
+            return raw[8:-4]
+    return None
+
+def strip_png(data, keep_icc, orientation=1):
+    """Return (stripped bytes, labels of what was removed)."""
+    removed = {}
+    kept = [PNG_SIGNATURE]
+
+    for chunk_type, raw in png_chunks(data):
+        critical = chunk_type[:1].isupper()
+        keep = critical or chunk_type in PNG_KEEP_CHUNKS
+        if chunk_type == b'iCCP' and not keep_icc:
+            keep = False
+        if chunk_type == b'eXIf' and orientation != 1:
+            keep = True  # Can't bake the orientation in without Pillow
+
+        if keep:
+            kept.append(raw)
+        else:
+            label = {b'iCCP': 'ICC profile', b'eXIf': 'EXIF', b'tEXt': 'text',
+                     b'zTXt': 'text', b'iTXt': 'text'}.get(chunk_type, chunk_type.decode('latin-1'))
+            removed[label] = removed.get(label, 0) + len(raw)
+
+    return b''.join(kept), removed
+
+# ---------------------------------------------------------------- EXIF / ICC
+
+def exif_orientation(tiff):
+    """Orientation tag (1-8) from a TIFF/EXIF block, 1 if absent."""
+    if not tiff or len(tiff) < 8 or tiff[:2] not in (b'II', b'MM'):
+        return 1
+    endian = '<' if tiff[:2] == b'II' else '>'
+    try:
+        ifd = struct.unpack(endian + 'I', tiff[4:8])[0]
+        count = struct.unpack(endian + 'H', tiff[ifd:ifd + 2])[0]
+        for i in range(count):
+            entry = tiff[ifd + 2 + i * 12:ifd + 14 + i * 12]
+            tag, _, _ = struct.unpack(endian + 'HHI', entry[:8])
+            if tag == ORIENTATION_TAG:
+                value = struct.unpack(endian + 'H', entry[8:10])[0]
+                return value if 1 <= value <= 8 else 1
+    except struct.error:
+        pass
+    return 1
+
+def icc_description(icc):
+    """Profile description ('desc' tag, ICC v2 or v4), or ''."""
+    try:
+        count = struct.unpack('>I', icc[128:132])[0]
+        for i in range(count):
+            sig, offset, size = struct.unpack('>4sII', icc[132 + i * 12:144 + i * 12])
+            if sig != b'desc':
+                continue
+            tag = icc[offset:offset + size]
+            if tag[:4] == b'desc':       # v2: ASCII
+                length = struct.unpack('>I', tag[8:12])[0]
+                return tag[12:12 + length].rstrip(b'\x00').decode('latin-1')
+            if tag[:4] == b'mluc':       # v4: first UTF-16 record
+                rec_size, rec_offset = struct.unpack('>II', tag[20:28])
+                return tag[rec_offset:rec_offset + rec_size].decode('utf-16-be')
+    except (struct.error, UnicodeDecodeError):
+        pass
+    return ''
+
+def is_srgb_profile(icc):
+    return 'srgb' in icc_description(icc).lower().replace(' ', '')
+
+# ---------------------------------------------------------------- Pass
+
+class MetadataStripper:
+    """Strips metadata in place; remembers examined files in the media cache."""
+
+    def __init__(self, root=None, use_cache=True, dry_run=False):
+        self.root = Path(root) if root else Path(__file__).parent.parent
+        self.cache = MediaCache('metadata', self.settings(), self.root) if use_cache else None
+        self.dry_run = dry_run
+        self.reclaimed = {}   # directory (repo-relative) -> bytes
+
+    def settings(self):
+        return {
+            'version': 1,
+            'pillow': Image is not None,
+        }
+
+    def run(self, img_path):
+        """Strip one image. Returns None if it was already clean (or cached),
+        else {'before', 'after', 'removed': [labels], 'pixels_changed': bool}."""
+        if self.cache is not None and self.cache.lookup(img_path) is not None:
+            return None
+
+        data = img_path.read_bytes()
+        is_jpeg = img_path.suffix.lower() in {'.jpg', '.jpeg'}
+
+        if is_jpeg:
+            segments = jpeg_segments(data)
+            icc, orientation = jpeg_icc_profile(segments), exif_orientation(jpeg_exif(segments))
+        else:
+            chunks = png_chunks(data)
+            icc, orientation = png_icc_profile(chunks), exif_orientation(png_exif(chunks))
+
+        notes = []
+        foreign_icc = icc is not None and not is_srgb_profile(icc)
+        # Pillow converts RGB profiles; others (CMYK, grey) are kept as they are
+        convert_icc = foreign_icc and Image is not None and icc[16:20] == b'RGB '
+        keep_icc = foreign_icc and not convert_icc
+        strip = strip_jpeg if is_jpeg else strip_png
+        if Image is not None and (orientation != 1 or convert_icc):
+            # Report what the original carried, then strip whatever the encoder wrote
+            _, removed = strip(data, keep_icc)
+            rewritten = self._rewrite_pixels(img_path, is_jpeg, icc, convert_icc, orientation)
+            new_data, notes = strip(rewritten[0], keep_icc)[0], rewritten[1]
+            removed.pop('ICC profile', None)
+        else:
+            new_data, removed = strip(data, keep_icc, orientation)
+
+        before = img_path.stat().st_size
+        if not notes and len(new_data) >= before:
+            self._record(img_path)
+            return None
+
+        if not self.dry_run:
+            self._replace(img_path, new_data)
+            self._record(img_path)
+
+        key = img_path.parent.relative_to(self.root).as_posix()
+        self.reclaimed[key] = self.reclaimed.get(key, 0) + before - len(new_data)
+        return {
+            'before': before,
+            'after': len(new_data),
+            'removed': sorted(removed, key=lambda label: -removed[label]) + notes,
+            'pixels_changed': bool(notes),
+        }
+
+    def _rewrite_pixels(self, img_path, is_jpeg, icc, convert_icc, orientation):
+        """Bake orientation in and/or convert to sRGB with Pillow; returns (encoded bytes, notes)."""
+        notes = []
+        save_options = {}
+        with Image.open(img_path) as original:
+            img = original
+            if orientation != 1:
+                img = ImageOps.exif_transpose(original)
+                notes.append(f"orientation {orientation} baked in")
+            if convert_icc:
+                if img.mode not in ('RGB', 'RGBA'):
+                    img = img.convert('RGBA' if img.mode in ('P', 'PA') else 'RGB')
+                source = ImageCms.ImageCmsProfile(io.BytesIO(icc))
+                img = ImageCms.profileToProfile(img, source, ImageCms.createProfile('sRGB'), outputMode=img.mode)
+                notes.append(f"{icc_description(icc) or 'ICC profile'} → sRGB")
+            elif icc is not None and not is_srgb_profile(icc):
+                save_options['icc_profile'] = icc
+
+            buffer = io.BytesIO()
+            if is_jpeg:
+                # Same quantization tables and subsampling: about the original size and quality
+                sampling = JpegImagePlugin.get_sampling(original)
+                if img.mode not in ('L', 'RGB', 'CMYK'):
+                    img = img.convert('RGB')
+                img.save(buffer, 'JPEG', qtables=original.quantization,
+                         subsampling=sampling if sampling >= 0 else 2, optimize=True, **save_options)
+            else:
+                img.save(buffer, 'PNG', optimize=True, **save_options)
+        return buffer.getvalue(), notes
+
+    def _replace(self, img_path, data):
+        """Write next to the original, then swap it in atomically."""
+        with tempfile.NamedTemporaryFile(dir=img_path.parent, suffix=img_path.suffix, delete=False) as tmp:
+            tmp.write(data)
+            temp_path = Path(tmp.name)
+        temp_path.replace(img_path)
+
+    def _record(self, img_path):
+        if self.cache is not None and not self.dry_run:
+            self.cache.record(img_path, None, VERDICT_OPTIMIZED)
+
+    def take_updates(self):
+        """Return and clear cache changes and reclaimed bytes (for worker processes)."""
+        updates = {
+            'cache': self.cache.take_updates() if self.cache is not None else {},
+            'reclaimed': self.reclaimed,
+        }
+        self.reclaimed = {}
+        return updates
+
+    def merge(self, updates):
+        """Apply changes collected in another process."""
+        if self.cache is not None:
+            self.cache.merge(updates['cache'])
+        for key, size in updates['reclaimed'].items():
+            self.reclaimed[key] = self.reclaimed.get(key, 0) + size
+
+    def save(self):
+        if self.cache is not None:
+            self.cache.save()
+
+def describe(result):
+    """Report text for a run() result, e.g. "52 KB, -14 bytes (comment)"."""
+    change = result['after'] - result['before']
+    return f"{result['after']//1024} KB, {change:+,} bytes ({', '.join(result['removed'])})"
+
+# ---------------------------------------------------------------- Script
+
+def find_all_images(repo_root):
+    """Find all images in the website directory structure."""
+    images = []
+    search_paths = [
+        repo_root / 'src' / 'resources' / 'images',
+        repo_root / 'src' / 'blogs',
+        repo_root / 'src' / 'bio',
+        repo_root / 'src' / 'poems',
+    ]
+    for search_path in search_paths:
+        if search_path.exists():
+            for img_path in search_path.rglob('*'):
+                if img_path.is_file() and img_path.suffix.lower() in IMAGE_EXTENSIONS:
+                    images.append(img_path)
+    return sorted(images)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Strip metadata from website images.")
+    parser.add_argument('--dry-run', action='store_true',
+                        help="report what would be removed without changing any file")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="ignore the media cache and examine every image again")
+    parser.add_argument('paths', nargs='*', type=Path,
+                        help="only process these image files (default: scan the whole site)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """Run the script; returns the process exit status."""
+    args = parse_args(argv)
+
+    print("\nImage Metadata")
+    print("-" * 40)
+    if Image is None:
+        print("Pillow not installed: orientation and non-sRGB profiles are kept as metadata")
+    if args.dry_run:
+        print("Dry run: no files are changed")
+
+    repo_root = Path(__file__).parent.parent
+    if args.paths:
+        images = sorted(p for p in args.paths if p.is_file() and p.suffix.lower() in IMAGE_EXTENSIONS)
+        images = [repo_root / p.resolve().relative_to(repo_root.resolve()) for p in images]
+    else:
+        images = find_all_images(repo_root)
+
+    stripper = MetadataStripper(repo_root, use_cache=not args.no_cache, dry_run=args.dry_run)
+    stripped = 0
+    failed = 0
+
+    by_dir = {}
+    for img_path in images:
+        by_dir.setdefault(img_path.parent, []).append(img_path)
+
+    for dir_path in sorted(by_dir):
+        rel_dir = dir_path.relative_to(repo_root).as_posix()
+        print(f"\n{rel_dir}/")
+        print("-" * 40)
+
+        for img_path in by_dir[dir_path]:
+            try:
+                result = stripper.run(img_path)
+            except (ValueError, OSError) as e:
+                print(f"   [Error] {img_path.name}: {e}")
+                failed += 1
+                continue
+            if result is None:
+                print(f"   [Clean] {img_path.name}")
+            else:
+                stripped += 1
+                print(f"   [Stripped] {img_path.name} | {describe(result)}")
+
+        if stripper.reclaimed.get(rel_dir):
+            print(f"   Reclaimed: {stripper.reclaimed[rel_dir]:,} bytes")
+
+    stripper.save()
+
+    total = sum(stripper.reclaimed.values())
+    print(f"\nStripped: {stripped}, Clean: {len(images) - stripped - failed}, Reclaimed: {format_kb(total)} ({total:,} bytes)\n")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
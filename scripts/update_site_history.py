@@ -150,6 +150,7 @@ LAST MODIFIED: 2026-01-16
 
 import json
 import os
+import sys
 import re
 from pathlib import Path
 from datetime import datetime
@@ -367,7 +368,8 @@ def update_history():
     
     return False
 
-if __name__ == '__main__':
+def main(argv=None):
+    """Run the script; returns the process exit status."""
     print("\nHistory Update Script")
     print("-" * 40)
     
@@ -378,3 +380,8 @@ if __name__ == '__main__':
     else:
         print("\nUpdate failed")
     print()
+    
+    return 0 if success else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -9,7 +9,7 @@ PURPOSE:
     website content, compressing media, and generating necessary metadata files.
 
 WHAT IT DOES:
-    Runs all necessary maintenance scripts in the correct sequence:
+    Runs all necessary maintenance scripts, respecting their dependencies:
     
     1. COMPRESS IMAGES (compress_all_website_images.py)
        - Compresses all JPG/PNG images across the entire site
@@ -30,13 +30,30 @@ WHAT IT DOES:
     
     4. GENERATE OVERVIEW MANIFEST (generate_overview_manifest.py)
        - Scans overview image directory
-       - Generates overview_manifest.json
+       - Generates overview_manifest.json and overview_details.json
        - Lists all showcase images
     
     5. UPDATE SITE HISTORY (update_site_history.py)
        - Reads all manifests
        - Generates history.json with 5 most recent updates
        - Displays on homepage
+    
+    6. GENERATE IMAGE DERIVATIVES (generate_image_derivatives.py)
+       - Writes WebP/AVIF copies of every image at several widths to
+         src/resources/derivatives/
+       - Generates derivatives_manifest.json, which script.js uses to
+         build srcset
+       - Only regenerates images whose content changed
+    
+    7. CONVERT ANIMATED GIFS (convert_animated_gifs.py)
+       - Writes every animated GIF as a looping WebM/MP4 plus a poster
+         frame to src/resources/derivatives/
+       - Generates animations_manifest.json, which script.js uses to
+         show the videos instead of the GIFs
+       - Only converts GIFs whose content changed
+
+    After all steps, a full run also updates the "last updated" date in
+    index.html.
 
 EXECUTION ORDER:
     The order is important because:
@@ -44,11 +61,29 @@ EXECUTION ORDER:
     - Manifests must exist before history can be updated
     - All changes should be complete before deployment
 
+    Each step declares the steps it depends on (see STEPS below):
+
+        images ──┬──> overview
+                 ├──> derivatives
+                 ├──> manifests ──> history
+        audio ───┘
+        animations
+
+    Steps whose dependencies have finished run at the same time, up to
+    the worker limit set with --jobs. Image and audio compression do not
+    depend on each other, so they run side by side.
+
 BEHAVIOR:
-    - SEQUENTIAL: Runs one script at a time
+    - PARALLEL: Independent steps run concurrently (--jobs N, default 2;
+      not with --in-process)
     - PROGRESS TRACKING: Shows status of each step
     - ERROR HANDLING: Continues even if one step fails
     - SUMMARY REPORT: Shows final results for all steps
+    - PROFILE: Wall time and ffmpeg/ffprobe CPU time of every step, and of
+      every file the compression steps examine, with bytes in/out/saved,
+      are written to scripts/.last_run_profile.json (see build_profile.py).
+      The summary lists the slowest files and the change in total time
+      since the previous run
     - EXIT CODE: Returns 0 if all succeed, 1 if any fail
 
 IDEMPOTENCY:
@@ -59,11 +94,19 @@ IDEMPOTENCY:
     - No degradation from repeated runs
 
 SCRIPT INVOCATION:
-    Each script is run as a subprocess with:
+    By default each step script runs as its own Python subprocess, so
+    steps running side by side share nothing:
     - Current working directory: Repository root
-    - Output: Displayed in real-time
-    - Error handling: Captures exit codes
-    - Isolation: Each script runs independently
+    - Output: Displayed in real-time, each line prefixed with the step
+      name (e.g. "[images] ...") so interleaved logs stay readable
+    - Error handling: The script's exit code
+    - Timing: Wall time of every step is shown in the summary
+
+    --in-process imports every step script (an importable module whose
+    main(argv) returns an exit status) and calls it in this interpreter,
+    so no step pays for Python startup and re-imports. The steps change
+    process-wide state (sys.stdout, module globals), so in this mode they
+    run ONE AT A TIME whatever --jobs says.
 
 DEPENDENCIES:
     - Python 3.6+
@@ -72,6 +115,27 @@ DEPENDENCIES:
 
 USAGE:
     python scripts/update_website.py
+    python scripts/update_website.py --jobs 4
+    python scripts/update_website.py --jobs 1    (one step at a time)
+    python scripts/update_website.py --watch     (rebuild on change)
+    python scripts/update_website.py --in-process  (no subprocesses, one step at a time)
+
+WATCH MODE:
+    --watch keeps the script running and polls src/blogs, src/poems,
+    src/bio and src/resources/images for changes (no extra packages
+    needed). Bursts of changes, such as copying a folder of images, are
+    collected until things have been quiet for a second, then only the
+    affected steps run:
+    - New/changed JPG/PNG      -> compress just those images, then
+                                  refresh their derivatives
+    - Overview image changes   -> regenerate the overview manifest
+    - New/changed/deleted GIF  -> convert animated GIFs (unchanged ones
+                                  are skipped)
+    - Audio file changes       -> compress audio (cached files are skipped)
+    - Blog/poem folder changes -> regenerate that manifest (--only blogs or
+                                  --only poems), then update site history
+    The "last updated" date in index.html is only touched by a full run.
+    Press Ctrl+C to stop.
 
 OUTPUT:
     Shows progress for each step with status indicators:
@@ -79,35 +143,59 @@ OUTPUT:
     Website Update Script
     ----------------------------------------
     
-    Running: Compressing all images
-      [... output from compress_all_website_images.py ...]
-      Completed: Compressing all images
+    Parallel steps: 2
+    Execution: one subprocess per step
     
+    Running: Compressing all images
     Running: Compressing all audio files
-      [... output from compress_all_audio_files.py ...]
+    [images] [... output from compress_all_website_images.py ...]
+    [audio] [... output from compress_all_audio_files.py ...]
       Completed: Compressing all audio files
     
-    Running: Generating content manifests
-      [... output from generate_content_manifests.py ...]
-      Completed: Generating content manifests
+    Running: Converting animated GIFs
+    [animations] [... output from convert_animated_gifs.py ...]
+      Completed: Converting animated GIFs
+      Completed: Compressing all images
     
+    Running: Generating content manifests
     Running: Generating overview manifest
-      [... output from generate_overview_manifest.py ...]
+    [manifests] [... output from generate_content_manifests.py ...]
+    [overview] [... output from generate_overview_manifest.py ...]
+      Completed: Generating content manifests
       Completed: Generating overview manifest
     
     Running: Updating site history
-      [... output from update_site_history.py ...]
+    Running: Generating responsive image variants
+    [history] [... output from update_site_history.py ...]
+    [derivatives] [... output from generate_image_derivatives.py ...]
       Completed: Updating site history
+      Completed: Generating responsive image variants
+    
+    Updating last modified date...
+      Updated last modified date to: 2026-10-17
     
     Summary:
     ----------------------------------------
-      PASS: Images
-      PASS: Audio
-      PASS: Manifests
-      PASS: Overview
-      PASS: History
+      PASS: Images         12.41s
+      PASS: Audio           3.02s
+      PASS: Manifests       0.01s
+      PASS: Overview        0.00s
+      PASS: History         0.01s
+      PASS: Derivatives     0.04s
+      PASS: Animations      0.01s
+      Total wall time: 12.44s
+    
+    Slowest files:
+    ----------------------------------------
+          Wall ffmpeg CPU     Saved  File
+         4.83s      9.12s   1157 KB  src/blogs/0_optical_mouse/res/sensor.jpg
+         2.95s      2.71s    371 KB  src/poems/5_letter_to_a_faded_friend/track.mp3
+         ...
+    
+    Profile written to scripts/.last_run_profile.json
+      Previous run: 31.07s (-18.63s)
     
-    All updates completed (5/5)
+    All updates completed (7/7)
 
 ERROR HANDLING:
     If a script fails:
@@ -150,14 +238,17 @@ DIRECTORY STRUCTURE:
     │   ├── compress_all_audio_files.py
     │   ├── generate_content_manifests.py
     │   ├── generate_overview_manifest.py
-    │   └── update_site_history.py
+    │   ├── update_site_history.py
+    │   ├── generate_image_derivatives.py
+    │   ├── convert_animated_gifs.py
+    │   └── build_profile.py (timing report helpers)
     └── src/
         ├── blogs/
         ├── poems/
         └── resources/
 
 AUTHOR: Website maintenance scripts
-LAST MODIFIED: 2026-01-16
+LAST MODIFIED: 2026-10-17
 ================================================================================
 """
 
@@ -167,6 +258,96 @@ from pathlib import Path
 import os
 from datetime import datetime
 import re
+import argparse
+import threading
+import time
+import importlib
+import io
+import tempfile
+import build_profile
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+# ----------------------------- CONFIG -----------------------------
+DEFAULT_JOBS = 2             # Steps allowed to run at the same time
+
+# Pipeline steps in summary order. 'depends_on' lists the steps that must
+# have finished before a step may start.
+STEPS = [
+    {'name': 'images', 'script': 'compress_all_website_images.py',
+     'description': 'Compressing all images', 'depends_on': [], 'profiled': True},
+    {'name': 'audio', 'script': 'compress_all_audio_files.py',
+     'description': 'Compressing all audio files', 'depends_on': [], 'profiled': True},
+    {'name': 'manifests', 'script': 'generate_content_manifests.py',
+     'description': 'Generating content manifests', 'depends_on': ['images', 'audio']},
+    {'name': 'overview', 'script': 'generate_overview_manifest.py',
+     'description': 'Generating overview manifest', 'depends_on': ['images']},
+    {'name': 'history', 'script': 'update_site_history.py',
+     'description': 'Updating site history', 'depends_on': ['manifests']},
+    {'name': 'derivatives', 'script': 'generate_image_derivatives.py',
+     'description': 'Generating responsive image variants', 'depends_on': ['images']},
+    {'name': 'animations', 'script': 'convert_animated_gifs.py',
+     'description': 'Converting animated GIFs', 'depends_on': []},
+]
+
+# Steps marked 'profiled' accept --profile PATH and report per-file figures
+PROFILE_TOP_FILES = 10       # Rows in the "slowest files" table
+
+# Watch mode (--watch)
+WATCH_DIRS = ['src/blogs', 'src/poems', 'src/bio', 'src/resources/images']
+WATCH_POLL_SECONDS = 0.5     # How often the watched folders are scanned
+WATCH_DEBOUNCE_SECONDS = 1.0 # Quiet time after the last change before rebuilding
+IMAGE_EXTS = {'.jpg', '.jpeg', '.png'}
+AUDIO_EXTS = {'.mp3', '.wav', '.ogg', '.flac', '.m4a', '.aac'}
+# Files written by the pipeline itself; changes to them never trigger a rebuild
+GENERATED_FILES = {'blogs_manifest.json', 'poems_manifest.json', 'overview_manifest.json', 'overview_details.json'}
+# ------------------------------------------------------------------
+
+_print_lock = threading.Lock()
+_console = sys.stdout
+
+def log(message):
+    """Print a line without interleaving it with output from other steps."""
+    with _print_lock:
+        print(message, file=_console, flush=True)
+
+class StepOutput(io.TextIOBase):
+    """Stand-in for sys.stdout/sys.stderr while steps run in-process.
+    
+    Each step runs in its own thread; text written from a step's thread is
+    split into lines and logged with that step's prefix. Writes from any
+    other thread pass straight through.
+    """
+    
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+    
+    def begin(self, prefix):
+        self.local.prefix = prefix
+        self.local.partial = ''
+    
+    def end(self):
+        if getattr(self.local, 'partial', ''):
+            log(f"{self.local.prefix}{self.local.partial}")
+        self.local.prefix = None
+        self.local.partial = ''
+    
+    def writable(self):
+        return True
+    
+    def write(self, text):
+        prefix = getattr(self.local, 'prefix', None)
+        if prefix is None:
+            return self.stream.write(text)
+        
+        *lines, self.local.partial = (self.local.partial + text).split('\n')
+        for line in lines:
+            log(f"{prefix}{line.rstrip()}")
+        return len(text)
+    
+    def flush(self):
+        if getattr(self.local, 'prefix', None) is None:
+            self.stream.flush()
 
 def update_last_modified_date():
     """Update the 'last updated' date in index.html."""
@@ -204,57 +385,371 @@ def update_last_modified_date():
         print(f"  Error updating date: {e}")
         return False
 
-def run_script(script_name, description):
-    """Run a Python script and report results."""
-    print(f"Running: {description}")
+def wait_for_step(process, usage=None):
+    """Wait for a step's subprocess and return its exit code. With 'usage', also store
+    the CPU time of that process and its own children (ffmpeg/ffprobe) in
+    usage['child_cpu_seconds']: os.wait4 reports it for this one process, so steps
+    running side by side are never charged for each other."""
+    if not hasattr(os, 'wait4'):  # Windows
+        return process.wait()
+    _, status, rusage = os.wait4(process.pid, 0)
+    process.returncode = os.waitstatus_to_exitcode(status)
+    if usage is not None:
+        usage['child_cpu_seconds'] = round(rusage.ru_utime + rusage.ru_stime, 3)
+    return process.returncode
+
+def run_script(script_name, description, prefix=None, args=(), usage=None):
+    """Run a Python script, streaming its output with an optional prefix, and report results.
+    'usage' receives the script's CPU time (see wait_for_step())."""
+    log(f"Running: {description}")
     
     script_path = Path(__file__).parent / script_name
     
     if not script_path.exists():
-        print(f"  Warning: {script_name} not found, skipping")
+        log(f"  Warning: {script_name} not found, skipping")
         return False
     
+    tag = f"[{prefix}] " if prefix else ""
+    
+    # Unbuffered UTF-8 output so lines arrive as they are printed, whatever the console encoding
+    env = dict(os.environ, PYTHONUNBUFFERED='1', PYTHONIOENCODING='utf-8')
+    
     try:
-        result = subprocess.run(
-            [sys.executable, str(script_path)],
+        with subprocess.Popen(
+            [sys.executable, str(script_path), *args],
             cwd=Path(__file__).parent.parent,
-            capture_output=False,
-            text=True
-        )
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            env=env,
+            text=True,
+            encoding='utf-8',
+            errors='replace'
+        ) as process:
+            for line in process.stdout:
+                log(f"{tag}{line.rstrip()}")
+            
+            returncode = wait_for_step(process, usage)
         
-        if result.returncode == 0:
-            print(f"  Completed: {description}")
+        if returncode == 0:
+            log(f"  Completed: {description}")
             return True
         else:
-            print(f"  Failed: {description} (exit code {result.returncode})")
+            log(f"  Failed: {description} (exit code {returncode})")
             return False
             
     except Exception as e:
-        print(f"  Error: {description} - {e}")
+        log(f"  Error: {description} - {e}")
         return False
 
-def main():
-    print("\nWebsite Update Script")
-    print("-" * 40)
+def run_in_process(script_name, description, prefix=None, args=(), usage=None):
+    """Import a script as a module and call its main(argv), reporting results like run_script().
+    'usage' is left empty: timed() measures in-process steps, which run one at a time."""
+    log(f"Running: {description}")
+    
+    script_path = Path(__file__).parent / script_name
+    
+    if not script_path.exists():
+        log(f"  Warning: {script_name} not found, skipping")
+        return False
+    
+    tag = f"[{prefix}] " if prefix else ""
+    stdout, stderr = sys.stdout, sys.stderr
     
+    for stream in (stdout, stderr):
+        if isinstance(stream, StepOutput):
+            stream.begin(tag)
+    
+    try:
+        module = importlib.import_module(script_path.stem)
+        try:
+            returncode = module.main(list(args))
+        except SystemExit as e:
+            returncode = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        returncode = returncode or 0
+    except Exception as e:
+        for stream in (stdout, stderr):
+            if isinstance(stream, StepOutput):
+                stream.end()
+        log(f"  Error: {description} - {e}")
+        return False
+    
+    for stream in (stdout, stderr):
+        if isinstance(stream, StepOutput):
+            stream.end()
+    
+    if returncode == 0:
+        log(f"  Completed: {description}")
+        return True
+    else:
+        log(f"  Failed: {description} (exit code {returncode})")
+        return False
+
+def timed(runner, *args):
+    """Call a step runner and return its result with wall and child CPU time.
+    A subprocess step reports its own CPU time; for in-process steps (never run side
+    by side) it is this process's child CPU time while the step ran."""
+    usage = {}
+    cpu_before = build_profile.child_cpu_seconds()
+    started = time.perf_counter()
+    success = runner(*args, usage=usage)
+    wall_seconds = round(time.perf_counter() - started, 3)
+    if 'child_cpu_seconds' not in usage:
+        usage['child_cpu_seconds'] = build_profile.cpu_delta(cpu_before, build_profile.child_cpu_seconds())
+    return {
+        'success': success,
+        'wall_seconds': wall_seconds,
+        'child_cpu_seconds': usage['child_cpu_seconds'],
+    }
+
+def run_steps(steps, jobs, in_process=False, profile_dir=None):
+    """Run steps concurrently in dependency order, returning {name: timing} in step order.
+    Dependencies on steps that aren't in 'steps' count as already satisfied.
+    Each step runs as a subprocess; 'in_process' calls the scripts' main() in this
+    interpreter instead, one step at a time (they are not thread-safe).
+    With 'profile_dir', profiled steps write their per-file figures to <profile_dir>/<name>.json."""
+    runner = run_in_process if in_process else run_script
+    if in_process:
+        jobs = 1
     results = {}
+    pending = list(steps)
+    running = {}
+    scheduled = {step['name'] for step in steps}
+    
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        while pending or running:
+            # Start every step whose dependencies have all finished (pass or fail)
+            for step in list(pending):
+                if len(running) >= jobs:
+                    break
+                if all(dep in results for dep in step['depends_on'] if dep in scheduled):
+                    pending.remove(step)
+                    args = list(step.get('args', ()))
+                    if profile_dir is not None and step.get('profiled'):
+                        args += ['--profile', str(Path(profile_dir) / f"{step['name']}.json")]
+                    future = pool.submit(timed, runner, step['script'], step['description'],
+                                         step['name'], args)
+                    running[future] = step
+            
+            if not running:
+                # Remaining steps depend on something that will never run
+                for step in pending:
+                    log(f"  Failed: {step['description']} (unmet dependencies: {', '.join(step['depends_on'])})")
+                    results[step['name']] = {'success': False, 'wall_seconds': 0.0, 'child_cpu_seconds': None}
+                break
+            
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                step = running.pop(future)
+                results[step['name']] = future.result()
+    
+    return {step['name']: results[step['name']] for step in steps}
+
+def write_profile(results, total_seconds, profile_dir):
+    """Combine step timings and per-file records into the run report; returns the report."""
+    steps = {}
+    for name, timing in results.items():
+        files = build_profile.read_step_files(Path(profile_dir) / f"{name}.json")
+        steps[name] = dict(timing,
+                           bytes_in=sum(f['bytes_in'] for f in files),
+                           bytes_out=sum(f['bytes_out'] for f in files),
+                           bytes_saved=sum(f['bytes_saved'] for f in files),
+                           files=files)
     
-    # Step 1: Compress all images
-    results['images'] = run_script('compress_all_website_images.py', 'Compressing all images')
+    report = {
+        'finished': datetime.now().isoformat(timespec='seconds'),
+        'total_seconds': round(total_seconds, 3),
+        'steps': steps,
+    }
+    build_profile.save_report(report)
+    return report
+
+def print_profile(report, previous):
+    """Print the slowest files of a run and how its total compares with the previous run."""
+    slowest = build_profile.slowest_files(report, PROFILE_TOP_FILES)
+    if slowest:
+        print("\nSlowest files:")
+        print("-" * 40)
+        print(f"  {'Wall':>8} {'ffmpeg CPU':>10} {'Saved':>9}  File")
+        for _, record in slowest:
+            print(f"  {build_profile.format_seconds(record['wall_seconds']):>8} "
+                  f"{build_profile.format_seconds(record['child_cpu_seconds']):>10} "
+                  f"{build_profile.format_kb(record['bytes_saved']):>9}  {record['file']}")
+    
+    print(f"\nProfile written to {build_profile.REPORT_FILE.relative_to(Path(__file__).parent.parent)}")
+    if previous is not None:
+        change = report['total_seconds'] - previous['total_seconds']
+        print(f"  Previous run: {previous['total_seconds']:.2f}s ({change:+.2f}s)")
+
+def snapshot_watched_files(repo_root):
+    """Map every file under the watched folders to (mtime, size)."""
+    snapshot = {}
+    for watch_dir in WATCH_DIRS:
+        base = repo_root / watch_dir
+        if not base.exists():
+            continue
+        for path in base.rglob('*'):
+            if path.name in GENERATED_FILES or path.name.startswith('.'):
+                continue
+            try:
+                if path.is_file():
+                    stat = path.stat()
+                    snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                pass  # Removed while scanning
+    return snapshot
+
+def changed_files(before, after):
+    """Paths added, removed or modified between two snapshots."""
+    return {path for path in before.keys() | after.keys() if before.get(path) != after.get(path)}
+
+def plan_rebuild(changed, repo_root):
+    """Decide which steps a set of changed files needs, with per-step arguments.
+    Returns {step name: [args]}, or an empty dict when nothing has to run."""
+    plan = {}
+    new_images = []
+    manifests = set()
     
-    # Step 2: Compress all audio files
-    results['audio'] = run_script('compress_all_audio_files.py', 'Compressing all audio files')
+    for path in sorted(changed):
+        rel_parts = path.relative_to(repo_root).parts
+        area = rel_parts[1] if len(rel_parts) > 1 else ''   # blogs, poems, bio, resources
+        suffix = path.suffix.lower()
+        
+        if suffix in IMAGE_EXTS:
+            if path.exists():
+                new_images.append(str(path))
+            # Also covers deleted images, whose derivatives get removed
+            plan['derivatives'] = []
+            if rel_parts[:4] == ('src', 'resources', 'images', 'overview'):
+                plan['overview'] = []
+        elif suffix == '.gif':
+            plan['animations'] = []  # Also covers deleted GIFs, whose videos get removed
+        elif suffix in AUDIO_EXTS and path.exists():
+            plan['audio'] = []
+        
+        # Any change inside a blog/poem folder (markdown, added/removed files) can change its entry
+        if area in ('blogs', 'poems'):
+            manifests.add(area)
     
-    # Step 3: Generate manifests (blogs and poems)
-    results['manifests'] = run_script('generate_content_manifests.py', 'Generating content manifests')
+    if new_images:
+        plan['images'] = new_images
     
-    # Step 4: Generate overview image manifest
-    results['overview'] = run_script('generate_overview_manifest.py', 'Generating overview manifest')
+    if manifests:
+        plan['manifests'] = ['--only', manifests.pop()] if len(manifests) == 1 else []
+        plan['history'] = []
     
-    # Step 5: Update history
-    results['history'] = run_script('update_site_history.py', 'Updating site history')
+    return plan
+
+def rebuild_outputs(plan):
+    """Return a test for watched files the planned steps write themselves: the images
+    they compress and, when audio runs, the audio files it encodes or replaces.
+    (Generated manifests are never watched; derivatives and history live elsewhere.)"""
+    images = {Path(path) for path in plan.get('images', [])}
+    audio = 'audio' in plan
     
-    # Step 6: Update last modified date in index.html
+    def written(path):
+        return path in images or (audio and path.suffix.lower() in AUDIO_EXTS | {'.opus'})
+    return written
+
+def rebuild(changed, repo_root, jobs, in_process=False):
+    """Run only the steps affected by the changed files; returns the plan that ran."""
+    plan = plan_rebuild(changed, repo_root)
+    
+    names = ', '.join(sorted(str(path.relative_to(repo_root)) for path in changed)[:5])
+    more = f" (+{len(changed) - 5} more)" if len(changed) > 5 else ""
+    log(f"\nChanged: {names}{more}")
+    
+    if not plan:
+        log("  Nothing to rebuild")
+        return plan
+    
+    steps = [dict(step, args=plan[step['name']]) for step in STEPS if step['name'] in plan]
+    started = time.monotonic()
+    results = run_steps(steps, jobs, in_process)
+    
+    status = ', '.join(f"{'PASS' if r['success'] else 'FAIL'}: {name.capitalize()} {r['wall_seconds']:.1f}s"
+                       for name, r in results.items())
+    log(f"Rebuilt in {time.monotonic() - started:.1f}s ({status})")
+    return plan
+
+def watch(jobs, in_process=False):
+    """Poll the content folders and run targeted rebuilds until interrupted."""
+    repo_root = Path(__file__).parent.parent.resolve()
+    
+    print("\nWebsite Watch Mode")
+    print("-" * 40)
+    for watch_dir in WATCH_DIRS:
+        print(f"  Watching: {watch_dir}")
+    print("Press Ctrl+C to stop\n")
+    
+    previous = snapshot_watched_files(repo_root)
+    pending = set()
+    last_change = 0.0
+    
+    try:
+        while True:
+            time.sleep(WATCH_POLL_SECONDS)
+            current = snapshot_watched_files(repo_root)
+            changed = changed_files(previous, current)
+            previous = current
+            
+            if changed:
+                # Keep collecting while a burst (e.g. a folder copy) is still arriving
+                pending |= changed
+                last_change = time.monotonic()
+                continue
+            
+            if pending and time.monotonic() - last_change >= WATCH_DEBOUNCE_SECONDS:
+                written = rebuild_outputs(rebuild(pending, repo_root, jobs, in_process))
+                previous = snapshot_watched_files(repo_root)
+                # Files the rebuild wrote itself are not new edits; anything else that
+                # changed while it ran was edited in the meantime and gets its own rebuild
+                pending = {path for path in changed_files(current, previous) if not written(path)}
+                if pending:
+                    last_change = time.monotonic()
+    except KeyboardInterrupt:
+        print("\nStopped watching\n")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run all website maintenance scripts.")
+    parser.add_argument('--jobs', '-j', type=int, default=DEFAULT_JOBS,
+                        help=f"maximum number of steps to run at the same time (default: {DEFAULT_JOBS})")
+    parser.add_argument('--watch', action='store_true',
+                        help="keep running and rebuild only what changes under src/")
+    parser.add_argument('--in-process', action='store_true',
+                        help="call the step scripts in this interpreter instead of one subprocess per step "
+                             "(steps then run one at a time)")
+    args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    return args
+
+def main():
+    args = parse_args()
+    
+    if args.in_process:
+        # Steps import each other's modules and expect the repository root as working directory
+        os.chdir(Path(__file__).parent.parent)
+        sys.stdout = StepOutput(sys.stdout)
+        sys.stderr = StepOutput(sys.stderr)
+    
+    if args.watch:
+        watch(args.jobs, args.in_process)
+        return
+    
+    print("\nWebsite Update Script")
+    print("-" * 40)
+    print(f"Parallel steps: {1 if args.in_process else args.jobs}")
+    print(f"Execution: {'in-process, one step at a time' if args.in_process else 'one subprocess per step'}\n")
+    
+    # Every step in STEPS, each as soon as its dependencies have finished
+    previous_profile = build_profile.load_report()
+    with tempfile.TemporaryDirectory(prefix='update_website_profile_') as profile_dir:
+        started = time.perf_counter()
+        results = run_steps(STEPS, args.jobs, args.in_process, profile_dir)
+        total_seconds = time.perf_counter() - started
+        profile = write_profile(results, total_seconds, profile_dir)
+    
+    # Then the last modified date in index.html (full runs only, so not a step)
     print("\nUpdating last modified date...")
     update_last_modified_date()
     
@@ -262,12 +757,15 @@ def main():
     print("\nSummary:")
     print("-" * 40)
     
-    success_count = sum(1 for v in results.values() if v)
+    success_count = sum(1 for r in results.values() if r['success'])
     total_count = len(results)
     
-    for step, success in results.items():
-        status = "PASS" if success else "FAIL"
-        print(f"  {status}: {step.capitalize()}")
+    for step, r in results.items():
+        status = "PASS" if r['success'] else "FAIL"
+        print(f"  {status}: {step.capitalize():<12} {r['wall_seconds']:7.2f}s")
+    print(f"  Total wall time: {total_seconds:.2f}s")
+    
+    print_profile(profile, previous_profile)
     
     if success_count == total_count:
         print(f"\nAll updates completed ({success_count}/{total_count})")
@@ -11,14 +11,134 @@ How to use:
    → Images will be automatically renamed to 1.jpg, 2.jpg, 3.jpg, ...
 
 No buttons, fully drag-and-drop!
+
+Thumbnails are decoded once per file version (path + mtime + size) and kept
+in a bounded in-memory LRU cache, plus a disk cache in scripts/.media_cache/
+when the script sits in the website repo. The disk cache is bounded too: on
+startup only the THUMB_DISK_ENTRIES most recently used thumbnails are kept
+(renaming the images leaves the old ones unused). Moving images around reuses the
+existing widgets instead of rebuilding both panels.
+
+The window opens straight away with grey placeholders; thumbnails are decoded
+by a background thread pool (JPEGs at reduced DCT scale via Image.draft) and
+filled in as they arrive, so startup doesn't depend on the number of images.
 """
 
 import os
+import queue
+import hashlib
 import tkinter as tk
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from tkinter import messagebox
 from pathlib import Path
 from PIL import Image, ImageTk
 
+THUMB_SIZE = (130, 130)
+THUMB_CACHE_ENTRIES = 128   # Decoded thumbnails kept in memory (LRU)
+THUMB_DISK_ENTRIES = 512    # Thumbnails kept in the disk cache (most recently used)
+THUMB_WORKERS = max(2, min(8, os.cpu_count() or 2))  # Pillow releases the GIL while decoding
+THUMB_POLL_MS = 30          # How often the Tk loop picks up finished thumbnails
+PLACEHOLDER_COLOR = "#dddddd"
+
+
+def default_disk_cache():
+    """scripts/.media_cache/thumbs when this script sits in the website repo
+    (src/resources/images/overview/), otherwise None (memory only)."""
+    here = Path(__file__).resolve()
+    if len(here.parents) > 4 and (here.parents[4] / "scripts").is_dir():
+        return here.parents[4] / "scripts" / ".media_cache" / "thumbs"
+    return None
+
+
+class ThumbnailCache:
+    """Thumbnails keyed by path, mtime and size: LRU in memory, optionally on disk."""
+
+    def __init__(self, max_entries=THUMB_CACHE_ENTRIES, disk_dir=None, max_disk_entries=THUMB_DISK_ENTRIES):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.disk_dir = disk_dir
+        if disk_dir is not None:
+            self.prune_disk(max_disk_entries)
+
+    def prune_disk(self, max_disk_entries):
+        """Delete all but the max_disk_entries most recently used thumbnails on disk."""
+        try:
+            files = [(path.stat().st_mtime_ns, path) for path in self.disk_dir.glob("*.png")]
+        except OSError:
+            return
+        files.sort(reverse=True)
+        for _, path in files[max_disk_entries:]:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    def key(self, path):
+        stat = path.stat()
+        return (str(path), stat.st_mtime_ns, stat.st_size)
+
+    def cached(self, path):
+        """The thumbnail (a PIL image) if it is in memory, else None. Tk thread only."""
+        try:
+            key = self.key(path)
+        except OSError:
+            return None
+        thumb = self.entries.get(key)
+        if thumb is not None:
+            self.entries.move_to_end(key)
+        return thumb
+
+    def load(self, path):
+        """(key, thumbnail) from the disk cache or by decoding path. Safe in worker threads;
+        the caller hands the result to put() on the Tk thread."""
+        key = self.key(path)
+        thumb = self._load_disk(key)
+        if thumb is None:
+            thumb = make_thumbnail(path)
+            self._save_disk(key, thumb)
+        return key, thumb
+
+    def put(self, key, thumb):
+        self.entries[key] = thumb
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def _disk_path(self, key):
+        name = hashlib.sha1(repr((key, THUMB_SIZE)).encode()).hexdigest()
+        return self.disk_dir / f"{name}.png"
+
+    def _load_disk(self, key):
+        if self.disk_dir is None:
+            return None
+        disk_path = self._disk_path(key)
+        try:
+            with Image.open(disk_path) as img:
+                img.load()
+                thumb = img.copy()
+            os.utime(disk_path)  # Recently used: kept by prune_disk()
+            return thumb
+        except (OSError, ValueError):
+            return None
+
+    def _save_disk(self, key, thumb):
+        if self.disk_dir is None:
+            return
+        try:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+            thumb.save(self._disk_path(key))
+        except OSError:
+            pass  # The disk cache is only an optimisation
+
+
+def make_thumbnail(path):
+    with Image.open(path) as img:
+        img.draft(None, THUMB_SIZE)  # JPEG: let the decoder scale down by 1/2, 1/4 or 1/8
+        img.thumbnail(THUMB_SIZE, Image.Resampling.LANCZOS)
+        return img.convert("RGBA" if img.mode in ("RGBA", "LA", "P") else "RGB")
+
+
 class DragDropImageSorter:
     def __init__(self, root):
         self.root = root
@@ -29,8 +149,16 @@ class DragDropImageSorter:
         self.available_images = []  # Paths still on left
         self.ordered_images = []    # Final order on right
         self.drag_data = {}         # For drag-and-drop state
-        self.thumb_refs = []
+        self.thumbs = ThumbnailCache(disk_dir=default_disk_cache())
+        self.pool = ThreadPoolExecutor(max_workers=THUMB_WORKERS)
+        self.decoded = queue.Queue()  # (path, future) from the worker threads
+        self.pending = set()          # Paths being decoded
+        self.unreadable = set()       # Paths Pillow couldn't decode (not shown)
+        self.placeholder = ImageTk.PhotoImage(Image.new("RGB", THUMB_SIZE, PLACEHOLDER_COLOR))
+        self.left_labels = {}       # path -> thumbnail label on the left
+        self.right_rows = {}        # path -> (frame, number label, thumbnail label) on the right
         self.selected_left = None   # Selected image on left
+        self.selected_left_label = None
         self.selected_right = None  # Selected index on right
 
         # Header + folder info
@@ -117,7 +245,7 @@ class DragDropImageSorter:
         
         if not all_images:
             messagebox.showinfo("No Images", "No JPG/JPEG/GIF files found in this folder.")
-            self.root.destroy()
+            self.on_closing()
             return
 
         # Separate numbered images from others
@@ -144,36 +272,84 @@ class DragDropImageSorter:
         self.rebuild_left_grid()
         if self.ordered_images:
             self.rebuild_right_panel()
+        self.root.after(THUMB_POLL_MS, self.poll_thumbnails)
+
+    def photo_for(self, path):
+        """PhotoImage of the thumbnail if it is in memory. Otherwise the placeholder is
+        returned and the thumbnail is decoded in the background (see poll_thumbnails)."""
+        thumb = self.thumbs.cached(path)
+        if thumb is not None:
+            return ImageTk.PhotoImage(thumb)
+
+        if path not in self.pending:
+            self.pending.add(path)
+            future = self.pool.submit(self.thumbs.load, path)
+            future.add_done_callback(lambda f, p=path: self.decoded.put((p, f)))
+        return self.placeholder
+
+    def poll_thumbnails(self):
+        """Put finished thumbnails into their widgets (on the Tk thread, via root.after)."""
+        failed = False
+        while True:
+            try:
+                path, future = self.decoded.get_nowait()
+            except queue.Empty:
+                break
 
-    def rebuild_left_grid(self):
-        for widget in self.left_grid.winfo_children():
-            widget.destroy()
+            self.pending.discard(path)
+            try:
+                key, thumb = future.result()
+            except Exception:
+                self.unreadable.add(path)
+                failed = True
+                continue
+
+            self.thumbs.put(key, thumb)
+            photo = ImageTk.PhotoImage(thumb)
+            labels = [self.left_labels.get(path), self.right_rows.get(path, (None, None, None))[2]]
+            for label in labels:
+                if label is not None:
+                    label.configure(image=photo)
+                    label.image = photo
+
+        if failed:
+            # Images that can't be opened are left out of both panels
+            self.rebuild_left_grid()
+            self.rebuild_right_panel()
+        self.root.after(THUMB_POLL_MS, self.poll_thumbnails)
 
-        # Clear selection since widgets are destroyed
-        self.selected_left = None
-        self.selected_left_label = None
+    def rebuild_left_grid(self):
+        """Sync the left grid with available_images: new paths get a label, removed ones
+        lose theirs and the rest are only re-gridded."""
+        for path in list(self.left_labels):
+            if path not in self.available_images or path in self.unreadable:
+                label = self.left_labels.pop(path)
+                if label is self.selected_left_label:
+                    self.selected_left = None
+                    self.selected_left_label = None
+                label.destroy()
 
         cols = 6
-        size = (130, 130)
-
-        for i, path in enumerate(self.available_images):
-            try:
-                img = Image.open(path)
-                img.thumbnail(size, Image.Resampling.LANCZOS)
-                photo = ImageTk.PhotoImage(img)
-                self.thumb_refs.append(photo)
-
-                label = tk.Label(self.left_grid, image=photo, bg="white", bd=2, relief="raised", cursor="hand2")
-                label.grid(row=i // cols, column=i % cols, padx=8, pady=8)
-                label.path = path  # Attach path
-                label.bind("<Button-1>", lambda e, lbl=label, p=path: self.select_left(lbl, p))
-                label.bind("<Double-Button-1>", lambda e, p=path: self.move_to_right(p))
-            except:
-                pass
+        shown = [p for p in self.available_images if p in self.left_labels or self.add_left_label(p)]
+        for i, path in enumerate(shown):
+            self.left_labels[path].grid(row=i // cols, column=i % cols, padx=8, pady=8)
+
+    def add_left_label(self, path):
+        if path in self.unreadable:
+            return False
+        photo = self.photo_for(path)
+
+        label = tk.Label(self.left_grid, image=photo, bg="white", bd=2, relief="raised", cursor="hand2")
+        label.image = photo
+        label.path = path  # Attach path
+        label.bind("<Button-1>", lambda e, lbl=label, p=path: self.select_left(lbl, p))
+        label.bind("<Double-Button-1>", lambda e, p=path: self.move_to_right(p))
+        self.left_labels[path] = label
+        return True
     
     def select_left(self, label, path):
         # Deselect previous
-        if hasattr(self, 'selected_left_label') and self.selected_left_label:
+        if self.selected_left_label:
             try:
                 self.selected_left_label.configure(bd=2, relief="raised")
             except:
@@ -234,54 +410,60 @@ class DragDropImageSorter:
         self.rebuild_right_panel()
 
     def rebuild_right_panel(self):
-        for widget in self.right_frame.winfo_children():
-            widget.destroy()
-
-        size = (130, 130)
+        """Sync the right panel with ordered_images: rows are created or destroyed only
+        for added/removed paths; existing rows are re-packed and renumbered."""
+        for path in list(self.right_rows):
+            if path not in self.ordered_images or path in self.unreadable:
+                self.right_rows.pop(path)[0].destroy()
 
         for i, path in enumerate(self.ordered_images):
-            try:
-                img = Image.open(path)
-                img.thumbnail(size, Image.Resampling.LANCZOS)
-                photo = ImageTk.PhotoImage(img)
-                self.thumb_refs.append(photo)
-
-                frame = tk.Frame(self.right_frame, bg="#f8f8f8", cursor="hand2")
-                frame.pack(fill="x", pady=4, padx=10)
-                frame.bind("<Button-1>", lambda e, idx=i: self.select_right(idx))
-
-                num = tk.Label(frame, text=f"{i+1}.", font=("Helvetica", 12, "bold"), bg="#f8f8f8", width=4, cursor="hand2")
-                num.pack(side="left")
-                num.bind("<Button-1>", lambda e, idx=i: self.select_right(idx))
-
-                label = tk.Label(frame, image=photo, bg="white", bd=2, relief="sunken", cursor="hand2")
-                label.image = photo
-                label.pack(side="left", padx=8)
-                label.bind("<Button-1>", lambda e, idx=i: self.select_right(idx))
-                
-                # Store frame reference for selection highlighting
-                frame.idx = i
-            except:
-                pass
-    
+            if path not in self.right_rows and not self.add_right_row(path):
+                continue  # Undecodable: not shown, but still renamed in this position
+            frame, num, _ = self.right_rows[path]
+            frame.pack_forget()
+            frame.pack(fill="x", pady=4, padx=10)
+            num.configure(text=f"{i+1}.")
+
+        self.highlight_right()
+
+    def add_right_row(self, path):
+        if path in self.unreadable:
+            return False
+        photo = self.photo_for(path)
+
+        select = lambda e, p=path: self.select_right(self.ordered_images.index(p))
+
+        frame = tk.Frame(self.right_frame, bg="#f8f8f8", cursor="hand2")
+        frame.bind("<Button-1>", select)
+
+        num = tk.Label(frame, font=("Helvetica", 12, "bold"), bg="#f8f8f8", width=4, cursor="hand2")
+        num.pack(side="left")
+        num.bind("<Button-1>", select)
+
+        label = tk.Label(frame, image=photo, bg="white", bd=2, relief="sunken", cursor="hand2")
+        label.image = photo
+        label.pack(side="left", padx=8)
+        label.bind("<Button-1>", select)
+
+        self.right_rows[path] = (frame, num, label)
+        return True
+
     def select_right(self, idx):
-        # Deselect all frames
-        for widget in self.right_frame.winfo_children():
-            widget.configure(bg="#f8f8f8")
-            for child in widget.winfo_children():
-                if isinstance(child, tk.Label):
-                    if child.cget("text").endswith("."):
-                        child.configure(bg="#f8f8f8")
-        
-        # Select clicked frame
         self.selected_right = idx
-        clicked_frame = list(self.right_frame.winfo_children())[idx]
-        clicked_frame.configure(bg="#bbdefb")
-        for child in clicked_frame.winfo_children():
-            if isinstance(child, tk.Label) and child.cget("text").endswith("."):
-                child.configure(bg="#bbdefb")
+        self.highlight_right()
+
+    def highlight_right(self):
+        """Colour the row at selected_right, and only that one."""
+        for i, path in enumerate(self.ordered_images):
+            if path not in self.right_rows:
+                continue
+            frame, num, _ = self.right_rows[path]
+            bg = "#bbdefb" if i == self.selected_right else "#f8f8f8"
+            frame.configure(bg=bg)
+            num.configure(bg=bg)
 
     def on_closing(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
         self.root.destroy()
 
     def rename_with_confirmation(self):
@@ -294,7 +476,7 @@ class DragDropImageSorter:
         if result:
             self.rename_images()
             messagebox.showinfo("Done!", f"Successfully renamed {len(self.ordered_images)} images!")
-            self.root.destroy()
+            self.on_closing()
 
     def rename_images(self):
         folder = Path(__file__).parent
@@ -3,6 +3,200 @@ const zoomScales = [1, 1.5, 2];
 let currentImageIndex = 0;
 let imageList = [];
 
+// Responsive variants written by scripts/generate_image_derivatives.py.
+// Manifest paths are relative to src/, the folder this script lives in.
+const SRC_BASE = new URL('.', document.currentScript ? document.currentScript.src : window.location.href);
+const DERIVATIVES_MANIFEST = new URL('resources/derivatives/derivatives_manifest.json', SRC_BASE).href;
+const AVIF_PROBE = 'data:image/avif;base64,AAAAIGZ0eXBhdmlmAAAAAGF2aWZtaWYxbWlhZk1BMUIAAAD5bWV0YQAAAAAAAAAvaGRscgAAAAAAAAAAcGljdAAAAAAAAAAAAAAAAFBpY3R1cmVIYW5kbGVyAAAAAA5waXRtAAAAAAABAAAAHmlsb2MAAAAARAAAAQABAAAAAQAAASEAAAAWAAAAKGlpbmYAAAAAAAEAAAAaaW5mZQIAAAAAAQAAYXYwMUNvbG9yAAAAAGppcHJwAAAAS2lwY28AAAAUaXNwZQAAAAAAAAACAAAAAgAAABBwaXhpAAAAAAMICAgAAAAMYXYxQ4EADAAAAAATY29scm5jbHgAAgACAAIAAAAAF2lwbWEAAAAAAAAAAQABBAECgwQAAAAebWRhdAoFGAA2wCAyDRgAAABQAAAAALATSyg=';
+let derivativesPromise = null;
+
+function loadDerivatives() {
+  if (!derivativesPromise) {
+    const avif = new Promise((resolve) => {
+      const probe = new Image();
+      probe.onload = () => resolve(probe.width > 0);
+      probe.onerror = () => resolve(false);
+      probe.src = AVIF_PROBE;
+    });
+    const manifest = fetch(DERIVATIVES_MANIFEST)
+      .then((res) => (res.ok ? res.json() : {}))
+      .then((data) => data.images || {})
+      .catch(() => ({}));
+    derivativesPromise = Promise.all([manifest, avif]).then(([images, avifSupported]) => ({
+      images,
+      formats: avifSupported ? ['avif', 'webp'] : ['webp'],
+    }));
+  }
+  return derivativesPromise;
+}
+
+// Give an <img> a srcset of its generated variants; the src attribute stays the original
+// (used as the largest candidate and by the lightbox).
+function applyResponsiveImage(img, sizes = '100vw') {
+  img.removeAttribute('srcset');
+  const src = img.getAttribute('src');
+  if (!src || src.startsWith('data:')) return;
+
+  loadDerivatives().then(({ images, formats }) => {
+    if (img.getAttribute('src') !== src) return; // Changed while the manifest loaded
+    const url = new URL(src, window.location.href);
+    if (url.origin !== SRC_BASE.origin || !url.pathname.startsWith(SRC_BASE.pathname)) return;
+
+    const entry = images[decodeURIComponent(url.pathname.slice(SRC_BASE.pathname.length))];
+    if (!entry) return;
+    const format = formats.find((f) => entry.variants.some((v) => v.format === f));
+    if (!format) return;
+
+    const candidates = entry.variants
+      .filter((v) => v.format === format && v.width < entry.width)
+      .map((v) => `${new URL(v.src, SRC_BASE).href} ${v.width}w`);
+    const full = entry.variants.find((v) => v.format === format && v.width === entry.width);
+    candidates.push(`${full ? new URL(full.src, SRC_BASE).href : url.href} ${entry.width}w`);
+
+    img.sizes = sizes;
+    img.srcset = candidates.join(', ');
+  });
+}
+
+function applyResponsiveImages(root) {
+  root.querySelectorAll('img').forEach((img) => applyResponsiveImage(img));
+}
+
+// Reserve an <img>'s box and paint its tiny placeholder until the image has loaded.
+// entry is {width, height, color, placeholder} from the overview or content manifests
+// (scripts/image_placeholders.py). Width/height set by the markdown are kept.
+// With its box reserved the image can load lazily without shifting the layout.
+function applyPlaceholder(img, entry) {
+  img.classList.remove('has-placeholder');
+  img.style.backgroundImage = '';
+  img.style.backgroundColor = '';
+  if (!entry || !entry.width) return;
+
+  if (img.dataset.placeholderSize || (!img.hasAttribute('width') && !img.hasAttribute('height'))) {
+    img.width = entry.width;
+    img.height = entry.height;
+    img.dataset.placeholderSize = '1';
+  }
+  img.loading = 'lazy';
+  img.decoding = 'async';
+  if (img.complete && img.naturalWidth) return;
+
+  const src = img.getAttribute('src');
+  img.classList.add('has-placeholder');
+  if (entry.color) img.style.backgroundColor = entry.color;
+  if (entry.placeholder) img.style.backgroundImage = `url("${entry.placeholder}")`;
+  const clear = () => {
+    if (img.getAttribute('src') !== src) return; // A newer placeholder owns the element
+    img.classList.remove('has-placeholder');
+    img.style.backgroundImage = '';
+    img.style.backgroundColor = '';
+  };
+  img.addEventListener('load', clear, { once: true });
+  img.addEventListener('error', clear, { once: true });
+}
+
+// Placeholders for the <img>s of a blog post, looked up by file name in its res/ folder.
+function applyPlaceholders(root, prefix, images) {
+  if (!images) return;
+  root.querySelectorAll('img').forEach((img) => {
+    const src = img.getAttribute('src');
+    if (src && src.startsWith(prefix)) applyPlaceholder(img, images[decodeURIComponent(src.slice(prefix.length))]);
+  });
+}
+
+// Overview images as {name, bytes, width, height, color, placeholder}: the names come
+// from overview_manifest.json (a plain array), the rest from overview_details.json
+// when it exists (see scripts/generate_overview_manifest.py).
+const OVERVIEW_MANIFEST = new URL('resources/images/overview/overview_manifest.json', SRC_BASE).href;
+const OVERVIEW_DETAILS = new URL('resources/images/overview/overview_details.json', SRC_BASE).href;
+
+function overviewEntries(manifest, details) {
+  const list = Array.isArray(manifest) ? manifest : (manifest && manifest.images) || [];
+  const known = (details && details.images) || {};
+  return list.map((item) => (typeof item === 'string' ? { ...known[item], name: item } : item));
+}
+
+function loadOverviewEntries() {
+  const details = fetch(OVERVIEW_DETAILS)
+    .then((res) => (res.ok ? res.json() : {}))
+    .catch(() => ({}));
+  return fetch(OVERVIEW_MANIFEST)
+    .then((res) => {
+      if (!res.ok) throw new Error('No manifest');
+      return res.json();
+    })
+    .then((manifest) => details.then((data) => overviewEntries(manifest, data)));
+}
+
+// File name of the poem track to play: the first (smallest) of its audio_sources the
+// browser can play, else the plain "audio" MP3 of older manifests.
+function pickAudioSource(poem, audio) {
+  const sources = poem.audio_sources || [];
+  const playable = sources.find((source) => audio.canPlayType(source.type) !== '');
+  return playable ? playable.src : poem.audio;
+}
+
+// Looping videos of animated GIFs, written by scripts/convert_animated_gifs.py
+// (same path keys as the derivatives manifest). Fetched early so tooltips built
+// later can use it synchronously.
+const ANIMATIONS_MANIFEST = new URL('resources/derivatives/animations_manifest.json', SRC_BASE).href;
+let animations = {};
+const animationsPromise = fetch(ANIMATIONS_MANIFEST)
+  .then((res) => (res.ok ? res.json() : {}))
+  .then((data) => (animations = data.animations || {}))
+  .catch(() => animations);
+
+// Muted looping <video> standing in for a GIF, or null if the GIF has no conversion.
+function createAnimationVideo(src) {
+  const url = new URL(src, window.location.href);
+  if (url.origin !== SRC_BASE.origin || !url.pathname.startsWith(SRC_BASE.pathname)) return null;
+  const entry = animations[decodeURIComponent(url.pathname.slice(SRC_BASE.pathname.length))];
+  if (!entry) return null;
+
+  const video = document.createElement('video');
+  video.muted = true;
+  video.setAttribute('muted', ''); // Needed for autoplay in some browsers
+  video.autoplay = true;
+  video.loop = true;
+  video.playsInline = true;
+  video.poster = new URL(entry.poster.src, SRC_BASE).href;
+  video.style.aspectRatio = `${entry.width} / ${entry.height}`;
+  entry.sources.forEach((s) => {
+    const source = document.createElement('source');
+    source.src = new URL(s.src, SRC_BASE).href;
+    source.type = s.type;
+    video.appendChild(source);
+  });
+  return video;
+}
+
+// Replace GIF <img>s under root with their videos. The video keeps the image's classes
+// and style; clicking a click-zoom one still opens the original GIF in the lightbox.
+function applyAnimatedImages(root) {
+  animationsPromise.then(() => {
+    root.querySelectorAll('img').forEach((img) => {
+      const src = img.getAttribute('src');
+      if (!src || !src.toLowerCase().endsWith('.gif')) return;
+      const video = createAnimationVideo(src);
+      if (!video) return;
+
+      video.className = img.className;
+      video.style.cssText += img.style.cssText;
+      if (img.alt) video.setAttribute('aria-label', img.alt);
+      if (img.classList.contains('click-zoom')) {
+        const gif = img.src;
+        video.style.cursor = 'pointer';
+        video.addEventListener('click', () => {
+          img.src = gif;
+          if (img._lightboxHandler) img._lightboxHandler();
+        });
+      }
+      img.removeAttribute('src'); // Stop downloading the GIF
+      img.replaceWith(video);
+    });
+  });
+}
+
 window.toggleAfterthoughts = function (button) {
   const content = button.nextElementSibling;
   const isHidden = content.classList.contains('hidden');
@@ -629,15 +823,10 @@ document.addEventListener("DOMContentLoaded", () => {
   function initOverviewSlideshow() {
     const container = document.querySelector('#overview-slideshow .slideshow-images');
     if (!container) return;
-    const manifestPath = 'src/resources/images/overview/overview_manifest.json';
 
-    fetch(manifestPath)
-      .then((res) => {
-        if (!res.ok) throw new Error('No manifest');
-        return res.json();
-      })
+    loadOverviewEntries()
       .then((list) => {
-        if (!Array.isArray(list) || list.length === 0) return;
+        if (list.length === 0) return;
 
         let current = 0;
         const slot1 = document.createElement('div');
@@ -661,8 +850,10 @@ document.addEventListener("DOMContentLoaded", () => {
         }
 
         function setSrc(imgEl, idx) {
-          const name = list[idx];
-          imgEl.src = pathFor(name);
+          const entry = list[idx];
+          imgEl.src = pathFor(entry.name);
+          applyResponsiveImage(imgEl);
+          applyPlaceholder(imgEl, entry);
           imgEl.alt = '';
         }
 
@@ -1468,7 +1659,7 @@ document.addEventListener("DOMContentLoaded", () => {
     if (poem.audio) {
       const audioPlayer = document.getElementById("audioPlayer");
       const audioElement = document.getElementById("audioElement");
-      const audioPath = "poems/" + poem.folder + "/" + encodeURIComponent(poem.audio);
+      const audioPath = "poems/" + poem.folder + "/" + encodeURIComponent(pickAudioSource(poem, audioElement));
       fetch(audioPath, { method: "HEAD" })
         .then((res) => {
           if (res.ok) {
@@ -1752,6 +1943,9 @@ document.addEventListener("DOMContentLoaded", () => {
         }
 
         applyImageScaling(target);
+        applyPlaceholders(target, `blogs/${blog.folder}/res/`, blog.images);
+        applyResponsiveImages(target);
+        applyAnimatedImages(target);
 
         addTableDataLabels(target);
 
@@ -2129,7 +2323,10 @@ class TooltipManager {
     const tooltip = this.createTooltip(data);
 
     const mediaImg = tooltip.querySelector('.tooltip-gif');
-    if (mediaImg && data.media) {
+    if (mediaImg instanceof HTMLVideoElement) {
+      mediaImg.currentTime = 0;
+      mediaImg.play().catch(() => { });
+    } else if (mediaImg && data.media) {
       const originalSrc = data.media;
       mediaImg.src = originalSrc + '?t=' + Date.now();
     }
@@ -2416,11 +2613,17 @@ class TooltipManager {
         const imageWrapper = document.createElement('div');
         imageWrapper.className = 'tooltip-image-wrapper';
 
-        const mediaEl = document.createElement('img');
+        // Animated GIFs play as their converted video when there is one
+        const video = data.media.toLowerCase().endsWith('.gif') ? createAnimationVideo(data.media) : null;
+        const mediaEl = video || document.createElement('img');
         mediaEl.className = 'tooltip-gif';
-        mediaEl.src = data.media;
-        mediaEl.alt = data.text || 'Tooltip media';
-        mediaEl.onerror = () => { };
+        if (video) {
+          video.setAttribute('aria-label', data.text || 'Tooltip media');
+        } else {
+          mediaEl.src = data.media;
+          mediaEl.alt = data.text || 'Tooltip media';
+          mediaEl.onerror = () => { };
+        }
 
         imageWrapper.appendChild(mediaEl);
         content.appendChild(imageWrapper);
@@ -2514,7 +2717,13 @@ class TooltipManager {
 
     };
 
-    if (gifImg) {
+    if (gifImg instanceof HTMLVideoElement) {
+      // Only the dimensions are needed, not the whole video
+      gifImg.autoplay = false;
+      gifImg.preload = 'metadata';
+      gifImg.addEventListener('loadedmetadata', measureAndStore, { once: true });
+      gifImg.lastElementChild.addEventListener('error', measureAndStore, { once: true }); // No source played
+    } else if (gifImg) {
 
       if (gifImg.complete) {
         measureAndStore();
@@ -3676,11 +3885,11 @@ function initPoemPage() {
 }
 
 function initShowcaseSlideshow() {
-  const MANIFEST = 'src/resources/images/overview/overview_manifest.json';
   const container = document.getElementById('image-showcase-container');
   if (!container) return;
 
   let images = [];
+  let entries = [];
   let current = 0;
   let animating = false;
   let autoTimer = null;
@@ -3701,6 +3910,8 @@ function initShowcaseSlideshow() {
     const img1 = document.createElement('img');
     img1.className = 'showcase-img contain click-zoom';
     img1.src = images[current];
+    applyResponsiveImage(img1);
+    applyPlaceholder(img1, entries[current]);
     img1.alt = `Overview image ${current + 1}`;
     img1.style.cursor = 'zoom-in';
     img1.style.pointerEvents = 'auto';
@@ -3712,6 +3923,8 @@ function initShowcaseSlideshow() {
       const img2 = document.createElement('img');
       img2.className = 'showcase-img contain click-zoom';
       img2.src = images[(current + 1) % images.length];
+      applyResponsiveImage(img2);
+      applyPlaceholder(img2, entries[(current + 1) % images.length]);
       img2.alt = `Overview image ${(current + 2)}`;
       img2.style.cursor = 'zoom-in';
       img2.style.pointerEvents = 'auto';
@@ -3755,6 +3968,9 @@ function initShowcaseSlideshow() {
     setTimeout(() => {
 
       img1.src = img2.src;
+
+      applyResponsiveImage(img1);
+      applyPlaceholder(img1, entries[(current + 1) % entries.length]);
       img1.alt = img2.alt;
       img1.style.opacity = '1';
       img1.style.transition = 'none';
@@ -3764,6 +3980,8 @@ function initShowcaseSlideshow() {
       const nextIdx = (current + 2) % images.length;
       img2.style.opacity = '0';
       img2.src = images[nextIdx];
+      applyResponsiveImage(img2);
+      applyPlaceholder(img2, entries[nextIdx]);
       img2.alt = `Overview image ${nextIdx + 1}`;
 
       img2.onload = () => { img2.style.opacity = '1'; };
@@ -3793,9 +4011,10 @@ function initShowcaseSlideshow() {
   window._showcaseSlideshowStop = stopAuto;
   window._showcaseSlideshowStart = startAuto;
 
-  fetch(MANIFEST).then(r => r.json()).then(list => {
-    if (!Array.isArray(list) || list.length === 0) return;
-    images = list.map(n => 'src/resources/images/overview/' + encodeURIComponent(n).replace(/%2F/g, '/'));
+  loadOverviewEntries().then(list => {
+    entries = list;
+    if (entries.length === 0) return;
+    images = entries.map(e => 'src/resources/images/overview/' + encodeURIComponent(e.name).replace(/%2F/g, '/'));
     render();
     startAuto();
   }).catch(() => {
@@ -3808,13 +4027,13 @@ function initShowcaseSlideshow() {
 }
 
 function initOverviewSlideshow() {
-  const MANIFEST = 'src/resources/images/overview/overview_manifest.json';
   const container = document.querySelector('#overview-slideshow .slideshow-images');
   const prevBtn = document.querySelector('#overview-slideshow .slideshow-prev');
   const nextBtn = document.querySelector('#overview-slideshow .slideshow-next');
   if (!container) return;
 
   let images = [];
+  let entries = [];
   let current = 0;
   let animating = false;
   let autoTimer = null;
@@ -3866,6 +4085,8 @@ function initOverviewSlideshow() {
       const img = document.createElement('img');
       img.className = 'slideshow-img contain click-zoom';
       img.src = images[current];
+      applyResponsiveImage(img);
+      applyPlaceholder(img, entries[current]);
       img.alt = `Overview image ${current + 1}`;
       img.style.cursor = 'zoom-in';
       img.addEventListener('click', () => openImageFullscreen(img.src, img.alt));
@@ -3877,6 +4098,8 @@ function initOverviewSlideshow() {
       const img1 = document.createElement('img');
       img1.className = 'slideshow-img contain click-zoom';
       img1.src = images[current];
+      applyResponsiveImage(img1);
+      applyPlaceholder(img1, entries[current]);
       img1.alt = `Overview image ${current + 1}`;
       img1.style.cursor = 'zoom-in';
       img1.addEventListener('click', () => openImageFullscreen(img1.src, img1.alt));
@@ -3887,6 +4110,8 @@ function initOverviewSlideshow() {
       const img2 = document.createElement('img');
       img2.className = 'slideshow-img contain click-zoom';
       img2.src = images[(current + 1) % images.length];
+      applyResponsiveImage(img2);
+      applyPlaceholder(img2, entries[(current + 1) % images.length]);
       img2.alt = `Overview image ${(current + 2)}`;
       img2.style.cursor = 'zoom-in';
       img2.addEventListener('click', () => openImageFullscreen(img2.src, img2.alt));
@@ -3919,10 +4144,14 @@ function initOverviewSlideshow() {
       const img1 = div1.querySelector('img');
       const img2 = div2.querySelector('img');
       img1.src = img2.src;
+      applyResponsiveImage(img1);
+      applyPlaceholder(img1, entries[(current + 1) % entries.length]);
       img1.alt = img2.alt;
       div1.classList.remove('fade-out-in-place');
       const nextIdx = (current + 2) % images.length;
       img2.src = images[nextIdx];
+      applyResponsiveImage(img2);
+      applyPlaceholder(img2, entries[nextIdx]);
       img2.alt = `Overview image ${nextIdx + 1}`;
       div2.classList.remove('slide-left-overlap');
       div2.classList.add('fade-in-on-right');
@@ -3953,9 +4182,10 @@ function initOverviewSlideshow() {
   window._overviewSlideshowStop = stopAuto;
   window._overviewSlideshowStart = startAuto;
 
-  fetch(MANIFEST).then(r => r.json()).then(list => {
-    if (!Array.isArray(list) || list.length === 0) return;
-    images = list.map(n => 'src/resources/images/overview/' + encodeURIComponent(n).replace(/%2F/g, '/'));
+  loadOverviewEntries().then(list => {
+    entries = list;
+    if (entries.length === 0) return;
+    images = entries.map(e => 'src/resources/images/overview/' + encodeURIComponent(e.name).replace(/%2F/g, '/'));
     render();
     startAuto();
   }).catch(() => {
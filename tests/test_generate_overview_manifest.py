@@ -0,0 +1,50 @@
+"""
+Checks that generate_overview_manifest.py keeps overview_manifest.json readable
+by readers of the original plain filename array.
+
+Run from the repository root:
+    python -m unittest discover tests
+"""
+
+import io
+import json
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
+
+import generate_overview_manifest
+
+# Smallest valid SVG: no placeholder, only a byte size
+SVG = b'<svg xmlns="http://www.w3.org/2000/svg" width="4" height="3"/>'
+
+class OverviewManifestTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.src = Path(self.tmp.name)
+        for name in ('10.svg', '2.svg', 'notes.txt'):
+            (self.src / name).write_bytes(SVG)
+
+    def generate(self):
+        out = self.src / 'overview_manifest.json'
+        with redirect_stdout(io.StringIO()):
+            status = generate_overview_manifest.main([str(self.src), str(out)])
+        self.assertEqual(status, 0)
+        return out
+
+    def test_manifest_is_plain_filename_array(self):
+        out = self.generate()
+        self.assertEqual(json.loads(out.read_text()), ['2.svg', '10.svg'])
+
+    def test_details_are_versioned_and_keyed_by_name(self):
+        out = self.generate()
+        details = json.loads(out.with_name(generate_overview_manifest.DETAILS_NAME).read_text())
+        self.assertEqual(details['version'], generate_overview_manifest.DETAILS_VERSION)
+        self.assertEqual(details['images'], {'2.svg': {'bytes': len(SVG)}, '10.svg': {'bytes': len(SVG)}})
+
+if __name__ == '__main__':
+    unittest.main()
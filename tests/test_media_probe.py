@@ -0,0 +1,40 @@
+"""
+Checks the in-process image header readers of media_probe.py against ffprobe
+on the site's own JPG/PNG files. Skipped when ffprobe isn't installed.
+
+Run from the repository root:
+    python -m unittest discover tests
+"""
+
+import shutil
+import sys
+import unittest
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / 'scripts'))
+
+import media_probe
+
+def site_images():
+    """JPG/PNG files under src/**/res and src/resources/images."""
+    images = set()
+    for pattern in ('src/**/res/*', 'src/resources/images/**/*'):
+        for path in REPO_ROOT.glob(pattern):
+            if path.is_file() and path.suffix.lower() in ('.jpg', '.jpeg', '.png'):
+                images.add(path)
+    return sorted(images)
+
+@unittest.skipIf(shutil.which('ffprobe') is None, "ffprobe is not installed")
+class ProbeImageTest(unittest.TestCase):
+    def test_site_images_match_ffprobe(self):
+        images = site_images()
+        self.assertTrue(images)
+        for path in images:
+            with self.subTest(image=path.relative_to(REPO_ROOT).as_posix()):
+                expected = media_probe.ffprobe_image_info(path)
+                self.assertIsNotNone(expected, "ffprobe can't read it")
+                self.assertEqual(media_probe.probe_image(path), expected)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+"""
+Checks that update_website.py keeps the output of steps apart, whichever way
+the steps run.
+
+Run from the repository root:
+    python -m unittest discover tests
+"""
+
+import io
+import sys
+import tempfile
+import textwrap
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
+
+import update_website
+
+LINES_PER_STEP = 300
+
+# A step that prints a lot, with small pauses so two steps really overlap
+STEP_SCRIPT = textwrap.dedent('''
+    import sys
+    import time
+
+    def main(argv=None):
+        for i in range({lines}):
+            print("{name} line", i)
+            if i % 50 == 0:
+                time.sleep(0.01)
+        return 0
+
+    if __name__ == "__main__":
+        sys.exit(main())
+''')
+
+class StepOutputTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.steps = []
+        for name in ('alpha', 'beta'):
+            script = Path(self.tmp.name) / f'step_{name}_{id(self)}.py'
+            script.write_text(STEP_SCRIPT.format(name=name, lines=LINES_PER_STEP))
+            self.steps.append({'name': name, 'script': str(script),
+                               'description': f'Step {name}', 'depends_on': []})
+        sys.path.insert(0, self.tmp.name)
+        self.addCleanup(sys.path.remove, self.tmp.name)
+
+    def run_steps(self, in_process):
+        console = io.StringIO()
+        saved = update_website._console, sys.stdout, sys.stderr
+        update_website._console = console
+        if in_process:
+            sys.stdout = update_website.StepOutput(io.StringIO())
+            sys.stderr = update_website.StepOutput(io.StringIO())
+        try:
+            results = update_website.run_steps(self.steps, jobs=2, in_process=in_process)
+        finally:
+            update_website._console, sys.stdout, sys.stderr = saved
+        return results, console.getvalue().splitlines()
+
+    def check_separate(self, results, lines):
+        self.assertTrue(all(r['success'] for r in results.values()), results)
+        for name in ('alpha', 'beta'):
+            step_lines = [line for line in lines if line.startswith(f'[{name}] ')]
+            expected = [f'[{name}] {name} line {i}' for i in range(LINES_PER_STEP)]
+            self.assertEqual(step_lines, expected)
+        # Every line of step output carries its own step's prefix
+        for line in lines:
+            if ' line ' in line:
+                prefix, _, text = line.partition('] ')
+                self.assertEqual(prefix.lstrip('['), text.split()[0], line)
+
+    def test_subprocess_steps_side_by_side(self):
+        self.check_separate(*self.run_steps(in_process=False))
+
+    def test_in_process_steps(self):
+        self.check_separate(*self.run_steps(in_process=True))
+
+class WatchTest(unittest.TestCase):
+    """Changes made while a rebuild runs are rebuilt next; the rebuild's own writes are not."""
+
+    def test_edits_during_rebuild_are_not_lost(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        watched = Path(tmp.name)
+        photo = watched / 'photo.jpg'
+        photo.write_bytes(b'original')
+        note = watched / 'note.md'
+
+        rebuilds = []
+        def fake_rebuild(changed, repo_root, jobs, in_process=False):
+            rebuilds.append(set(changed))
+            if len(rebuilds) == 1:
+                photo.write_bytes(b'compressed')  # Written by the rebuild itself
+                note.write_text('edited meanwhile')  # Edited by the user while it ran
+            return {'images': [str(path) for path in changed if path.suffix == '.jpg']}
+
+        polls = []
+        def fake_sleep(seconds):
+            polls.append(seconds)
+            if len(polls) == 2:
+                photo.write_bytes(b'new photo')
+            if len(polls) > 12:
+                raise KeyboardInterrupt
+
+        saved = (update_website.WATCH_DIRS, update_website.WATCH_DEBOUNCE_SECONDS,
+                 update_website.rebuild, update_website.time.sleep, sys.stdout)
+        update_website.WATCH_DIRS = [str(watched)]
+        update_website.WATCH_DEBOUNCE_SECONDS = 0
+        update_website.rebuild = fake_rebuild
+        update_website.time.sleep = fake_sleep
+        sys.stdout = io.StringIO()
+        try:
+            update_website.watch(jobs=1)
+        finally:
+            (update_website.WATCH_DIRS, update_website.WATCH_DEBOUNCE_SECONDS,
+             update_website.rebuild, update_website.time.sleep, sys.stdout) = saved
+
+        self.assertEqual(rebuilds, [{photo}, {note}])
+
+if __name__ == '__main__':
+    unittest.main()